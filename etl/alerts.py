@@ -12,118 +12,222 @@ Alert conditions:
     - new_signal: any new trading signal detected for the model
 """
 
-import json
+import atexit
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Any
+from typing import Any, Callable
 
 import httpx
+import orjson
 
-from etl.storage.supabase_client import get_client, get_all_models
+from etl.circuit_breaker import CircuitBreaker, CircuitOpenError
+from etl.collectors.base import TRANSIENT_STATUS_CODES, backoff_delay, parse_retry_after
+from etl.storage.supabase_client import get_client, get_all_models, paginate
 
 logger = logging.getLogger(__name__)
 
+# Max webhook deliveries in flight at once
+MAX_WEBHOOK_WORKERS = 16
 
-def _get_latest_scores(calc_date: date) -> dict[str, dict[str, Any]]:
-    """Fetch today's daily_scores for all models, keyed by model_id."""
-    client = get_client()
-    result = (
-        client.table("daily_scores")
-        .select("model_id, vi_trade, vi_content, delta7_trade, delta7_content, signal_trade, heat_content")
-        .eq("date", calc_date.isoformat())
-        .execute()
-    )
-    return {row["model_id"]: row for row in result.data}
+# Attempts per webhook; 429/5xx and transport errors are retried with jitter
+WEBHOOK_MAX_ATTEMPTS = 3
 
+# Fail fast on Supabase calls once it has timed out repeatedly this run
+_SUPABASE_BREAKER = CircuitBreaker("supabase", fail_threshold=5, reset_timeout=30)
 
-def _get_todays_signals(calc_date: date) -> dict[str, list[dict]]:
-    """Fetch today's signals grouped by model_id."""
-    client = get_client()
-    result = (
-        client.table("signals")
-        .select("model_id, signal_type, direction, strength, reasoning")
-        .eq("date", calc_date.isoformat())
-        .execute()
-    )
-    grouped: dict[str, list[dict]] = {}
-    for row in result.data:
-        mid = row["model_id"]
-        grouped.setdefault(mid, []).append(row)
-    return grouped
+# Shared client so deliveries to the same host reuse keep-alive connections
+_WEBHOOK_CLIENT = httpx.Client(
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=32),
+    headers={"Content-Type": "application/json", "User-Agent": "AVI-Alerts/1.0"},
+)
+atexit.register(_WEBHOOK_CLIENT.close)
+
+
+# Score/signal columns embedded under each alert's model
+_SCORE_FIELDS = "vi_trade, vi_content, delta7_trade, delta7_content, signal_trade, heat_content"
+_SIGNAL_FIELDS = "signal_type, direction, strength, reasoning"
+
+
+def _get_alerts_with_context(
+    calc_date: date,
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]], dict[str, list[dict]]]:
+    """
+    Fetch all active alerts together with their model's scores and signals
+    for calc_date, in a single PostgREST request per page of alerts.
 
+    daily_scores and signals are embedded under models(...) and filtered to
+    calc_date server-side, so only rows for models with active alerts come back.
+    Pages are folded into the result dicts as they arrive.
 
-def _get_active_alerts() -> list[dict[str, Any]]:
-    """Fetch all active alerts with model info."""
+    Returns:
+        (alerts, scores keyed by model_id, signals grouped by model_id)
+    """
     client = get_client()
-    result = (
-        client.table("alerts")
-        .select("*, models(slug, name)")
-        .eq("is_active", True)
-        .execute()
-    )
-    return result.data
+    day = calc_date.isoformat()
+
+    def build_query():
+        return (
+            client.table("alerts")
+            .select(
+                f"*, models(slug, name, daily_scores({_SCORE_FIELDS}), signals({_SIGNAL_FIELDS}))"
+            )
+            .eq("is_active", True)
+            .eq("models.daily_scores.date", day)
+            .eq("models.signals.date", day)
+            .order("id")
+        )
+
+    alerts: list[dict[str, Any]] = []
+    scores: dict[str, dict[str, Any]] = {}
+    signals: dict[str, list[dict]] = {}
+    try:
+        for alert in paginate(build_query, call=_SUPABASE_BREAKER.call):
+            alerts.append(alert)
+            model = alert.get("models") or {}
+            mid = alert["model_id"]
+            if mid in scores or mid in signals:
+                continue
+            if model.get("daily_scores"):
+                scores[mid] = model["daily_scores"][0]
+            if model.get("signals"):
+                signals[mid] = model["signals"]
+    except CircuitOpenError:
+        logger.warning("Supabase circuit open, skipping alert checks")
+        return [], {}, {}
+
+    return alerts, scores, signals
+
+
+# Score columns and display label per alert mode: (vi_key, d7_key, mode_label)
+_TRADE_KEYS = ("vi_trade", "delta7_trade", "Trading")
+_CONTENT_KEYS = ("vi_content", "delta7_content", "Content")
+
+
+def _mode_keys(mode: str) -> tuple[str, str, str]:
+    """Score keys for an alert mode: 'trade' -> *_trade, anything else -> *_content."""
+    return _TRADE_KEYS if mode == "trade" else _CONTENT_KEYS
+
+
+# (model_id, mode, metric) -> score, metric being "vi" or "d7"
+ScoreLookup = dict[tuple[str, str, str], float]
+
+
+def _score_value(row: dict[str, Any], mode: str, metric: str) -> float:
+    """Read one score from a daily_scores row; missing/null counts as 0."""
+    vi_key, d7_key, _ = _mode_keys(mode)
+    return float(row.get(vi_key if metric == "vi" else d7_key, 0) or 0)
+
+
+def _score_lookup(scores: dict[str, dict[str, Any]]) -> ScoreLookup:
+    """
+    Coerce every model's scores to floats once, keyed by (model_id, mode, metric),
+    so each alert check is a single dict lookup.
+    """
+    return {
+        (model_id, mode, metric): _score_value(row, mode, metric)
+        for model_id, row in scores.items()
+        for mode in ("trade", "content")
+        for metric in ("vi", "d7")
+    }
+
+
+# (triggered, value, message)
+CheckResult = tuple[bool, float | None, str]
+
+_NOT_TRIGGERED: CheckResult = (False, None, "")
+
+
+def _check_vi_above(
+    value: float, threshold: float, mode_label: str, model_name: str
+) -> CheckResult:
+    if value > threshold:
+        return True, value, f"{model_name} {mode_label} Index is {value:.1f} (above {threshold})"
+    return _NOT_TRIGGERED
+
+
+def _check_vi_below(
+    value: float, threshold: float, mode_label: str, model_name: str
+) -> CheckResult:
+    if value < threshold:
+        return True, value, f"{model_name} {mode_label} Index is {value:.1f} (below {threshold})"
+    return _NOT_TRIGGERED
+
+
+def _check_delta7_above(
+    value: float, threshold: float, mode_label: str, model_name: str
+) -> CheckResult:
+    if value > threshold:
+        return True, value, (
+            f"{model_name} {mode_label} 7-day change is {value:+.1f} (above {threshold:+.1f})"
+        )
+    return _NOT_TRIGGERED
+
+
+def _check_delta7_below(
+    value: float, threshold: float, mode_label: str, model_name: str
+) -> CheckResult:
+    if value < threshold:
+        return True, value, (
+            f"{model_name} {mode_label} 7-day change is {value:+.1f} (below {threshold:+.1f})"
+        )
+    return _NOT_TRIGGERED
+
+
+# Score-based condition -> (metric, handler(value, threshold, mode_label, model_name))
+_HANDLERS: dict[str, tuple[str, Callable[..., CheckResult]]] = {
+    "vi_above": ("vi", _check_vi_above),
+    "vi_below": ("vi", _check_vi_below),
+    "delta7_above": ("d7", _check_delta7_above),
+    "delta7_below": ("d7", _check_delta7_below),
+}
 
 
 def _check_condition(
     alert: dict,
-    scores: dict[str, Any] | None,
+    lookup: ScoreLookup,
     signals: list[dict] | None,
-) -> tuple[bool, float | None, str]:
+) -> CheckResult:
     """
     Check if an alert condition is met.
 
+    Score conditions read the alert's model score from `lookup` (built once
+    per run by _score_lookup); a model without scores, or an alert without
+    a numeric threshold, never fires.
+
     Returns:
         (triggered, value, message)
     """
     condition = alert["condition"]
-    threshold = float(alert["threshold"]) if alert["threshold"] is not None else None
-    mode = alert.get("mode", "trade")
-    model_name = alert.get("models", {}).get("name", "Unknown")
-    model_slug = alert.get("models", {}).get("slug", "unknown")
+    model_name = (alert.get("models") or {}).get("name", "Unknown")
 
     if condition == "new_signal":
-        if signals and len(signals) > 0:
+        if signals:
             sig = signals[0]
             msg = (
                 f"New {sig['signal_type']} signal for {model_name}: "
                 f"{sig['direction']}, strength {sig['strength']}"
             )
             return True, sig.get("strength", 0), msg
-        return False, None, ""
-
-    if scores is None:
-        return False, None, ""
-
-    # Pick the right score field based on mode
-    vi_key = "vi_trade" if mode == "trade" else "vi_content"
-    d7_key = "delta7_trade" if mode == "trade" else "delta7_content"
-    mode_label = "Trading" if mode == "trade" else "Content"
+        return _NOT_TRIGGERED
 
-    if condition == "vi_above":
-        value = float(scores.get(vi_key, 0) or 0)
-        if value > threshold:
-            msg = f"{model_name} {mode_label} Index is {value:.1f} (above {threshold})"
-            return True, value, msg
+    entry = _HANDLERS.get(condition)
+    if entry is None:
+        return _NOT_TRIGGERED
+    metric, handler = entry
 
-    elif condition == "vi_below":
-        value = float(scores.get(vi_key, 0) or 0)
-        if value < threshold:
-            msg = f"{model_name} {mode_label} Index is {value:.1f} (below {threshold})"
-            return True, value, msg
+    mode = "trade" if alert.get("mode", "trade") == "trade" else "content"
+    value = lookup.get((alert["model_id"], mode, metric))
+    if value is None:
+        return _NOT_TRIGGERED
 
-    elif condition == "delta7_above":
-        value = float(scores.get(d7_key, 0) or 0)
-        if value > threshold:
-            msg = f"{model_name} {mode_label} 7-day change is {value:+.1f} (above {threshold:+.1f})"
-            return True, value, msg
-
-    elif condition == "delta7_below":
-        value = float(scores.get(d7_key, 0) or 0)
-        if value < threshold:
-            msg = f"{model_name} {mode_label} 7-day change is {value:+.1f} (below {threshold:+.1f})"
-            return True, value, msg
-
-    return False, None, ""
+    try:
+        threshold = float(alert["threshold"])
+    except (TypeError, ValueError):
+        return _NOT_TRIGGERED
+    return handler(value, threshold, _mode_keys(mode)[2], model_name)
 
 
 def _validate_webhook_url(url: str) -> bool:
@@ -169,22 +273,37 @@ def _send_webhook(url: str, payload: dict) -> bool:
         logger.error(f"Webhook URL validation failed: {url}")
         return False
 
-    try:
-        response = httpx.post(
-            url,
-            json=payload,
-            headers={"Content-Type": "application/json", "User-Agent": "AVI-Alerts/1.0"},
-            timeout=10,
-        )
-        if response.status_code < 300:
-            logger.info(f"Webhook delivered: {url} -> {response.status_code}")
-            return True
-        else:
-            logger.warning(f"Webhook failed: {url} -> {response.status_code}")
+    # Encode once up front; the client's default headers set Content-Type
+    body = orjson.dumps(payload)
+
+    for attempt in range(WEBHOOK_MAX_ATTEMPTS):
+        retry_after = None
+        try:
+            response = _WEBHOOK_CLIENT.post(url, content=body)
+            if response.status_code < 300:
+                logger.info(f"Webhook delivered: {url} -> {response.status_code}")
+                return True
+            if response.status_code not in TRANSIENT_STATUS_CODES:
+                logger.warning(f"Webhook failed: {url} -> {response.status_code}")
+                return False
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            error = f"HTTP {response.status_code}"
+        except httpx.TransportError as e:
+            error = str(e)
+        except Exception as e:
+            logger.error(f"Webhook error: {url} -> {e}")
             return False
-    except Exception as e:
-        logger.error(f"Webhook error: {url} -> {e}")
-        return False
+
+        if attempt + 1 < WEBHOOK_MAX_ATTEMPTS:
+            delay = backoff_delay(attempt, retry_after=retry_after)
+            logger.warning(
+                f"Webhook attempt {attempt + 1}/{WEBHOOK_MAX_ATTEMPTS} failed: {url} -> "
+                f"{error}, retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+    logger.error(f"Webhook error: {url} -> {error} after {WEBHOOK_MAX_ATTEMPTS} attempts")
+    return False
 
 
 def run_alert_checks(calc_date: date) -> dict[str, Any]:
@@ -200,10 +319,8 @@ def run_alert_checks(calc_date: date) -> dict[str, Any]:
     """
     client = get_client()
 
-    # Load data
-    scores = _get_latest_scores(calc_date)
-    signals = _get_todays_signals(calc_date)
-    alerts = _get_active_alerts()
+    # Load alerts with today's scores and signals in one round-trip
+    alerts, scores, signals = _get_alerts_with_context(calc_date)
 
     if not alerts:
         logger.info("No active alerts to check.")
@@ -211,20 +328,19 @@ def run_alert_checks(calc_date: date) -> dict[str, Any]:
 
     logger.info(f"Checking {len(alerts)} active alert(s)...")
 
-    triggered_count = 0
-    delivered_count = 0
+    # Pass 1: evaluate conditions and build notifications
+    triggered: list[tuple[dict, dict, dict | None]] = []
+    day = calc_date.isoformat()
+    lookup = _score_lookup(scores)
 
     for alert in alerts:
         model_id = alert["model_id"]
-        model_scores = scores.get(model_id)
-        model_signals = signals.get(model_id)
 
-        fired, value, message = _check_condition(alert, model_scores, model_signals)
+        fired, value, message = _check_condition(alert, lookup, signals.get(model_id))
 
         if not fired:
             continue
 
-        triggered_count += 1
         logger.info(f"  Alert triggered: {message}")
 
         # Record in alert_history
@@ -239,42 +355,78 @@ def run_alert_checks(calc_date: date) -> dict[str, Any]:
             "delivered": False,
         }
 
-        # Send notification based on channel
-        delivered = False
+        payload = None
         if alert["channel"] == "webhook" and alert.get("webhook_url"):
+            model = alert.get("models") or {}
             payload = {
                 "event": "alert_triggered",
                 "alert_id": alert["id"],
-                "model": alert.get("models", {}).get("slug", "unknown"),
-                "model_name": alert.get("models", {}).get("name", "Unknown"),
+                "model": model.get("slug", "unknown"),
+                "model_name": model.get("name", "Unknown"),
                 "condition": alert["condition"],
                 "threshold": alert.get("threshold"),
                 "value": value,
                 "message": message,
-                "date": calc_date.isoformat(),
+                "date": day,
             }
-            delivered = _send_webhook(alert["webhook_url"], payload)
+
+        triggered.append((alert, history_row, payload))
+
+    # Pass 2: deliver webhooks concurrently (each call blocks on network I/O)
+    to_deliver = [
+        (alert["webhook_url"], payload)
+        for alert, _, payload in triggered
+        if payload is not None
+    ]
+    webhook_results: list[bool] = []
+    if to_deliver:
+        workers = min(MAX_WEBHOOK_WORKERS, len(to_deliver))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            webhook_results = list(pool.map(lambda job: _send_webhook(*job), to_deliver))
+    webhook_results_iter = iter(webhook_results)
+
+    triggered_count = len(triggered)
+    delivered_count = 0
+    history_rows: list[dict] = []
+
+    for alert, history_row, payload in triggered:
+        # Send notification based on channel
+        delivered = False
+        if payload is not None:
+            delivered = next(webhook_results_iter)
         elif alert["channel"] == "email":
             # Email delivery is a future enhancement
             # For now, log it and mark as delivered
-            logger.info(f"  Email alert (not yet implemented): {message}")
+            logger.info(f"  Email alert (not yet implemented): {history_row['message']}")
             delivered = True
 
         history_row["delivered"] = delivered
         if delivered:
             delivered_count += 1
+        history_rows.append(history_row)
 
-        # Write to alert_history
+    if history_rows:
+        # Write all alert_history rows in one request; on failure fall back to
+        # per-row inserts so one bad row doesn't drop the whole batch
         try:
-            client.table("alert_history").insert(history_row).execute()
+            _SUPABASE_BREAKER.call(client.table("alert_history").insert(history_rows).execute)
         except Exception as e:
-            logger.error(f"  Failed to write alert_history: {e}")
-
-        # Update last_triggered_at on the alert
+            logger.warning(f"  Batch alert_history insert failed, retrying per row: {e}")
+            history_table = client.table("alert_history")
+            for row in history_rows:
+                try:
+                    _SUPABASE_BREAKER.call(history_table.insert(row).execute)
+                except Exception as row_err:
+                    logger.error(f"  Failed to write alert_history: {row_err}")
+
+        # Update last_triggered_at on all triggered alerts in one request
+        triggered_ids = [row["alert_id"] for row in history_rows]
         try:
-            client.table("alerts").update(
-                {"last_triggered_at": calc_date.isoformat()}
-            ).eq("id", alert["id"]).execute()
+            _SUPABASE_BREAKER.call(
+                client.table("alerts").update(
+                    {"last_triggered_at": day}
+                ).in_("id", triggered_ids).execute
+            )
         except Exception as e:
             logger.error(f"  Failed to update alert last_triggered_at: {e}")
 
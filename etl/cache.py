@@ -3,14 +3,24 @@ Upstash Redis cache helper for ETL pipeline.
 
 Uses Upstash REST API (no redis-py dependency needed).
 Falls back gracefully if Redis is not configured.
+
+A single module-level requests.Session keeps the TLS connection to Upstash
+alive across calls. cache_mget / cache_mset batch many keys into one
+/pipeline request, and CacheBatch wraps them for collectors that read and
+write one key per model or package. Values are (de)serialized with orjson.
+All calls go through a circuit breaker, so an Upstash outage degrades to
+instant cache misses.
 """
 
-import json
 import logging
+import threading
 from typing import Any
+from urllib.parse import quote
 
+import orjson
 import requests
 
+from etl.circuit_breaker import CircuitBreaker
 from etl.config import UPSTASH_REDIS_URL, UPSTASH_REDIS_TOKEN
 
 logger = logging.getLogger(__name__)
@@ -18,6 +28,13 @@ logger = logging.getLogger(__name__)
 # Default TTL: 24 hours
 DEFAULT_TTL_SECS = 86400
 
+# Shared session: one keep-alive connection pool for all cache calls
+_SESSION = requests.Session()
+_SESSION.headers["Authorization"] = f"Bearer {UPSTASH_REDIS_TOKEN}"
+
+# Fail fast (cache miss) during an Upstash outage instead of waiting on timeouts
+_BREAKER = CircuitBreaker("upstash", fail_threshold=5, reset_timeout=30)
+
 
 def _is_configured() -> bool:
     """Check if Upstash Redis credentials are available."""
@@ -35,20 +52,18 @@ def cache_get(key: str) -> Any | None:
         return None
 
     try:
-        resp = requests.get(
-            f"{UPSTASH_REDIS_URL}/get/{key}",
-            headers={"Authorization": f"Bearer {UPSTASH_REDIS_TOKEN}"},
-            timeout=5,
+        resp = _BREAKER.call(
+            _SESSION.get, f"{UPSTASH_REDIS_URL}/get/{quote(key, safe='')}", timeout=5
         )
         if resp.status_code != 200:
             return None
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         result = data.get("result")
         if result is None:
             return None
 
-        return json.loads(result)
+        return orjson.loads(result)
 
     except Exception as e:
         logger.debug(f"Redis GET failed for {key}: {e}")
@@ -71,10 +86,13 @@ def cache_set(key: str, value: Any, ttl: int = DEFAULT_TTL_SECS) -> bool:
         return False
 
     try:
-        payload = json.dumps(value)
-        resp = requests.get(
-            f"{UPSTASH_REDIS_URL}/set/{key}/{payload}/ex/{ttl}",
-            headers={"Authorization": f"Bearer {UPSTASH_REDIS_TOKEN}"},
+        # Value goes in the request body: JSON containing '/', '?', '#' or
+        # non-ASCII would break a path segment, and long values hit URL limits
+        resp = _BREAKER.call(
+            _SESSION.post,
+            f"{UPSTASH_REDIS_URL}/set/{quote(key, safe='')}",
+            params={"EX": ttl},
+            data=orjson.dumps(value),
             timeout=5,
         )
         return resp.status_code == 200
@@ -82,3 +100,134 @@ def cache_set(key: str, value: Any, ttl: int = DEFAULT_TTL_SECS) -> bool:
     except Exception as e:
         logger.debug(f"Redis SET failed for {key}: {e}")
         return False
+
+
+def _pipeline(commands: list[list[Any]]) -> list[dict[str, Any]] | None:
+    """
+    Run several Redis commands in one Upstash /pipeline request.
+
+    Returns:
+        One {"result": ...} or {"error": ...} dict per command, or None on failure.
+    """
+    resp = _BREAKER.call(
+        _SESSION.post,
+        f"{UPSTASH_REDIS_URL}/pipeline",
+        data=orjson.dumps(commands),
+        headers={"Content-Type": "application/json"},
+        timeout=10,
+    )
+    if resp.status_code != 200:
+        logger.debug(f"Redis pipeline returned {resp.status_code}")
+        return None
+    return orjson.loads(resp.content)
+
+
+def _parse_reply(key: str, reply: Any) -> Any | None:
+    """Decode one pipeline GET reply; errors, nulls and non-JSON values are misses."""
+    if not isinstance(reply, dict) or "error" in reply:
+        logger.debug(f"Redis GET failed for {key}: {reply}")
+        return None
+    result = reply.get("result")
+    if result is None:
+        return None
+    try:
+        return orjson.loads(result)
+    except (orjson.JSONDecodeError, TypeError) as e:
+        logger.debug(f"Redis value for {key} is not JSON: {e}")
+        return None
+
+
+def cache_mget(keys: list[str]) -> list[Any | None]:
+    """
+    Get several values from Redis cache in a single round-trip.
+
+    Returns:
+        Parsed JSON values in the same order as keys (None for misses).
+    """
+    if not keys or not _is_configured():
+        return [None] * len(keys)
+
+    try:
+        replies = _pipeline([["GET", key] for key in keys])
+        if replies is None:
+            return [None] * len(keys)
+
+        return [_parse_reply(key, reply) for key, reply in zip(keys, replies)]
+
+    except Exception as e:
+        logger.debug(f"Redis MGET failed for {len(keys)} keys: {e}")
+        return [None] * len(keys)
+
+
+def cache_mset(items: dict[str, Any], ttl: int = DEFAULT_TTL_SECS) -> bool:
+    """
+    Set several values in Redis cache with a shared TTL in a single round-trip.
+
+    Returns:
+        True if every SET succeeded, False otherwise.
+    """
+    if not items or not _is_configured():
+        return False
+
+    try:
+        replies = _pipeline([
+            ["SET", key, orjson.dumps(value).decode(), "EX", ttl]
+            for key, value in items.items()
+        ])
+        if replies is None:
+            return False
+        return all("error" not in reply for reply in replies)
+
+    except Exception as e:
+        logger.debug(f"Redis MSET failed for {len(items)} keys: {e}")
+        return False
+
+
+class CacheBatch:
+    """
+    One run's view of a set of cache keys.
+
+    prefetch() loads many keys with a single cache_mget, and get() then
+    answers from that snapshot (a prefetched miss stays a miss, with no
+    second round-trip). set() queues the write, and flush() stores every
+    queued value with one cache_mset. Keys that were never prefetched fall
+    back to cache_get. Safe to share between worker threads.
+    """
+
+    def __init__(self, ttl: int = DEFAULT_TTL_SECS):
+        self.ttl = ttl
+        self._values: dict[str, Any | None] = {}
+        self._pending: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, keys: list[str]) -> None:
+        """Load every key not already known in one pipeline request."""
+        with self._lock:
+            missing = [key for key in dict.fromkeys(keys) if key not in self._values]
+        if not missing:
+            return
+        values = cache_mget(missing)
+        with self._lock:
+            for key, value in zip(missing, values):
+                self._values.setdefault(key, value)
+
+    def get(self, key: str) -> Any | None:
+        """Prefetched (or already set) value for key, else a single cache_get."""
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        return cache_get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        """Queue a write for the next flush(); get() sees it right away."""
+        with self._lock:
+            self._values[key] = value
+            self._pending[key] = value
+
+    def flush(self) -> bool:
+        """Store all queued writes in one request; True if there was nothing to store."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return True
+        return cache_mset(pending, ttl=self.ttl)
@@ -0,0 +1,110 @@
+"""
+Minimal circuit breaker for ETL calls to external services.
+
+After `fail_threshold` consecutive failures the breaker OPENS and every call
+fails fast with CircuitOpenError for `reset_timeout` seconds, instead of each
+caller waiting out its own network timeout. The first call after the cooldown
+runs as a HALF_OPEN probe: success closes the breaker, failure re-opens it.
+
+Usage:
+    breaker = CircuitBreaker("upstash", fail_threshold=5, reset_timeout=30)
+    resp = breaker.call(session.get, url, timeout=5)
+
+    @breaker
+    def fetch_rows(): ...
+"""
+
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling through while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe CLOSED/OPEN/HALF_OPEN circuit breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        fail_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go through (closed, or half-open probe)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                # Let exactly one probe through; others keep failing fast
+                self._state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.fail_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self._failures} failure(s); "
+                        f"failing fast for {self.reset_timeout:.0f}s"
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+    def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Invoke func through the breaker, recording success or failure."""
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
+        """Decorator form of call()."""
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return self.call(func, *args, **kwargs)
+        return wrapper
+
+    def __repr__(self) -> str:
+        return f"<CircuitBreaker {self.name} state={self.state}>"
@@ -4,11 +4,16 @@ All collectors inherit from this class.
 """
 
 import logging
+import random
 from abc import ABC, abstractmethod
-from datetime import date, datetime
+from datetime import date, datetime, timezone
 from typing import Any
 
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
 from tenacity import (
+    RetryCallState,
     retry,
     stop_after_attempt,
     wait_exponential,
@@ -18,14 +23,174 @@ from tenacity import (
 
 logger = logging.getLogger(__name__)
 
+# HTTP statuses worth retrying: rate limiting and transient server errors
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+BACKOFF_BASE_SECS = 1.0
+BACKOFF_MAX_SECS = 8.0
+
+# Keep-alive connections per host in a collector session; matches the widest
+# per-collector fan-out so concurrent requests reuse TLS connections
+SESSION_POOL_SIZE = 16
+
+
+def pooled_session(
+    headers: dict[str, str] | None = None,
+    pool_size: int = SESSION_POOL_SIZE,
+) -> requests.Session:
+    """
+    Create a requests.Session with a sized keep-alive pool for https/http.
+
+    Args:
+        headers: Default headers for every request.
+        pool_size: Connections kept alive per host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def http2_client(
+    headers: dict[str, str] | None = None,
+    timeout: float = 15,
+    max_keepalive: int = 8,
+) -> httpx.Client:
+    """
+    Create an HTTP/2 httpx.Client: concurrent requests from collector worker
+    threads multiplex over one TLS connection per host instead of opening
+    one connection each. Follows redirects, like requests does.
+    """
+    return httpx.Client(
+        http2=True,
+        timeout=timeout,
+        headers=headers,
+        limits=httpx.Limits(max_keepalive_connections=max_keepalive),
+        follow_redirects=True,
+    )
+
+
+class TransientHTTPError(Exception):
+    """Raised for HTTP 429/5xx responses so retry logic can back off and retry."""
+
+    def __init__(self, status_code: int, url: str = "", retry_after: float | None = None):
+        super().__init__(f"HTTP {status_code} from {url}")
+        self.status_code = status_code
+        self.url = url
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds (HTTP-date form is ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def raise_for_transient(resp: requests.Response | httpx.Response) -> None:
+    """Raise TransientHTTPError if the response status is retryable."""
+    if resp.status_code in TRANSIENT_STATUS_CODES:
+        raise TransientHTTPError(
+            resp.status_code,
+            url=resp.url,
+            retry_after=parse_retry_after(resp.headers.get("Retry-After")),
+        )
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = BACKOFF_BASE_SECS,
+    max_delay: float = BACKOFF_MAX_SECS,
+    retry_after: float | None = None,
+) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(max_delay, base * 2**attempt)).
+    A server-provided Retry-After takes precedence (capped at max_delay).
+    """
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    return random.uniform(0, min(max_delay, base * 2 ** attempt))
+
+
+def make_http_retry(
+    base: float = BACKOFF_BASE_SECS,
+    max_delay: float = BACKOFF_MAX_SECS,
+    attempts: int = 3,
+):
+    """
+    Build a tenacity decorator for single HTTP calls: retries 429/5xx
+    (TransientHTTPError) and connection errors from requests or httpx with
+    full-jitter backoff, honoring Retry-After.
+    """
+
+    def wait(retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        retry_after = exc.retry_after if isinstance(exc, TransientHTTPError) else None
+        return backoff_delay(
+            retry_state.attempt_number - 1,
+            base=base,
+            max_delay=max_delay,
+            retry_after=retry_after,
+        )
+
+    return retry(
+        stop=stop_after_attempt(attempts),
+        wait=wait,
+        retry=retry_if_exception_type(
+            (TransientHTTPError, requests.ConnectionError, requests.Timeout,
+             httpx.TransportError)
+        ),
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+        reraise=True,
+    )
+
+
+# Decorator for single HTTP calls with the default backoff
+http_retry = make_http_retry()
+
 
 class BaseCollector(ABC):
     """Abstract base class for all data collectors."""
 
     source_name: str = "unknown"  # Override in subclass
 
+    # Models the orchestrator may fetch concurrently with one instance. Only
+    # raise it for collectors that are thread-safe and throttle themselves
+    # (bulkhead / token bucket); others are walked one model at a time.
+    max_workers: int = 1
+
     def __init__(self):
         self.logger = logging.getLogger(f"etl.collectors.{self.source_name}")
+        self.set_run_clock(date.today(), datetime.now(timezone.utc))
+
+    def set_run_clock(self, run_date: date, run_ts: datetime) -> None:
+        """
+        Pin the date and fetched_at timestamp stamped on every result.
+
+        The orchestrator sets one clock for all collectors so a run that
+        crosses midnight doesn't split its rows across two dates.
+        """
+        self._run_date = run_date.isoformat()
+        self._run_ts = run_ts.isoformat()
+        # Same instant as a datetime, for time-window math shared by all models
+        self._run_at = run_ts
+
+    def prefetch_cache(self, aliases_by_model: dict[str, list[str]]) -> None:
+        """
+        Load this run's Redis cache entries for every model in one request.
+
+        Called by the orchestrator before the fetch loop with model slug ->
+        aliases. No-op for collectors that don't use the Redis cache.
+        """
+
+    def flush_cache(self) -> None:
+        """Store the Redis cache writes queued during the run; no-op by default."""
 
     @abstractmethod
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
@@ -66,7 +231,9 @@ class BaseCollector(ABC):
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError, OSError)),
+        retry=retry_if_exception_type(
+            (ConnectionError, TimeoutError, OSError, TransientHTTPError)
+        ),
         before_sleep=before_sleep_log(logger, logging.WARNING),
     )
     def _fetch_with_retry_internal(
@@ -80,11 +247,11 @@ class BaseCollector(ABC):
     ) -> dict[str, Any]:
         """Helper to create a properly formatted result dict."""
         return {
-            "date": date.today().isoformat(),
+            "date": self._run_date,
             "model_slug": model_slug,
             "source": self.source_name,
             "metrics": metrics,
-            "fetched_at": datetime.utcnow().isoformat(),
+            "fetched_at": self._run_ts,
         }
 
     def __repr__(self) -> str:
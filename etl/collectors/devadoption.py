@@ -20,33 +20,86 @@ Metrics collected:
 """
 
 import logging
-import time
+import threading
 from typing import Any
+from urllib.parse import urlsplit
 
+import orjson
 import requests
 
-from .base import BaseCollector
+from etl.cache import CacheBatch
+from .base import BaseCollector, http_retry, pooled_session, raise_for_transient
+from .throttle import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 NPM_API_URL = "https://api.npmjs.org/downloads/point/last-day"
 PYPI_API_URL = "https://pypistats.org/api/packages"
+# Min spacing between requests to the same registry (npm and PyPI pace independently)
 REQUEST_DELAY_SECS = 0.5
 
+# Cache TTL: 24 hours (keys are per-day, so this only bounds storage)
+CACHE_TTL_SECS = 86400
+
+# Bulkhead: npm/PyPI get their own cap on in-flight requests, separate from
+# GitHub's, so one degraded upstream can't starve the other
+_REGISTRY_BULKHEAD = threading.BoundedSemaphore(4)
+
 
 class DevAdoptionCollector(BaseCollector):
     """Collects npm + PyPI download counts for AI model SDKs."""
 
     source_name: str = "devadoption"
+    max_workers: int = 4
 
     def __init__(self, timeout: int = 15):
         super().__init__()
         self._timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
+        self._session = pooled_session({
             "User-Agent": "AIViralityIndex/1.0",
             "Accept": "application/json",
         })
+        # Registry host -> bucket allowing one request per REQUEST_DELAY_SECS
+        self._buckets: dict[str, TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        # Per-day download counts in Redis, read and written in bulk
+        self._redis = CacheBatch(ttl=CACHE_TTL_SECS)
+
+    def _cache_key(self, alias: str) -> str:
+        """Redis key for an 'npm:pkg' / 'pypi:pkg' alias on the run date."""
+        return f"{alias}:{self._run_date}"
+
+    def prefetch_cache(self, aliases_by_model: dict[str, list[str]]) -> None:
+        """Load the cached counts of every model's packages in one pipeline request."""
+        self._redis.prefetch([
+            self._cache_key(alias)
+            for aliases in aliases_by_model.values()
+            for alias in aliases
+            if alias.startswith(("npm:", "pypi:"))
+        ])
+
+    def flush_cache(self) -> None:
+        """Store the download counts fetched this run in one pipeline request."""
+        self._redis.flush()
+
+    def _pace(self, host: str) -> None:
+        """Wait out whatever remains of REQUEST_DELAY_SECS since the last call to host."""
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(
+                    rate=1 / REQUEST_DELAY_SECS, capacity=1
+                )
+        bucket.acquire()
+
+    @http_retry
+    def _get(self, url: str) -> requests.Response:
+        """GET with jittered backoff on 429/5xx and connection errors."""
+        self._pace(urlsplit(url).netloc)
+        with _REGISTRY_BULKHEAD:
+            resp = self._session.get(url, timeout=self._timeout)
+        raise_for_transient(resp)
+        return resp
 
     def _fetch_npm_downloads(self, package: str) -> int:
         """
@@ -58,14 +111,21 @@ class DevAdoptionCollector(BaseCollector):
         Returns:
             Download count (int), or 0 on failure.
         """
+        cache_key = self._cache_key(f"npm:{package}")
+        cached = self._redis.get(cache_key)
+        if cached is not None:
+            return int(cached)
+
         url = f"{NPM_API_URL}/{package}"
         try:
-            resp = self._session.get(url, timeout=self._timeout)
+            resp = self._get(url)
             if resp.status_code != 200:
                 self.logger.warning(f"npm API returned {resp.status_code} for '{package}'")
                 return 0
-            data = resp.json()
-            return int(data.get("downloads", 0))
+            data = orjson.loads(resp.content)
+            count = int(data.get("downloads", 0))
+            self._redis.set(cache_key, count)
+            return count
         except Exception as e:
             self.logger.warning(f"npm API error for '{package}': {e}")
             return 0
@@ -80,15 +140,22 @@ class DevAdoptionCollector(BaseCollector):
         Returns:
             Download count (int), or 0 on failure.
         """
+        cache_key = self._cache_key(f"pypi:{package}")
+        cached = self._redis.get(cache_key)
+        if cached is not None:
+            return int(cached)
+
         url = f"{PYPI_API_URL}/{package}/recent"
         try:
-            resp = self._session.get(url, timeout=self._timeout)
+            resp = self._get(url)
             if resp.status_code != 200:
                 self.logger.warning(f"PyPI stats API returned {resp.status_code} for '{package}'")
                 return 0
-            data = resp.json()
+            data = orjson.loads(resp.content)
             # PyPI recent endpoint: {"data": {"last_day": 12345, ...}}
-            return int(data.get("data", {}).get("last_day", 0))
+            count = int(data.get("data", {}).get("last_day", 0))
+            self._redis.set(cache_key, count)
+            return count
         except Exception as e:
             self.logger.warning(f"PyPI stats API error for '{package}': {e}")
             return 0
@@ -125,10 +192,7 @@ class DevAdoptionCollector(BaseCollector):
         total_pypi = 0
         raw_packages: list[dict] = []
 
-        for i, alias in enumerate(aliases):
-            if i > 0:
-                time.sleep(REQUEST_DELAY_SECS)
-
+        for alias in aliases:
             if alias.startswith("npm:"):
                 package = alias[4:]  # strip "npm:" prefix
                 count = self._fetch_npm_downloads(package)
@@ -0,0 +1,146 @@
+"""
+On-disk HTTP response cache for collectors.
+
+Responses are stored as .cache/{source}/{md5(url + sorted params)}.json
+holding the body text plus the time it was written and its TTL, so reruns
+within the TTL (same-day reruns, debugging, retries) skip the network and
+any rate-limit sleeps. Entries can also carry HTTP validators (ETag /
+Last-Modified) so an expired entry can be revalidated with a conditional GET.
+Writes go through a temp file + rename, so a crashed or concurrent writer
+never leaves a half-written entry.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+import orjson
+
+from etl.config import ETL_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Fields every cache entry is written with
+_ENTRY_KEYS = {"ts", "ttl", "body"}
+
+
+class FileCache:
+    """TTL cache of response bodies keyed by (url, params), one directory per source."""
+
+    def __init__(
+        self,
+        source: str,
+        ttl: float,
+        root: str | Path | None = ETL_CACHE_DIR,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            source: Subdirectory name (e.g. 'hackernews').
+            ttl: Seconds an entry stays fresh.
+            root: Cache root directory; None or '' disables the cache.
+        """
+        self.ttl = ttl
+        self._dir = Path(root) / source if root else None
+        self._clock = clock
+
+    @staticmethod
+    def key(url: str, params: dict[str, Any] | None = None) -> str:
+        """Stable key for a request: md5 of the URL plus sorted query params."""
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.md5(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, url: str, params: dict[str, Any] | None) -> Path | None:
+        return self._dir / f"{self.key(url, params)}.json" if self._dir else None
+
+    def get_entry(
+        self, url: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any] | None:
+        """
+        Return the raw entry even if expired: {ts, ttl, body, validators?}.
+
+        None if missing, unreadable or malformed. Used to revalidate a stale body.
+        """
+        path = self._path(url, params)
+        if path is None:
+            return None
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.debug(f"File cache read failed for {path}: {e}")
+            return None
+        if not isinstance(entry, dict) or not _ENTRY_KEYS <= entry.keys():
+            logger.debug(f"File cache entry malformed at {path}")
+            return None
+        return entry
+
+    def get(self, url: str, params: dict[str, Any] | None = None) -> str | None:
+        """Return the cached body text, or None if missing, expired or unreadable."""
+        entry = self.get_entry(url, params)
+        if entry is None:
+            return None
+        try:
+            if self._clock() - entry["ts"] > entry["ttl"]:
+                return None
+        except TypeError as e:
+            logger.debug(f"File cache entry malformed: {e}")
+            return None
+        return entry["body"]
+
+    def has(self, url: str, params: dict[str, Any] | None = None) -> bool:
+        """True if a fresh entry exists for the request."""
+        return self.get(url, params) is not None
+
+    def delete(self, url: str, params: dict[str, Any] | None = None) -> None:
+        """Drop the entry for the request, if any; failures are logged and ignored."""
+        path = self._path(url, params)
+        if path is None:
+            return
+        try:
+            path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"File cache delete failed for {path}: {e}")
+
+    def set(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        body: str,
+        validators: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Store a response body; failures are logged and ignored.
+
+        Args:
+            validators: Optional {'etag': ..., 'last_modified': ...} from the
+                response, for a later conditional GET.
+        """
+        path = self._path(url, params)
+        if path is None:
+            return
+        record: dict[str, Any] = {"ts": self._clock(), "ttl": self.ttl, "body": body}
+        if validators:
+            record["validators"] = validators
+        entry = orjson.dumps(record)
+        tmp = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(entry)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug(f"File cache write failed for {path}: {e}")
+            # Don't leave the temp file behind in the cache directory
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
@@ -13,30 +13,58 @@ Metrics collected:
 """
 
 import logging
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 from typing import Any
 
+import orjson
 import requests
 
+from etl.cache import CacheBatch
 from etl.config import GITHUB_TOKEN
-from .base import BaseCollector
+from .base import (
+    BaseCollector,
+    TransientHTTPError,
+    http_retry,
+    pooled_session,
+    raise_for_transient,
+)
+from .throttle import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 GITHUB_API_URL = "https://api.github.com"
-REQUEST_DELAY_SECS = 0.3
+# Max repos fetched in parallel per model
+MAX_CONCURRENT_REQUESTS = 10
+
+# Bulkhead: process-wide cap on in-flight GitHub requests, shared by all
+# collector instances so a slow GitHub can't tie up more threads than one
+# model's fan-out
+_GITHUB_BULKHEAD = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Authenticated REST budget. The bucket refills at that average rate; the
+# burst covers a whole run (~7 models x a few repos, repeats served from
+# Redis), so only back-to-back manual reruns ever wait
+GITHUB_HOURLY_LIMIT = 5000
+_GITHUB_BUCKET = TokenBucket(rate=GITHUB_HOURLY_LIMIT / 3600, capacity=30)
+
+# Cache TTL: 24 hours (keys are per-day, so this only bounds storage)
+CACHE_TTL_SECS = 86400
+
+# How far back prefetch_previous_metrics looks for the last reading
+PREVIOUS_LOOKBACK_DAYS = 14
 
 
 class GitHubCollector(BaseCollector):
     """Collects GitHub repository metrics for AI models."""
 
     source_name: str = "github"
+    max_workers: int = 4
 
     def __init__(self, timeout: int = 15):
         super().__init__()
         self._timeout = timeout
-        self._session = requests.Session()
         headers = {
             "Accept": "application/vnd.github+json",
             "User-Agent": "AIViralityIndex/1.0",
@@ -48,7 +76,38 @@ class GitHubCollector(BaseCollector):
             self.logger.warning(
                 "GITHUB_TOKEN not set — using unauthenticated requests (60/hour limit)"
             )
-        self._session.headers.update(headers)
+        self._session = pooled_session(headers)
+        # model slug -> previous metrics, filled by prefetch_previous_metrics()
+        self._previous: dict[str, dict[str, float]] | None = None
+        # Per-day repo stats in Redis, read and written in bulk
+        self._redis = CacheBatch(ttl=CACHE_TTL_SECS)
+
+    @http_retry
+    def _get(self, url: str) -> requests.Response:
+        """GET with jittered backoff on 429/5xx and connection errors."""
+        # Wait for a token before taking a slot, so waiting threads don't
+        # hold bulkhead slots
+        _GITHUB_BUCKET.acquire()
+        with _GITHUB_BULKHEAD:
+            resp = self._session.get(url, timeout=self._timeout)
+        raise_for_transient(resp)
+        return resp
+
+    def _cache_key(self, repo_full_name: str) -> str:
+        """Redis key for a repo's stats on the run date."""
+        return f"gh:{repo_full_name}:{self._run_date}"
+
+    def prefetch_cache(self, aliases_by_model: dict[str, list[str]]) -> None:
+        """Load the cached stats of every model's repos in one pipeline request."""
+        self._redis.prefetch([
+            self._cache_key(repo)
+            for repos in aliases_by_model.values()
+            for repo in repos
+        ])
+
+    def flush_cache(self) -> None:
+        """Store the repo stats fetched this run in one pipeline request."""
+        self._redis.flush()
 
     def _get_repo_stats(self, repo_full_name: str) -> dict[str, Any] | None:
         """
@@ -60,9 +119,15 @@ class GitHubCollector(BaseCollector):
         Returns:
             Dict with stars, forks, open_issues, watchers or None on failure.
         """
+        # Many models share repos, so serve repeats from Redis within the day
+        cache_key = self._cache_key(repo_full_name)
+        cached = self._redis.get(cache_key)
+        if cached is not None:
+            return cached
+
         url = f"{GITHUB_API_URL}/repos/{repo_full_name}"
         try:
-            resp = self._session.get(url, timeout=self._timeout)
+            resp = self._get(url)
 
             if resp.status_code == 404:
                 self.logger.warning(f"GitHub repo not found: {repo_full_name}")
@@ -76,17 +141,19 @@ class GitHubCollector(BaseCollector):
                 return None
 
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
-            return {
+            stats = {
                 "repo": repo_full_name,
                 "stars": data.get("stargazers_count", 0),
                 "forks": data.get("forks_count", 0),
                 "open_issues": data.get("open_issues_count", 0),
                 "watchers": data.get("subscribers_count", 0),
             }
+            self._redis.set(cache_key, stats)
+            return stats
 
-        except requests.RequestException as e:
+        except (requests.RequestException, TransientHTTPError, ValueError) as e:
             self.logger.warning(f"GitHub API error for {repo_full_name}: {e}")
             return None
 
@@ -100,7 +167,7 @@ class GitHubCollector(BaseCollector):
         """
         from etl.storage.supabase_client import get_client
 
-        today = date.today().isoformat()
+        today = self._run_date
         client = get_client()
 
         result = (
@@ -117,6 +184,51 @@ class GitHubCollector(BaseCollector):
 
         return {row["metric_name"]: float(row["metric_value"]) for row in result.data}
 
+    def prefetch_previous_metrics(
+        self, model_ids: dict[str, str]
+    ) -> dict[str, dict[str, float]]:
+        """
+        Load the most recent previous GitHub metrics for many models in one query.
+
+        Replaces the per-model model-id and _get_previous_metrics() lookups
+        for the rest of the run; models with no earlier reading get an empty
+        dict (no delta).
+
+        Args:
+            model_ids: Model slug -> model UUID, as loaded by the orchestrator.
+
+        Returns:
+            Dict like {'chatgpt': {'total_stars': 12345, 'total_forks': 678}}.
+        """
+        from etl.storage.supabase_client import get_client
+
+        today = date.fromisoformat(self._run_date)
+        since = (today - timedelta(days=PREVIOUS_LOOKBACK_DAYS)).isoformat()
+        client = get_client()
+
+        result = (
+            client.table("raw_metrics")
+            .select("model_id, metric_name, metric_value")
+            .in_("model_id", list(model_ids.values()))
+            .eq("source", "github")
+            .gte("date", since)
+            .lt("date", today.isoformat())
+            .in_("metric_name", ["total_stars", "total_forks"])
+            .order("date", desc=True)
+        )
+        result = result.execute()
+
+        by_id: dict[str, dict[str, float]] = {mid: {} for mid in model_ids.values()}
+        for row in result.data:
+            # Rows are newest first, so keep the first value seen per metric
+            metrics = by_id.setdefault(row["model_id"], {})
+            metrics.setdefault(row["metric_name"], float(row["metric_value"]))
+
+        previous = {slug: by_id[mid] for slug, mid in model_ids.items()}
+
+        self._previous = previous
+        return previous
+
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
         """
         Fetch GitHub metrics for a model.
@@ -153,11 +265,12 @@ class GitHubCollector(BaseCollector):
         all_failed = True
         raw_repos: list[dict] = []
 
-        for i, repo in enumerate(aliases):
-            if i > 0:
-                time.sleep(REQUEST_DELAY_SECS)
+        # Fetch all repos concurrently; the pool size caps in-flight requests
+        workers = min(MAX_CONCURRENT_REQUESTS, len(aliases))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            all_stats = list(pool.map(self._get_repo_stats, aliases))
 
-            stats = self._get_repo_stats(repo)
+        for stats in all_stats:
             if stats is not None:
                 all_failed = False
                 total_stars += stats["stars"]
@@ -173,15 +286,18 @@ class GitHubCollector(BaseCollector):
         stars_delta = 0
         forks_delta = 0
         try:
-            from etl.storage.supabase_client import get_model_id as get_mid
-
-            model_id = get_mid(model_slug)
-            if model_id:
-                previous = self._get_previous_metrics(model_id)
-                if "total_stars" in previous:
-                    stars_delta = max(0, total_stars - previous["total_stars"])
-                if "total_forks" in previous:
-                    forks_delta = max(0, total_forks - previous["total_forks"])
+            if self._previous is not None and model_slug in self._previous:
+                previous = self._previous[model_slug]
+            else:
+                # Not prefetched (collector used on its own): look up directly
+                from etl.storage.supabase_client import get_model_id as get_mid
+
+                model_id = get_mid(model_slug)
+                previous = self._get_previous_metrics(model_id) if model_id else {}
+            if "total_stars" in previous:
+                stars_delta = max(0, total_stars - previous["total_stars"])
+            if "total_forks" in previous:
+                forks_delta = max(0, total_forks - previous["total_forks"])
         except Exception as e:
             self.logger.warning(f"Could not compute deltas for {model_slug}: {e}")
 
@@ -12,114 +12,224 @@ Metrics collected:
 """
 
 import logging
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import requests
+import httpx
+import orjson
 
-from .base import BaseCollector
+from .base import (
+    BaseCollector,
+    TransientHTTPError,
+    http2_client,
+    http_retry,
+    raise_for_transient,
+)
+from .file_cache import FileCache
+from .single_flight import SingleFlight
+from .throttle import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 HN_SEARCH_URL = "https://hn.algolia.com/api/v1/search"
 HN_SEARCH_DATE_URL = "https://hn.algolia.com/api/v1/search_by_date"
 
-# Delay between API calls to be respectful
-REQUEST_DELAY_SECS = 1.0
+# On-disk response cache TTL: 30 minutes
+CACHE_TTL_SECS = 30 * 60
+
+# Max result pages fetched per search; 5 x 200 is Algolia's 1000-hit
+# pagination limit, so further pages would come back empty
+MAX_PAGES = 5
+
+# Algolia page size (its maximum is 1000; 200 keeps responses small)
+HITS_PER_PAGE = 200
+
+# Max HN queries (story/comment x result page) in flight
+MAX_CONCURRENT_REQUESTS = 4
+
+# Bulkhead: process-wide cap on in-flight Algolia requests, so concurrent
+# story/comment and page fan-out stays polite to the free API
+_HN_BULKHEAD = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Algolia allows 10,000 requests/hour per IP; stay under it with model fan-out
+_HN_BUCKET = TokenBucket(rate=2.5, capacity=MAX_CONCURRENT_REQUESTS)
 
 
 class HackerNewsCollector(BaseCollector):
     """Collects Hacker News discussion activity for AI models."""
 
     source_name: str = "hackernews"
+    max_workers: int = 4
 
     def __init__(self, timeout: int = 15):
         super().__init__()
         self._timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
-            "User-Agent": "AIViralityIndex/1.0 (research aggregator)",
-        })
+        self._cache = FileCache(self.source_name, ttl=CACHE_TTL_SECS)
+        # Aliases shared between models (and concurrent page fetches) hit
+        # Algolia once per run
+        self._inflight = SingleFlight()
+        # HTTP/2: concurrent alias/page queries share one Algolia connection
+        self._client = http2_client(
+            {"User-Agent": "AIViralityIndex/1.0 (research aggregator)"},
+            timeout=timeout,
+        )
+
+    def _get(self, params: dict[str, Any]) -> httpx.Response:
+        """GET search_by_date, once per distinct params per run."""
+        return self._inflight.do(
+            SingleFlight.key(HN_SEARCH_DATE_URL, params=params),
+            lambda: self._request(params),
+        )
+
+    @http_retry
+    def _request(self, params: dict[str, Any]) -> httpx.Response:
+        """GET search_by_date with jittered backoff on 429/5xx and connection errors."""
+        with _HN_BULKHEAD:
+            _HN_BUCKET.acquire()
+            resp = self._client.get(HN_SEARCH_DATE_URL, params=params)
+        raise_for_transient(resp)
+        return resp
+
+    def _get_page(
+        self,
+        query: str,
+        tags: str,
+        created_after: int,
+        page: int,
+        optional_words: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Fetch one page of search_by_date results.
+
+        The created_after bound sent to Algolia is floored to the cache TTL so
+        the query (and its cache key) is stable across reruns in that window;
+        _search_hn trims the extra hits back to the exact cutoff.
+        """
+        query_after = created_after - created_after % CACHE_TTL_SECS
+        params = {
+            "query": query,
+            "tags": tags,
+            "numericFilters": f"created_at_i>{query_after}",
+            "hitsPerPage": HITS_PER_PAGE,
+            "page": page,
+        }
+        if optional_words:
+            # Algolia ANDs query words by default; optional words make them OR.
+            # Words, not whole aliases: every word of the joined query must be
+            # listed for a hit matching any single alias to qualify.
+            params["optionalWords"] = ",".join(optional_words)
+        cached = self._cache.get(HN_SEARCH_DATE_URL, params)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        resp = self._get(params)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        self._cache.set(HN_SEARCH_DATE_URL, params, resp.text)
+        return data
 
     def _search_hn(
         self,
         query: str,
         tags: str,
         created_after: int,
-    ) -> list[dict]:
+        optional_words: list[str] | None = None,
+    ) -> tuple[list[dict], bool]:
         """
         Search HN Algolia API.
 
+        Page 0 tells us nbPages; any further pages are then fetched concurrently.
+        A short page 0 is the last one, whatever nbPages says. Hits are then
+        filtered on created_at_i, since the query bound is floored.
+
         Args:
             query: Search query string.
             tags: HN tags filter (e.g., 'story', 'comment').
             created_after: Unix timestamp — only return items created after this.
+            optional_words: Query words that need not all match (OR search).
 
         Returns:
-            List of hit dicts from the API.
+            (hit dicts from the API, whether nbHits exceeded the hits fetched)
         """
-        all_hits: list[dict] = []
-        page = 0
-        max_pages = 5  # safety limit
-
-        while page < max_pages:
-            params = {
-                "query": query,
-                "tags": tags,
-                "numericFilters": f"created_at_i>{created_after}",
-                "hitsPerPage": 200,
-                "page": page,
-            }
-
+        try:
+            first = self._get_page(query, tags, created_after, 0, optional_words)
+        except (httpx.HTTPError, TransientHTTPError, ValueError) as e:
+            self.logger.warning("HN API request failed (page 0): %s", e)
+            return [], False
+
+        all_hits: list[dict] = list(first.get("hits", []))
+        nb_pages = min(first.get("nbPages", 0), MAX_PAGES)
+        if nb_pages <= 1 or len(all_hits) < HITS_PER_PAGE:
+            return self._created_after(all_hits, created_after), False
+
+        def fetch_page(page: int) -> list[dict]:
             try:
-                resp = self._session.get(
-                    HN_SEARCH_DATE_URL,
-                    params=params,
-                    timeout=self._timeout,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except requests.RequestException as e:
-                self.logger.warning(f"HN API request failed (page {page}): {e}")
-                break
-
-            hits = data.get("hits", [])
-            all_hits.extend(hits)
-
-            # Check if there are more pages
-            nb_pages = data.get("nbPages", 0)
-            if page + 1 >= nb_pages:
-                break
-
-            page += 1
-            time.sleep(REQUEST_DELAY_SECS * 0.5)
-
-        return all_hits
-
-    def _fetch_for_query(
+                return self._get_page(
+                    query, tags, created_after, page, optional_words
+                ).get("hits", [])
+            except (httpx.HTTPError, TransientHTTPError, ValueError) as e:
+                self.logger.warning("HN API request failed (page %d): %s", page, e)
+                return []
+
+        with ThreadPoolExecutor(max_workers=nb_pages - 1) as pool:
+            for hits in pool.map(fetch_page, range(1, nb_pages)):
+                all_hits.extend(hits)
+
+        truncated = first.get("nbHits", 0) > len(all_hits)
+        return self._created_after(all_hits, created_after), truncated
+
+    def _search_union(
         self,
-        query: str,
-        since_ts: int,
-    ) -> dict[str, Any]:
+        aliases: list[str],
+        tags: str,
+        created_after: int,
+    ) -> list[dict]:
         """
-        Fetch HN stories and comments for a single search query.
+        Search hits mentioning any alias, with one OR query when it fits.
 
-        Returns:
-            Dict with stories_count, comments_count, total_points, top_points.
+        The OR query shares Algolia's 1000-hit cap across all aliases. When
+        nbHits says it was cut off, each alias is searched on its own (each
+        with its own cap, as before the OR query) and hits merged by objectID.
         """
-        # Fetch stories
-        stories = self._search_hn(query, tags="story", created_after=since_ts)
-        time.sleep(REQUEST_DELAY_SECS)
-
-        # Fetch comments
-        comments = self._search_hn(query, tags="comment", created_after=since_ts)
-
-        # Calculate metrics
-        story_points = [h.get("points", 0) or 0 for h in stories]
-        total_points = sum(story_points)
-        top_points = max(story_points) if story_points else 0
+        hits, truncated = self._search_hn(
+            " ".join(aliases), tags, created_after, self._query_words(aliases)
+        )
+        if not truncated or len(aliases) == 1:
+            return hits
 
+        self.logger.info(
+            "HN %s OR query hit the result cap, searching %d aliases separately",
+            tags,
+            len(aliases),
+        )
+        merged: dict[Any, dict] = {}
+        for alias in aliases:
+            alias_hits, _ = self._search_hn(alias, tags, created_after)
+            for hit in alias_hits:
+                merged.setdefault(hit.get("objectID") or id(hit), hit)
+        return list(merged.values())
+
+    @staticmethod
+    def _query_words(aliases: list[str]) -> list[str]:
+        """Distinct words of the aliases, in order, for Algolia optionalWords."""
+        return list(dict.fromkeys(word for alias in aliases for word in alias.split()))
+
+    @staticmethod
+    def _created_after(hits: list[dict], created_after: int) -> list[dict]:
+        """Keep hits created strictly after the cutoff timestamp."""
+        return [hit for hit in hits if (hit.get("created_at_i") or 0) > created_after]
+
+    @staticmethod
+    def _summarize(stories: list[dict], comments: list[dict]) -> dict[str, Any]:
+        """Reduce story/comment hits to stories_count, comments_count, total_points, top_points."""
+        total_points = top_points = 0
+        for hit in stories:
+            points = hit.get("points") or 0
+            total_points += points
+            if points > top_points:
+                top_points = points
         return {
             "stories_count": len(stories),
             "comments_count": len(comments),
@@ -127,12 +237,76 @@ class HackerNewsCollector(BaseCollector):
             "top_points": top_points,
         }
 
+    def _search_stories_and_comments(
+        self,
+        aliases: list[str],
+        since_ts: int,
+    ) -> tuple[list[dict], list[dict]]:
+        """Run the story and comment searches for the aliases concurrently."""
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            stories_future = pool.submit(self._search_union, aliases, "story", since_ts)
+            comments_future = pool.submit(self._search_union, aliases, "comment", since_ts)
+            return stories_future.result(), comments_future.result()
+
+    @staticmethod
+    def _hit_text(hit: dict) -> str:
+        """Lowercased searchable text of a story or comment hit."""
+        return " ".join(
+            hit.get(field) or ""
+            for field in ("title", "story_title", "story_text", "comment_text", "url")
+        ).lower()
+
+    def _fetch_combined(
+        self,
+        aliases: list[str],
+        since_ts: int,
+    ) -> tuple[dict[str, Any], dict[str, dict]]:
+        """
+        Fetch HN stories and comments for all aliases with one OR search.
+
+        Hits are post-filtered to those mentioning at least one alias, which
+        also drops loose matches from the OR query; each hit counts once
+        even if several aliases match it.
+
+        Returns:
+            (metrics for the union of matching hits, per-alias metrics)
+        """
+        stories, comments = self._search_stories_and_comments(aliases, since_ts)
+
+        needles = [(alias, alias.lower()) for alias in aliases]
+        matched: dict[str, tuple[list[dict], list[dict]]] = {a: ([], []) for a in aliases}
+        union: tuple[list[dict], list[dict]] = ([], [])
+        for kind, hits in enumerate((stories, comments)):
+            for hit in hits:
+                text = self._hit_text(hit)
+                hit_aliases = [alias for alias, needle in needles if needle in text]
+                if not hit_aliases:
+                    continue
+                union[kind].append(hit)
+                for alias in hit_aliases:
+                    matched[alias][kind].append(hit)
+
+        per_alias = {
+            alias: self._summarize(alias_stories, alias_comments)
+            for alias, (alias_stories, alias_comments) in matched.items()
+        }
+        return self._summarize(*union), per_alias
+
+    def _since_ts(self) -> int:
+        """
+        Exactly 24 hours before the run clock as a unix timestamp.
+
+        Derived from the pinned run clock rather than now(), so every model in
+        a run uses the same window (one cache/de-dup key per query).
+        """
+        return int((self._run_at - timedelta(hours=24)).timestamp())
+
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
         """
         Fetch Hacker News activity for a model.
 
-        Searches for each alias in the last 24 hours, aggregates results
-        (takes max across aliases to avoid double-counting overlapping terms).
+        Searches all aliases at once for the last 24 hours and counts each
+        matching story/comment once, however many aliases it mentions.
 
         Args:
             model_slug: Model identifier (e.g., 'chatgpt').
@@ -142,47 +316,20 @@ class HackerNewsCollector(BaseCollector):
             Result dict with metrics or None on complete failure.
         """
         if not aliases:
-            self.logger.warning(f"No aliases for {model_slug}, skipping HN fetch")
+            self.logger.warning("No aliases for %s, skipping HN fetch", model_slug)
             return None
 
         self.logger.info(
-            f"Fetching HN data for {model_slug} with {len(aliases)} aliases"
+            "Fetching HN data for %s with %d aliases", model_slug, len(aliases)
         )
 
-        # 24 hours ago as unix timestamp
-        since = datetime.now(timezone.utc) - timedelta(hours=24)
-        since_ts = int(since.timestamp())
-
-        # Aggregate across aliases: use the combined OR query for efficiency
-        # HN Algolia supports OR via space-separated terms in quotes
-        # But for accuracy, we query each alias separately and take the max
-        best = {
-            "stories_count": 0,
-            "comments_count": 0,
-            "total_points": 0,
-            "top_points": 0,
-        }
-        all_failed = True
-        raw_per_alias: dict[str, dict] = {}
-
-        for i, alias in enumerate(aliases):
-            if i > 0:
-                time.sleep(REQUEST_DELAY_SECS)
-
-            try:
-                result = self._fetch_for_query(alias, since_ts)
-                raw_per_alias[alias] = result
-                all_failed = False
-
-                # Take max of each metric across aliases
-                for key in best:
-                    best[key] = max(best[key], result[key])
-
-            except Exception as e:
-                self.logger.warning(f"HN fetch failed for alias '{alias}': {e}")
+        since_ts = self._since_ts()
+        since = datetime.fromtimestamp(since_ts, timezone.utc)
 
-        if all_failed:
-            self.logger.error(f"All HN fetches failed for {model_slug}")
+        try:
+            best, raw_per_alias = self._fetch_combined(aliases, since_ts)
+        except Exception as e:
+            self.logger.error("HN fetch failed for %s: %s", model_slug, e)
             return None
 
         result = self.make_result(
@@ -201,8 +348,10 @@ class HackerNewsCollector(BaseCollector):
         }
 
         self.logger.info(
-            f"HN for {model_slug}: stories={best['stories_count']}, "
-            f"comments={best['comments_count']}, "
-            f"top_points={best['top_points']}"
+            "HN for %s: stories=%d, comments=%d, top_points=%d",
+            model_slug,
+            best["stories_count"],
+            best["comments_count"],
+            best["top_points"],
         )
         return result
@@ -7,27 +7,62 @@ AI model in the last 24 hours. No API key required.
 Metrics collected:
 - article_count: number of articles mentioning the model in last 24h
 - source_count: number of unique news sources
-- avg_tone: average tone across articles (negative = critical, positive = favorable)
+- avg_tone: average tone over the last 72h from GDELT's ToneChart
+  (negative = critical, positive = favorable); if the ToneChart fails, the
+  mean tone of the last 24h's articles, else 0.0
 
 GDELT tone scale: roughly -10 (very negative) to +10 (very positive),
 with most articles falling between -5 and +5.
 """
 
+import functools
 import logging
-import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from typing import Any
-from urllib.parse import quote
 
-import requests
-
-from .base import BaseCollector
+import httpx
+import numpy as np
+import orjson
+import pandas as pd
+
+from .base import (
+    BaseCollector,
+    TransientHTTPError,
+    http2_client,
+    make_http_retry,
+    raise_for_transient,
+)
+from .file_cache import FileCache
+from .single_flight import SingleFlight
+from .throttle import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 GDELT_DOC_API = "https://api.gdeltproject.org/api/v2/doc/doc"
 REQUEST_DELAY_SECS = 6.0  # GDELT enforces 1 request per 5 seconds
 
+# ArtList seendate, e.g. "20260218T191500Z"
+SEENDATE_FORMAT = "%Y%m%dT%H%M%SZ"
+SEENDATE_PATTERN = r"\d{8}T\d{6}Z"
+
+# On-disk response cache TTL: 1 hour
+CACHE_TTL_SECS = 60 * 60
+
+# Shared across workers: one request per REQUEST_DELAY_SECS, but a call only
+# waits out what is left of the interval (and cache hits never wait)
+_GDELT_BUCKET = TokenBucket(rate=1 / REQUEST_DELAY_SECS, capacity=1)
+
+# Attempts per GDELT request; 5 lets the total backoff outlast a rate-limit window
+RETRY_ATTEMPTS = 5
+
+# Retry 429/5xx with full-jitter exponential backoff scaled to GDELT's
+# 5s/request limit (Retry-After wins when GDELT sends one)
+_gdelt_retry = make_http_retry(
+    base=REQUEST_DELAY_SECS,
+    max_delay=4 * REQUEST_DELAY_SECS,
+    attempts=RETRY_ATTEMPTS,
+)
+
 
 class GDELTNewsCollector(BaseCollector):
     """Collects news article activity for AI models via GDELT."""
@@ -37,10 +72,51 @@ class GDELTNewsCollector(BaseCollector):
     def __init__(self, timeout: int = 30):
         super().__init__()
         self._timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
-            "User-Agent": "AIViralityIndex/1.0 (research aggregator)",
-        })
+        self._cache = FileCache(self.source_name, ttl=CACHE_TTL_SECS)
+        # Identical queries from models sharing aliases go out once per run
+        self._inflight = SingleFlight()
+        self._client = http2_client(
+            {"User-Agent": "AIViralityIndex/1.0 (research aggregator)"},
+            timeout=timeout,
+        )
+
+    def _get(self, params: dict[str, str]) -> httpx.Response:
+        """GET the DOC API, once per distinct params per run."""
+        return self._inflight.do(
+            SingleFlight.key(GDELT_DOC_API, params=params),
+            lambda: self._request(params),
+        )
+
+    @_gdelt_retry
+    def _request(self, params: dict[str, str]) -> httpx.Response:
+        """GET the DOC API with backoff on 429/5xx and connection errors."""
+        _GDELT_BUCKET.acquire()
+        resp = self._client.get(GDELT_DOC_API, params=params)
+        raise_for_transient(resp)
+        return resp
+
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_query(aliases: tuple[str, ...]) -> str:
+        """
+        Build the OR query for a model's aliases: ("term1" OR "term2" OR ...).
+
+        GDELT requires OR'd terms to be wrapped in parentheses. Params are
+        URL-encoded by the HTTP client, so the terms go in unquoted.
+        """
+        if len(aliases) > 1:
+            return "(" + " OR ".join(f'"{alias}"' for alias in aliases) + ")"
+        return f'"{aliases[0]}"'
+
+    @staticmethod
+    def _tone_params(query: str) -> dict[str, str]:
+        """ToneChart request params for a query."""
+        return {
+            "query": f"{query} sourcelang:english",
+            "mode": "ToneChart",
+            "format": "json",
+            "timespan": "72h",
+        }
 
     def _query_gdelt(self, query: str) -> dict[str, Any] | None:
         """
@@ -60,45 +136,30 @@ class GDELTNewsCollector(BaseCollector):
             "timespan": "72h",
         }
 
-        # Retry up to 3 times with exponential backoff for 429s
-        for attempt in range(3):
-            try:
-                resp = self._session.get(
-                    GDELT_DOC_API,
-                    params=params,
-                    timeout=self._timeout,
-                )
-
-                if resp.status_code == 429:
-                    wait = (attempt + 1) * 5
-                    self.logger.warning(
-                        f"GDELT rate limited (429), waiting {wait}s (attempt {attempt+1}/3)"
-                    )
-                    time.sleep(wait)
-                    continue
-
-                resp.raise_for_status()
+        cached = self._cache.get(GDELT_DOC_API, params)
+        if cached is not None:
+            return orjson.loads(cached)
 
-                # GDELT returns empty body or non-JSON when no results
-                text = resp.text.strip()
-                if not text or text.startswith("<!"):
-                    return None
-
-                return resp.json()
+        try:
+            resp = self._get(params)
+            resp.raise_for_status()
 
-            except requests.exceptions.JSONDecodeError:
-                self.logger.warning(f"GDELT returned non-JSON for query: {query}")
+            # GDELT returns empty body or non-JSON when no results
+            body = resp.content.strip()
+            if not body or body.startswith(b"<!"):
                 return None
-            except requests.RequestException as e:
-                if attempt < 2:
-                    wait = (attempt + 1) * 5
-                    self.logger.warning(f"GDELT API error: {e}, retrying in {wait}s")
-                    time.sleep(wait)
-                else:
-                    self.logger.warning(f"GDELT API error after 3 attempts: {e}")
-                    return None
 
-        return None
+            # Parse the raw bytes: skips the str decode resp.json() does
+            data = orjson.loads(body)
+            self._cache.set(GDELT_DOC_API, params, resp.text)
+            return data
+
+        except ValueError:
+            self.logger.warning("GDELT returned non-JSON for query: %s", query)
+            return None
+        except (httpx.HTTPError, TransientHTTPError) as e:
+            self.logger.warning("GDELT API error: %s", e)
+            return None
 
     def _query_gdelt_tone(self, query: str) -> float | None:
         """
@@ -110,47 +171,81 @@ class GDELTNewsCollector(BaseCollector):
         Returns:
             Average tone float or None on failure.
         """
-        params = {
-            "query": f"{query} sourcelang:english",
-            "mode": "ToneChart",
-            "format": "json",
-            "timespan": "72h",
-        }
+        params = self._tone_params(query)
 
         try:
-            resp = self._session.get(
-                GDELT_DOC_API,
-                params=params,
-                timeout=self._timeout,
-            )
-            resp.raise_for_status()
+            cached = self._cache.get(GDELT_DOC_API, params)
+            if cached is not None:
+                data = orjson.loads(cached)
+            else:
+                resp = self._get(params)
+                resp.raise_for_status()
 
-            text = resp.text.strip()
-            if not text or text.startswith("<!"):
-                return None
+                body = resp.content.strip()
+                if not body or body.startswith(b"<!"):
+                    return None
 
-            data = resp.json()
-            # tonechart returns list of {date, bin, count} or similar
-            # Try to extract an average from the data
+                data = orjson.loads(body)
+                self._cache.set(GDELT_DOC_API, params, resp.text)
+
+            # tonechart returns list of {bin, count}: count-weighted mean of bins
             if isinstance(data, dict) and "tonechart" in data:
                 entries = data["tonechart"]
                 if entries:
-                    tones = []
-                    counts = []
-                    for entry in entries:
-                        tone = entry.get("bin", 0)
-                        count = entry.get("count", 0)
-                        tones.append(float(tone) * int(count))
-                        counts.append(int(count))
-                    if sum(counts) > 0:
-                        return round(sum(tones) / sum(counts), 2)
+                    bins = np.fromiter(
+                        (float(e.get("bin", 0)) for e in entries),
+                        dtype=np.float64, count=len(entries),
+                    )
+                    counts = np.fromiter(
+                        (int(e.get("count", 0)) for e in entries),
+                        dtype=np.int64, count=len(entries),
+                    )
+                    total = counts.sum()
+                    if total > 0:
+                        return round(float(bins @ counts) / float(total), 2)
 
             return None
 
-        except (requests.RequestException, ValueError, KeyError) as e:
-            self.logger.warning(f"GDELT tone query failed: {e}")
+        except (httpx.HTTPError, TransientHTTPError, ValueError, KeyError) as e:
+            self.logger.warning("GDELT tone query failed: %s", e)
             return None
 
+    @staticmethod
+    def _recent_articles(articles: list[dict], cutoff: datetime) -> pd.DataFrame:
+        """
+        Keep articles seen at or after cutoff.
+
+        seendate is fixed-width and zero-padded (YYYYMMDDTHHMMSSZ), so it
+        sorts like the time it encodes: well-formed values are compared to
+        the formatted cutoff as strings, with no datetime parsing at all.
+        Articles with a missing or malformed seendate are kept.
+
+        Args:
+            articles: ArtList article dicts.
+            cutoff: Earliest seendate to keep (UTC).
+
+        Returns:
+            DataFrame of the kept articles with at least a domain column.
+        """
+        df = pd.DataFrame(articles)
+        for col in ("seendate", "domain"):
+            if col not in df:
+                df[col] = None
+        seen = df["seendate"].astype(object)
+        seen = seen.where(seen.map(type) == str, "")
+        well_formed = seen.str.fullmatch(SEENDATE_PATTERN).astype(bool)
+        return df[~well_formed | (seen >= cutoff.strftime(SEENDATE_FORMAT))]
+
+    @staticmethod
+    def _article_tone(articles: pd.DataFrame) -> float | None:
+        """Mean of the articles' numeric tone values, or None if none have one."""
+        if "tone" not in articles:
+            return None
+        tones = pd.to_numeric(articles["tone"], errors="coerce").dropna()
+        if tones.empty:
+            return None
+        return round(float(tones.mean()), 2)
+
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
         """
         Fetch news data for a model from GDELT.
@@ -165,19 +260,14 @@ class GDELTNewsCollector(BaseCollector):
             Result dict with metrics or None on complete failure.
         """
         if not aliases:
-            self.logger.warning(f"No GDELT aliases for {model_slug}, skipping")
+            self.logger.warning("No GDELT aliases for %s, skipping", model_slug)
             return None
 
         self.logger.info(
-            f"Fetching GDELT news for {model_slug} with {len(aliases)} aliases"
+            "Fetching GDELT news for %s with %d aliases", model_slug, len(aliases)
         )
 
-        # Build OR query: ("term1" OR "term2" OR ...)
-        # GDELT requires OR'd terms to be wrapped in parentheses
-        if len(aliases) > 1:
-            query = "(" + " OR ".join(f'"{alias}"' for alias in aliases) + ")"
-        else:
-            query = f'"{aliases[0]}"'
+        query = self._build_query(tuple(aliases))
 
         # Step 1: Get article list (72h window, then filter to last 24h)
         data = self._query_gdelt(query)
@@ -186,49 +276,25 @@ class GDELTNewsCollector(BaseCollector):
         if data and "articles" in data:
             all_articles = data["articles"]
 
-        # Filter to last 24h by seendate (format: "20260218T191500Z")
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-        articles = []
-        for art in all_articles:
-            seendate = art.get("seendate", "")
-            if seendate:
-                try:
-                    dt = datetime.strptime(seendate, "%Y%m%dT%H%M%SZ").replace(
-                        tzinfo=timezone.utc
-                    )
-                    if dt >= cutoff:
-                        articles.append(art)
-                except ValueError:
-                    articles.append(art)  # include if date unparseable
-            else:
-                articles.append(art)
-
+        # Filter to last 24h by seendate
+        cutoff = self._run_at - timedelta(hours=24)
+        articles = self._recent_articles(all_articles, cutoff)
         article_count = len(articles)
 
         # Count unique source domains
-        sources = set()
-        for art in articles:
-            domain = art.get("domain", "")
-            if domain:
-                sources.add(domain)
+        sources = articles["domain"].replace("", pd.NA).dropna().unique().tolist()
         source_count = len(sources)
 
-        # Step 2: Get average tone
-        time.sleep(REQUEST_DELAY_SECS)
-        avg_tone = self._query_gdelt_tone(query)
+        # Step 2: Get average tone from the tonechart (72h ToneChart mean),
+        # not from the articles whenever enough carry a tone. Skip the
+        # request only when the ArtList answered with no articles in that
+        # same 72h window; a quiet last 24h still has a 72h tone.
+        no_articles_72h = data is not None and not all_articles
+        avg_tone = None if no_articles_72h else self._query_gdelt_tone(query)
 
         # If tonechart failed, compute from article tones if available
-        if avg_tone is None and articles:
-            tones = []
-            for art in articles:
-                tone = art.get("tone", None)
-                if tone is not None:
-                    try:
-                        tones.append(float(tone))
-                    except (ValueError, TypeError):
-                        pass
-            if tones:
-                avg_tone = round(sum(tones) / len(tones), 2)
+        if avg_tone is None:
+            avg_tone = self._article_tone(articles)
 
         if avg_tone is None:
             avg_tone = 0.0  # neutral fallback
@@ -246,11 +312,14 @@ class GDELTNewsCollector(BaseCollector):
             "query": query,
             "article_count": article_count,
             "source_count": source_count,
-            "sample_sources": list(sources)[:10],
+            "sample_sources": sources[:10],
         }
 
         self.logger.info(
-            f"GDELT for {model_slug}: articles={article_count}, "
-            f"sources={source_count}, tone={avg_tone:.2f}"
+            "GDELT for %s: articles=%d, sources=%d, tone=%.2f",
+            model_slug,
+            article_count,
+            source_count,
+            avg_tone,
         )
         return result
@@ -0,0 +1,113 @@
+"""
+Local SQLite store of daily Wikipedia pageviews, keyed by (article, day).
+
+A day's pageview count stops changing once Wikimedia has published it, but
+every daily run asks for the same 7-day window. Keeping settled days in
+.cache/wikipedia/pageviews.db lets a run request only the last couple of
+days, and prune() drops days that have aged out of every window so the
+file stays bounded. Any failure to read or write the database is logged and treated as a
+miss, so the store can only save requests, never lose data.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from etl.config import ETL_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pageviews (
+    article TEXT NOT NULL,
+    day TEXT NOT NULL,
+    views INTEGER NOT NULL,
+    PRIMARY KEY (article, day)
+)
+"""
+
+
+class PageviewStore:
+    """Thread-safe (article, YYYYMMDD day) -> views table in one SQLite file."""
+
+    def __init__(self, root: str | Path | None = ETL_CACHE_DIR):
+        """
+        Args:
+            root: Cache root directory; None or '' disables the store.
+        """
+        self._path = Path(root) / "wikipedia" / "pageviews.db" if root else None
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database on first use; caller holds the lock."""
+        if self._conn is None and self._path is not None:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self._path, check_same_thread=False)
+                conn.execute(_SCHEMA)
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                logger.debug(f"Pageview store unavailable at {self._path}: {e}")
+                self._path = None
+        return self._conn
+
+    def get(self, article: str, start_day: str, end_day: str) -> dict[str, int]:
+        """
+        Stored views for article between two YYYYMMDD days, inclusive.
+
+        Returns:
+            Dict like {'20260210': 1234}; empty if nothing is stored.
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return {}
+            try:
+                rows = conn.execute(
+                    "SELECT day, views FROM pageviews"
+                    " WHERE article = ? AND day BETWEEN ? AND ?",
+                    (article, start_day, end_day),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.debug(f"Pageview store read failed for {article}: {e}")
+                return {}
+        return dict(rows)
+
+    def put(self, article: str, views: dict[str, int]) -> None:
+        """Store (or overwrite) views per YYYYMMDD day for article."""
+        if not views:
+            return
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO pageviews (article, day, views)"
+                        " VALUES (?, ?, ?)",
+                        [(article, day, count) for day, count in views.items()],
+                    )
+            except sqlite3.Error as e:
+                logger.debug(f"Pageview store write failed for {article}: {e}")
+
+    def prune(self, before_day: str) -> int:
+        """
+        Delete every row for days before a YYYYMMDD day.
+
+        Returns:
+            Number of rows deleted (0 when the store is unavailable).
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            try:
+                with conn:
+                    cur = conn.execute("DELETE FROM pageviews WHERE day < ?", (before_day,))
+            except sqlite3.Error as e:
+                logger.debug(f"Pageview store prune failed: {e}")
+                return 0
+        return cur.rowcount
@@ -13,22 +13,36 @@ Fallback: If the API is unavailable, uses a manually-updated JSON config
 file (etl/data/arena_ratings.json) that can be refreshed weekly.
 """
 
-import json
 import logging
+import threading
 import time
 from datetime import date, timedelta
 from pathlib import Path
 from typing import Any
 
-import requests
+import orjson
 
-from .base import BaseCollector
+from .base import BaseCollector, http2_client
+from .file_cache import FileCache
 
 logger = logging.getLogger(__name__)
 
 # LMArena / Chatbot Arena public leaderboard endpoint
 ARENA_LEADERBOARD_URL = "https://huggingface.co/api/spaces/lmsys/chatbot-arena-leaderboard"
 ARENA_RESULTS_URL = "https://huggingface.co/spaces/lmsys/chatbot-arena-leaderboard/resolve/main/results.json"
+LMARENA_API_URL = "https://lmarena.ai/api/v1/leaderboard"
+
+# On-disk and in-process cache TTL: 6 hours (the leaderboard moves weekly at most)
+CACHE_TTL_SECS = 6 * 60 * 60
+
+# Process-wide leaderboard: "leaderboard" -> (time.monotonic() loaded, lookup)
+_LEADERBOARD_CACHE: dict[str, tuple[float, dict[str, dict]]] = {}
+_LEADERBOARD_LOCK = threading.Lock()
+
+# Key spellings seen across leaderboard formats, in lookup order
+NAME_KEYS = ("model", "name", "Model")
+ELO_KEYS = ("elo", "rating", "Arena Elo")
+RANK_KEYS = ("rank", "Rank")
 
 # Fallback manual ratings file
 MANUAL_RATINGS_PATH = Path(__file__).parent.parent / "data" / "arena_ratings.json"
@@ -44,53 +58,124 @@ class QualityCollector(BaseCollector):
     def __init__(self, timeout: int = 20):
         super().__init__()
         self._timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
-            "User-Agent": "AIViralityIndex/1.0 (research aggregator)",
-        })
+        # HTTP/2 keep-alive: the lmarena.ai -> HF fallback reuses warm connections
+        self._client = http2_client(
+            {"User-Agent": "AIViralityIndex/1.0 (research aggregator)"},
+            timeout=timeout,
+        )
         self._leaderboard: dict[str, dict] | None = None
+        # model slug -> Elo 7 days before the run, filled by prefetch_week_ago_elos()
+        self._week_ago_elo: dict[str, float | None] | None = None
+        # Survives across processes (retries, --source reruns); the in-memory
+        # caches only cover this process
+        self._cache = FileCache(self.source_name, ttl=CACHE_TTL_SECS)
 
     def _fetch_leaderboard(self) -> dict[str, dict]:
         """
         Fetch the Arena leaderboard and build a lookup by model name.
 
+        Shared by every QualityCollector in the process for CACHE_TTL_SECS;
+        the lock makes concurrent first callers wait for one load instead of
+        each downloading the leaderboard.
+
         Returns:
             Dict mapping lowercase model name -> {elo, rank, name}.
         """
         if self._leaderboard is not None:
             return self._leaderboard
 
+        with _LEADERBOARD_LOCK:
+            cached = _LEADERBOARD_CACHE.get("leaderboard")
+            if cached is not None and time.monotonic() - cached[0] < CACHE_TTL_SECS:
+                self._leaderboard = cached[1]
+                return cached[1]
+
+            leaderboard = self._load_leaderboard()
+            if leaderboard:
+                _LEADERBOARD_CACHE["leaderboard"] = (time.monotonic(), leaderboard)
+
+        self._leaderboard = leaderboard
+        return leaderboard
+
+    def _load_leaderboard(self) -> dict[str, dict]:
+        """Load the leaderboard from disk cache, the APIs, or the manual file, in that order."""
+        # Fresh on-disk copy from an earlier run, from either endpoint
+        for url in (LMARENA_API_URL, ARENA_RESULTS_URL):
+            leaderboard = self._load_cached(url)
+            if leaderboard:
+                return leaderboard
+
         # Try fetching from lmarena.ai API
         leaderboard = self._try_lmarena_api()
         if leaderboard:
-            self._leaderboard = leaderboard
             return leaderboard
 
         # Fallback: manual ratings file
         leaderboard = self._load_manual_ratings()
         if leaderboard:
-            self._leaderboard = leaderboard
             return leaderboard
 
         self.logger.warning("Could not fetch Arena leaderboard from any source")
-        self._leaderboard = {}
         return {}
 
+    def _load_cached(self, url: str) -> dict[str, dict] | None:
+        """Parse a leaderboard response cached on disk for url, if fresh."""
+        cached = self._cache.get(url)
+        if cached is None:
+            return None
+        try:
+            return self._parse_leaderboard(orjson.loads(cached))
+        except orjson.JSONDecodeError:
+            return None
+
+    def _get_leaderboard(self, url: str) -> tuple[int, dict[str, dict] | None]:
+        """
+        GET a leaderboard endpoint, revalidating any cached copy.
+
+        A stale on-disk copy's ETag / Last-Modified go out as If-None-Match /
+        If-Modified-Since; on 304 the cached body is reused (and its TTL
+        renewed) without transferring the payload again.
+
+        Returns:
+            (HTTP status, parsed leaderboard or None).
+        """
+        stale = self._cache.get_entry(url)
+        validators = (stale or {}).get("validators", {})
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        resp = self._client.get(url, headers=headers)
+        if resp.status_code == 304 and stale is not None:
+            self.logger.info(f"{url} not modified, reusing cached leaderboard")
+            self._cache.set(url, None, stale["body"], validators)
+            return 304, self._parse_leaderboard(orjson.loads(stale["body"]))
+        if resp.status_code != 200:
+            return resp.status_code, None
+
+        leaderboard = self._parse_leaderboard(orjson.loads(resp.content))
+        if leaderboard:
+            fresh_validators = {
+                name: resp.headers[header]
+                for name, header in (("etag", "ETag"), ("last_modified", "Last-Modified"))
+                if header in resp.headers
+            }
+            self._cache.set(url, None, resp.text, fresh_validators)
+        return 200, leaderboard
+
     def _try_lmarena_api(self) -> dict[str, dict] | None:
         """Try fetching from lmarena.ai direct API."""
         try:
             # Try the direct leaderboard endpoint
-            resp = self._session.get(
-                "https://lmarena.ai/api/v1/leaderboard",
-                timeout=self._timeout,
-            )
+            status, leaderboard = self._get_leaderboard(LMARENA_API_URL)
 
-            if resp.status_code != 200:
-                self.logger.info(f"lmarena.ai API returned {resp.status_code}, trying HF")
+            if status not in (200, 304):
+                self.logger.info(f"lmarena.ai API returned {status}, trying HF")
                 return self._try_hf_api()
 
-            data = resp.json()
-            return self._parse_leaderboard(data)
+            return leaderboard
 
         except Exception as e:
             self.logger.info(f"lmarena.ai API failed: {e}, trying HF")
@@ -99,21 +184,22 @@ class QualityCollector(BaseCollector):
     def _try_hf_api(self) -> dict[str, dict] | None:
         """Try fetching from HuggingFace hosted results."""
         try:
-            resp = self._session.get(
-                ARENA_RESULTS_URL,
-                timeout=self._timeout,
-            )
-            if resp.status_code != 200:
-                self.logger.warning(f"HF Arena results returned {resp.status_code}")
+            status, leaderboard = self._get_leaderboard(ARENA_RESULTS_URL)
+            if status not in (200, 304):
+                self.logger.warning(f"HF Arena results returned {status}")
                 return None
 
-            data = resp.json()
-            return self._parse_leaderboard(data)
+            return leaderboard
 
         except Exception as e:
             self.logger.warning(f"HF Arena results failed: {e}")
             return None
 
+    @staticmethod
+    def _probe_key(entry: dict, candidates: tuple[str, ...]) -> str | None:
+        """First of candidates present in entry, or None."""
+        return next((k for k in candidates if k in entry), None)
+
     def _parse_leaderboard(self, data: Any) -> dict[str, dict] | None:
         """Parse leaderboard data into our lookup format."""
         leaderboard: dict[str, dict] = {}
@@ -128,18 +214,28 @@ class QualityCollector(BaseCollector):
                 if not isinstance(entries, list):
                     entries = []
 
+            # Pick the key spellings once from the first row, not per row
+            first = next((e for e in entries if isinstance(e, dict)), None)
+            if first is None:
+                return None
+            name_k = self._probe_key(first, NAME_KEYS)
+            elo_k = self._probe_key(first, ELO_KEYS)
+            rank_k = self._probe_key(first, RANK_KEYS)
+
             for i, entry in enumerate(entries):
-                if isinstance(entry, dict):
-                    name = entry.get("model", entry.get("name", entry.get("Model", "")))
-                    elo = entry.get("elo", entry.get("rating", entry.get("Arena Elo", 0)))
-                    rank = entry.get("rank", entry.get("Rank", i + 1))
-
-                    if name and elo:
-                        leaderboard[name.lower()] = {
-                            "name": name,
-                            "elo": float(elo),
-                            "rank": int(rank),
-                        }
+                try:
+                    name = entry[name_k]
+                    elo = entry[elo_k]
+                    rank = entry[rank_k] if rank_k else i + 1
+                except (KeyError, TypeError):
+                    continue
+
+                if name and elo:
+                    leaderboard[name.lower()] = {
+                        "name": name,
+                        "elo": float(elo),
+                        "rank": int(rank),
+                    }
 
             if leaderboard:
                 self.logger.info(
@@ -158,8 +254,7 @@ class QualityCollector(BaseCollector):
             return None
 
         try:
-            with open(MANUAL_RATINGS_PATH, "r") as f:
-                data = json.load(f)
+            data = orjson.loads(MANUAL_RATINGS_PATH.read_bytes())
 
             leaderboard: dict[str, dict] = {}
             for entry in data.get("ratings", []):
@@ -200,6 +295,58 @@ class QualityCollector(BaseCollector):
 
         return None
 
+    def _week_ago(self) -> str:
+        return (date.fromisoformat(self._run_date) - timedelta(days=7)).isoformat()
+
+    def _get_week_ago_elo(self, model_id: str) -> float | None:
+        """Get a model's stored Elo rating from 7 days before the run, if any."""
+        from etl.storage.supabase_client import get_client
+
+        result = (
+            get_client().table("raw_metrics")
+            .select("metric_value")
+            .eq("model_id", model_id)
+            .eq("source", "arena")
+            .eq("metric_name", "elo_rating")
+            .eq("date", self._week_ago())
+            .execute()
+        )
+        if result.data:
+            return float(result.data[0]["metric_value"])
+        return None
+
+    def prefetch_week_ago_elos(self, model_ids: dict[str, str]) -> dict[str, float | None]:
+        """
+        Load the Elo ratings from 7 days before the run for many models in one query.
+
+        Replaces the per-model model-id and _get_week_ago_elo() lookups for
+        the rest of the run; models with no reading that day map to None
+        (no delta).
+
+        Args:
+            model_ids: Model slug -> model UUID, as loaded by the orchestrator.
+
+        Returns:
+            Dict like {'chatgpt': 1287.0}.
+        """
+        from etl.storage.supabase_client import get_client
+
+        result = (
+            get_client().table("raw_metrics")
+            .select("model_id, metric_value")
+            .in_("model_id", list(model_ids.values()))
+            .eq("source", "arena")
+            .eq("metric_name", "elo_rating")
+            .eq("date", self._week_ago())
+            .execute()
+        )
+
+        by_id = {row["model_id"]: float(row["metric_value"]) for row in result.data}
+        week_ago_elo = {slug: by_id.get(mid) for slug, mid in model_ids.items()}
+
+        self._week_ago_elo = week_ago_elo
+        return week_ago_elo
+
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
         """
         Fetch Arena Elo rating for a model.
@@ -251,24 +398,16 @@ class QualityCollector(BaseCollector):
         # Calculate 7-day delta if historical data available
         elo_delta_7d = 0
         try:
-            from etl.storage.supabase_client import get_model_id, get_client
-
-            model_id = get_model_id(model_slug)
-            if model_id:
-                week_ago = (date.today() - timedelta(days=7)).isoformat()
-                client = get_client()
-                result = (
-                    client.table("raw_metrics")
-                    .select("metric_value")
-                    .eq("model_id", model_id)
-                    .eq("source", "arena")
-                    .eq("metric_name", "elo_rating")
-                    .eq("date", week_ago)
-                    .execute()
-                )
-                if result.data:
-                    old_elo = float(result.data[0]["metric_value"])
-                    elo_delta_7d = round(elo_rating - old_elo, 1)
+            if self._week_ago_elo is not None and model_slug in self._week_ago_elo:
+                old_elo = self._week_ago_elo[model_slug]
+            else:
+                # Not prefetched (collector used on its own): look up directly
+                from etl.storage.supabase_client import get_model_id
+
+                model_id = get_model_id(model_slug)
+                old_elo = self._get_week_ago_elo(model_id) if model_id else None
+            if old_elo is not None:
+                elo_delta_7d = round(elo_rating - old_elo, 1)
         except Exception as e:
             self.logger.warning(f"Could not compute Elo delta for {model_slug}: {e}")
 
@@ -0,0 +1,57 @@
+"""
+Per-run request de-duplication for collectors.
+
+Models share aliases ("GPT-4" appears under several models), so the same
+upstream query can be issued several times in one run, sometimes at the same
+moment from different worker threads. SingleFlight runs each distinct key
+once: concurrent callers wait on the first caller's result, and later callers
+get it straight from memory. Failures are not remembered, so a later call
+retries.
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class SingleFlight:
+    """Thread-safe memo that runs each key's function at most once at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Return fn()'s result for key, running fn only if no call owns key.
+
+        Args:
+            key: Identity of the request (e.g. URL plus sorted params).
+            fn: Zero-argument callable doing the actual request.
+
+        Returns:
+            The (shared) result; callers must not mutate it.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            owner = future is None
+            if owner:
+                future = self._calls[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result
+
+    @staticmethod
+    def key(*parts: Any, params: dict[str, Any] | None = None) -> tuple:
+        """Hashable key from positional parts plus order-independent params."""
+        return (*parts, tuple(sorted((params or {}).items())))
@@ -0,0 +1,151 @@
+"""
+Client-side rate limiting for collector HTTP calls.
+
+TokenBucket enforces a steady request rate with bursts up to `capacity`:
+each call takes one token, tokens refill continuously at `rate` per second,
+and acquire() blocks only for as long as the bucket is in debt. Thread-safe,
+so one bucket can be shared by every worker hitting the same upstream.
+
+AdaptiveLimiter instead learns the spacing from the upstream's answers: each
+429 doubles a per-host delay between requests (honoring Retry-After), each
+success shrinks it again, so a run slows down before a rate-limit storm
+rather than retrying blindly into it.
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Thread-safe blocking token bucket."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            rate: Tokens added per second (sustained requests/sec).
+            capacity: Max tokens held (burst size). Defaults to rate.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take `tokens` from the bucket, sleeping until they are available.
+
+        The tokens are reserved up front (the balance may go negative), so
+        concurrent callers queue behind each other instead of racing.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class AdaptiveLimiter:
+    """Thread-safe per-host request spacing that backs off on 429s (AIMD-style)."""
+
+    def __init__(
+        self,
+        min_delay: float = 0.0,
+        backoff: float = 1.0,
+        max_delay: float = 300.0,
+        decay: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            min_delay: Spacing between requests to a healthy host.
+            backoff: Delay after the first 429; later 429s double it.
+            max_delay: Upper bound on the delay.
+            decay: Factor applied to the delay after each success.
+        """
+        self.min_delay = min_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.decay = decay
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # host -> [current delay, earliest time of the next request]
+        self._hosts: dict[str, list[float]] = {}
+
+    def _state(self, host: str) -> list[float]:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = [self.min_delay, 0.0]
+        return state
+
+    def delay(self, host: str) -> float:
+        """Current spacing between requests to host."""
+        with self._lock:
+            return self._state(host)[0]
+
+    def acquire(self, host: str) -> float:
+        """
+        Wait until the next request to host may go out, reserving its slot.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        with self._lock:
+            state = self._state(host)
+            now = self._clock()
+            wait = max(0.0, state[1] - now)
+            state[1] = max(now, state[1]) + state[0]
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def record_success(self, host: str) -> None:
+        """Shrink host's delay back toward min_delay."""
+        with self._lock:
+            state = self._state(host)
+            state[0] = max(self.min_delay, state[0] * self.decay)
+            if state[0] < self.backoff * self.decay:
+                state[0] = self.min_delay
+
+    def record_throttle(self, host: str, retry_after: float | None = None) -> float:
+        """
+        Double host's delay after a 429 and push back its next request.
+
+        Args:
+            host: Upstream that rejected the request.
+            retry_after: Server-provided Retry-After seconds, used as a floor.
+
+        Returns:
+            The new delay.
+        """
+        with self._lock:
+            state = self._state(host)
+            delay = min(self.max_delay, max(self.backoff, state[0] * 2))
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, self.max_delay))
+            state[0] = delay
+            state[1] = max(state[1], self._clock() + delay)
+            return delay
@@ -13,17 +13,24 @@ Fallback chain:
 On success: cache result to Redis (24h TTL) for resilience.
 """
 
+import functools
 import logging
 import random
+import threading
 import time
-from datetime import date, timedelta
+from collections import OrderedDict
 from typing import Any
 
+import numpy as np
+import orjson
 import pandas as pd
+from pytrends.exceptions import ResponseError, TooManyRequestsError
 from pytrends.request import TrendReq
 
-from .base import BaseCollector
-from etl.cache import cache_get, cache_set
+from .base import BaseCollector, parse_retry_after
+from .file_cache import FileCache
+from .throttle import AdaptiveLimiter
+from etl.cache import CacheBatch
 
 logger = logging.getLogger(__name__)
 
@@ -31,9 +38,58 @@ logger = logging.getLogger(__name__)
 MAX_429_RETRIES = 3
 INITIAL_BACKOFF_SECS = 10
 
+# Spacing of pytrends requests, learned from Google's 429s: the first one
+# imposes INITIAL_BACKOFF_SECS, each further one doubles it, successes relax
+# it again. Process-wide, so a model that got throttled slows the next one too.
+TRENDS_HOST = "trends.google.com"
+_TRENDS_LIMITER = AdaptiveLimiter(backoff=INITIAL_BACKOFF_SECS, max_delay=300)
+
 # Cache TTL: 24 hours
 CACHE_TTL_SECS = 86400
 
+# Process-wide memo of pytrends batch results, so a keyword batch shared by
+# several models (or reruns in the same process) hits Google once an hour:
+# sorted keywords -> (time.monotonic() fetched, interest_over_time frame)
+BATCH_CACHE_TTL_SECS = 60 * 60
+BATCH_CACHE_MAX = 256
+_BATCH_CACHE: OrderedDict[tuple[str, ...], tuple[float, pd.DataFrame]] = OrderedDict()
+_BATCH_CACHE_LOCK = threading.Lock()
+
+# Google's NID cookie, which every TrendReq primes with a request to the
+# explore page, kept on disk for 6 hours so later sessions and runs reuse it
+COOKIE_TTL_SECS = 6 * 60 * 60
+COOKIE_CACHE_URL = "https://trends.google.com/trends/explore"
+_COOKIE_CACHE = FileCache("trends", ttl=COOKIE_TTL_SECS)
+
+# Set once pytrends exhausts its 429 retries; shared by every TrendsCollector
+# in the process, so later instances go straight to trendspy
+_PYTRENDS_BLOCKED = threading.Event()
+
+
+@functools.cache
+def _get_trendspy() -> type | None:
+    """Import trendspy's Trends class once; None if the package isn't installed."""
+    try:
+        from trendspy import Trends
+    except ImportError:
+        return None
+    return Trends
+
+
+class _CachedCookieTrendReq(TrendReq):
+    """TrendReq that reuses the on-disk Google cookie instead of priming a new one."""
+
+    def GetGoogleCookie(self):
+        cached = _COOKIE_CACHE.get(COOKIE_CACHE_URL)
+        if cached:
+            cookies = orjson.loads(cached)
+            if cookies:
+                return cookies
+        cookies = super().GetGoogleCookie()
+        if cookies:
+            _COOKIE_CACHE.set(COOKIE_CACHE_URL, None, orjson.dumps(cookies).decode())
+        return cookies
+
 
 class TrendsCollector(BaseCollector):
     """Collects Google Trends interest data for AI models."""
@@ -43,11 +99,16 @@ class TrendsCollector(BaseCollector):
     def __init__(self, timeout: tuple[int, int] = (10, 30)):
         super().__init__()
         self._timeout = timeout
-        self._pytrends_blocked = False  # Track if pytrends is 429'd this session
+        # pytrends session reused across one fetch()'s batches (trends runs one
+        # model at a time); dropped after a 429 so the retry starts with fresh
+        # cookies, and after each fetch() so cookies don't carry across models
+        self._pt: TrendReq | None = None
+        # Per-day model results in Redis, read and written in bulk
+        self._redis = CacheBatch(ttl=CACHE_TTL_SECS)
 
     def _new_pytrends(self) -> TrendReq:
-        """Create a fresh TrendReq instance (resets session cookies)."""
-        return TrendReq(
+        """Create a TrendReq instance (with the cached Google cookie, if fresh)."""
+        return _CachedCookieTrendReq(
             hl="en-US",
             tz=360,
             timeout=self._timeout,
@@ -56,12 +117,34 @@ class TrendsCollector(BaseCollector):
     def _fetch_batch_with_retry(self, batch: list[str]) -> pd.DataFrame | None:
         """
         Fetch interest_over_time for a batch of keywords.
-        Retries with exponential backoff on 429 rate-limit errors,
-        creating a fresh session each time.
+        Served from the process-wide batch cache when the same keywords were
+        fetched within BATCH_CACHE_TTL_SECS. Retries 429 rate-limit errors after
+        the adaptive limiter's (doubling) delay, with a fresh session each time.
         """
+        cache_key = tuple(sorted(batch))
+        with _BATCH_CACHE_LOCK:
+            cached = _BATCH_CACHE.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < BATCH_CACHE_TTL_SECS:
+                _BATCH_CACHE.move_to_end(cache_key)
+                self.logger.debug(f"Trends batch cache hit for {batch}")
+                return cached[1]
+
+        df = self._fetch_batch_uncached(batch)
+        if df is not None:
+            with _BATCH_CACHE_LOCK:
+                _BATCH_CACHE[cache_key] = (time.monotonic(), df)
+                _BATCH_CACHE.move_to_end(cache_key)
+                while len(_BATCH_CACHE) > BATCH_CACHE_MAX:
+                    _BATCH_CACHE.popitem(last=False)
+        return df
+
+    def _fetch_batch_uncached(self, batch: list[str]) -> pd.DataFrame | None:
+        """pytrends request behind _fetch_batch_with_retry's cache."""
         for attempt in range(MAX_429_RETRIES):
             try:
-                pt = self._new_pytrends()
+                _TRENDS_LIMITER.acquire(TRENDS_HOST)
+                pt = self._pt or self._new_pytrends()
+                self._pt = pt
                 pt.build_payload(
                     kw_list=batch,
                     cat=0,
@@ -69,6 +152,7 @@ class TrendsCollector(BaseCollector):
                     geo="",
                 )
                 df = pt.interest_over_time()
+                _TRENDS_LIMITER.record_success(TRENDS_HOST)
 
                 if df.empty:
                     self.logger.warning(f"Empty trends data for batch {batch}")
@@ -79,21 +163,31 @@ class TrendsCollector(BaseCollector):
 
                 return df
 
+            except TooManyRequestsError as e:
+                # Start over with a new session and a freshly primed cookie
+                self._pt = None
+                _COOKIE_CACHE.delete(COOKIE_CACHE_URL)
+                # The next acquire() waits out the raised delay (Retry-After wins)
+                backoff = _TRENDS_LIMITER.record_throttle(
+                    TRENDS_HOST, parse_retry_after(e.response.headers.get("Retry-After"))
+                )
+                self.logger.warning(
+                    f"Rate limited (429) on batch {batch}, "
+                    f"retry {attempt + 1}/{MAX_429_RETRIES} in {backoff:.0f}s"
+                )
+            except ResponseError as e:
+                if e.response.status_code == 403:
+                    # Google rejected the cookie; don't hand it to the next session
+                    self._pt = None
+                    _COOKIE_CACHE.delete(COOKIE_CACHE_URL)
+                self.logger.error(f"Trends fetch failed for batch {batch}: {e}")
+                return None
             except Exception as e:
-                error_msg = str(e)
-                if "429" in error_msg:
-                    backoff = INITIAL_BACKOFF_SECS * (2 ** attempt) + random.uniform(1, 5)
-                    self.logger.warning(
-                        f"Rate limited (429) on batch {batch}, "
-                        f"retry {attempt + 1}/{MAX_429_RETRIES} in {backoff:.0f}s"
-                    )
-                    time.sleep(backoff)
-                else:
-                    self.logger.error(f"Trends fetch failed for batch {batch}: {e}")
-                    return None
+                self.logger.error(f"Trends fetch failed for batch {batch}: {e}")
+                return None
 
         self.logger.error(f"All 429 retries exhausted for batch {batch}")
-        self._pytrends_blocked = True
+        _PYTRENDS_BLOCKED.set()
         return None
 
     def _fetch_with_trendspy(self, aliases: list[str]) -> dict[str, float] | None:
@@ -103,9 +197,12 @@ class TrendsCollector(BaseCollector):
         Returns:
             Dict with {interest, interest_7d_avg} or None on failure.
         """
-        try:
-            from trendspy import Trends
+        Trends = _get_trendspy()
+        if Trends is None:
+            self.logger.warning("trendspy package not installed, fallback unavailable")
+            return None
 
+        try:
             tr = Trends()
             # trendspy uses a different API endpoint that may not be blocked
             # Use the first alias as the primary keyword
@@ -124,10 +221,11 @@ class TrendsCollector(BaseCollector):
                 self.logger.warning(f"trendspy returned empty data for '{keyword}'")
                 return None
 
-            # Extract values
-            values = df[keyword] if keyword in df.columns else df.iloc[:, 0]
-            interest = float(values.iloc[-1])
-            interest_7d_avg = float(values.mean())
+            # Extract values as a plain float array (NaN-skipping mean, like Series.mean)
+            column = df[keyword] if keyword in df.columns else df.iloc[:, 0]
+            values = column.to_numpy(dtype=float)
+            interest = float(values[-1])
+            interest_7d_avg = float(np.nanmean(values))
 
             self.logger.info(
                 f"trendspy fallback success: interest={interest:.1f}, "
@@ -138,17 +236,62 @@ class TrendsCollector(BaseCollector):
                 "interest_7d_avg": round(interest_7d_avg, 2),
             }
 
-        except ImportError:
-            self.logger.warning("trendspy package not installed, fallback unavailable")
-            return None
         except Exception as e:
             self.logger.warning(f"trendspy fallback failed: {e}")
             return None
 
+    @staticmethod
+    def _max_across_batches(frames: list[pd.DataFrame]) -> pd.Series:
+        """
+        Max interest across every alias column of every batch, per timestamp.
+
+        Keeps one running maximum updated batch by batch with np.fmax, instead
+        of building a wide pd.concat (or stacked) array and reducing it.
+        Batches normally share the same hourly index; if they don't, each is
+        aligned to the union of timestamps first (missing values are NaN and
+        ignored, as with an outer concat).
+        """
+        index = frames[0].index
+        if any(not f.index.equals(index) for f in frames[1:]):
+            for f in frames[1:]:
+                index = index.union(f.index)
+            frames = [f.reindex(index) for f in frames]
+
+        running = np.full(len(index), np.nan)
+        for f in frames:
+            np.fmax(running, np.fmax.reduce(f.to_numpy(dtype=float), axis=1), out=running)
+        return pd.Series(running, index=index)
+
+    @staticmethod
+    def _daily_max(series: pd.Series) -> dict[str, float]:
+        """
+        Max value per calendar day, as {'YYYY-MM-DD': max}.
+
+        Equivalent to resample("D").max() minus empty days, computed with one
+        np.fmax.reduceat over the day boundaries of the (sorted) index.
+        """
+        if series.empty:
+            return {}
+        days = series.index.to_numpy().astype("datetime64[D]")
+        starts = np.concatenate(([0], np.flatnonzero(days[1:] != days[:-1]) + 1))
+        maxima = np.fmax.reduceat(series.to_numpy(dtype=float), starts)
+        return {
+            str(day): float(val)
+            for day, val in zip(days[starts], maxima)
+            if not np.isnan(val)
+        }
+
     def _cache_key(self, model_slug: str) -> str:
         """Build Redis cache key for a model's trends data."""
-        today = date.today().isoformat()
-        return f"trends:{model_slug}:{today}"
+        return f"trends:{model_slug}:{self._run_date}"
+
+    def prefetch_cache(self, aliases_by_model: dict[str, list[str]]) -> None:
+        """Load every model's cached result in one pipeline request."""
+        self._redis.prefetch([self._cache_key(slug) for slug in aliases_by_model])
+
+    def flush_cache(self) -> None:
+        """Store the results fetched this run in one pipeline request."""
+        self._redis.flush()
 
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
         """
@@ -159,7 +302,8 @@ class TrendsCollector(BaseCollector):
         all aliases, then computes a 7-day rolling average.
 
         Fallback chain: pytrends → trendspy → Redis cache.
-        On success: writes result to Redis cache (24h TTL).
+        On success: queues the result for the Redis cache (24h TTL), stored
+        by flush_cache().
 
         Args:
             model_slug: Model identifier (e.g., 'chatgpt')
@@ -176,8 +320,22 @@ class TrendsCollector(BaseCollector):
         self.logger.info(f"Fetching trends for {model_slug} with {len(aliases)} aliases")
         cache_key = self._cache_key(model_slug)
 
-        # If pytrends was already blocked in this session, skip directly to trendspy
-        if self._pytrends_blocked:
+        # If pytrends was already blocked in this process, serve today's cached
+        # result when there is one, else skip directly to trendspy
+        if _PYTRENDS_BLOCKED.is_set():
+            cached = self._redis.get(cache_key)
+            if cached:
+                self.logger.info(
+                    f"pytrends blocked this session, using Redis cached data for {model_slug}"
+                )
+                result = self.make_result(model_slug=model_slug, metrics=cached)
+                result["raw_json"] = {
+                    "aliases_queried": aliases,
+                    "source": "redis_cache",
+                    "pytrends_blocked": True,
+                }
+                return result
+
             self.logger.info(
                 f"pytrends blocked this session, using trendspy fallback for {model_slug}"
             )
@@ -193,11 +351,14 @@ class TrendsCollector(BaseCollector):
                     "pytrends_blocked": True,
                 }
                 # Cache successful trendspy result
-                cache_set(cache_key, trendspy_data, ttl=CACHE_TTL_SECS)
+                self._redis.set(cache_key, trendspy_data)
                 return result
 
-            # Last resort: try Redis cache
-            return self._fallback_to_cache(model_slug, aliases, cache_key)
+            # The Redis cache was already checked above
+            self.logger.error(
+                f"All trends sources failed for {model_slug} (trendspy + cache)"
+            )
+            return None
 
         all_frames: list[pd.DataFrame] = []
 
@@ -214,6 +375,7 @@ class TrendsCollector(BaseCollector):
             df = self._fetch_batch_with_retry(batch)
             if df is not None:
                 all_frames.append(df)
+        self._pt = None
 
         if not all_frames:
             # All pytrends batches failed — try trendspy fallback
@@ -231,29 +393,23 @@ class TrendsCollector(BaseCollector):
                     "source": "trendspy_fallback",
                     "pytrends_blocked": True,
                 }
-                cache_set(cache_key, trendspy_data, ttl=CACHE_TTL_SECS)
+                self._redis.set(cache_key, trendspy_data)
                 return result
 
             # Last resort: try Redis cache
             return self._fallback_to_cache(model_slug, aliases, cache_key)
 
         # Combine all batches, take max interest across aliases per timestamp
-        combined = pd.concat(all_frames, axis=1)
-        max_per_timestamp = combined.max(axis=1)
+        max_per_timestamp = self._max_across_batches(all_frames)
 
         # Current interest: latest value
         interest = float(max_per_timestamp.iloc[-1])
 
         # 7-day average: mean of all hourly values (covers ~7 days)
-        interest_7d_avg = float(max_per_timestamp.mean())
+        interest_7d_avg = float(np.nanmean(max_per_timestamp.to_numpy()))
 
         # Daily aggregates for raw_json debug info
-        daily_agg = max_per_timestamp.resample("D").max()
-        raw_daily = {
-            dt.strftime("%Y-%m-%d"): float(val)
-            for dt, val in daily_agg.items()
-            if not pd.isna(val)
-        }
+        raw_daily = self._daily_max(max_per_timestamp)
 
         metrics = {
             "interest": round(interest, 2),
@@ -272,18 +428,39 @@ class TrendsCollector(BaseCollector):
         }
 
         # Cache successful result
-        cache_set(cache_key, metrics, ttl=CACHE_TTL_SECS)
+        self._redis.set(cache_key, metrics)
 
         self.logger.info(
             f"Trends for {model_slug}: interest={interest:.1f}, 7d_avg={interest_7d_avg:.1f}"
         )
         return result
 
+    def warm_cache(self, models: list[tuple[str, list[str]]]) -> int:
+        """
+        Fetch every model so its result is in the Redis cache before it is needed.
+
+        Meant for an off-peak job: a later run that finds pytrends blocked
+        then answers from the cache without trying trendspy.
+
+        Args:
+            models: (model_slug, aliases) pairs.
+
+        Returns:
+            Number of models fetched (and so cached) successfully.
+        """
+        warmed = 0
+        for model_slug, aliases in models:
+            if self.fetch(model_slug, aliases) is not None:
+                warmed += 1
+        self.flush_cache()
+        self.logger.info(f"Warmed trends cache for {warmed}/{len(models)} models")
+        return warmed
+
     def _fallback_to_cache(
         self, model_slug: str, aliases: list[str], cache_key: str
     ) -> dict[str, Any] | None:
         """Try Redis cache as last-resort fallback when all live sources fail."""
-        cached = cache_get(cache_key)
+        cached = self._redis.get(cache_key)
         if cached:
             self.logger.warning(
                 f"All live sources failed for {model_slug}, "
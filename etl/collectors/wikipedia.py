@@ -14,34 +14,203 @@ Metrics collected:
 """
 
 import logging
-import time
 from datetime import date, timedelta
 from typing import Any
 
+import orjson
 import requests
 
-from .base import BaseCollector
+from .base import (
+    BaseCollector,
+    TransientHTTPError,
+    http_retry,
+    pooled_session,
+    raise_for_transient,
+)
+from .pageview_store import PageviewStore
+from .throttle import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 # Wikimedia Pageviews REST API
 WIKIMEDIA_API_BASE = "https://wikimedia.org/api/rest_v1/metrics/pageviews/per-article"
+# MediaWiki action API: prop=pageviews covers up to 50 titles per request
+WIKIPEDIA_ACTION_API = "https://en.wikipedia.org/w/api.php"
+MAX_TITLES_PER_REQUEST = 50
 REQUEST_DELAY_SECS = 1.0  # Be respectful to Wikimedia
 
+# Days at least this old are settled (published, no longer changing): they
+# are served from the local pageview store, so a daily run only requests the
+# newest SETTLE_DAYS days of its window
+SETTLE_DAYS = 2
+
+# Stored days older than this fall outside every fetch window; they are pruned
+# when a collector starts
+STORE_KEEP_DAYS = 7
+
+# ~1 req/sec across all workers; a small burst lets concurrent models start
+# without each one sleeping a full interval first
+_WIKIMEDIA_BUCKET = TokenBucket(rate=1 / REQUEST_DELAY_SECS, capacity=4)
+
+# One keep-alive pool for every WikipediaCollector in the process, so repeat
+# collectors (retries, reruns) reuse warm TLS connections to wikimedia.org
+_WIKI_SESSION = pooled_session({
+    "User-Agent": "AIViralityIndex/1.0 (research aggregator; https://aiviralityindex.com)",
+    "Accept": "application/json",
+})
+
 
 class WikipediaCollector(BaseCollector):
     """Collects Wikipedia pageview data for AI models."""
 
     source_name: str = "wikipedia"
+    max_workers: int = 4
 
     def __init__(self, timeout: int = 15):
         super().__init__()
         self._timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
-            "User-Agent": "AIViralityIndex/1.0 (research aggregator; https://aiviralityindex.com)",
-            "Accept": "application/json",
+        # article title -> pageview items, filled by prefetch_pageviews()
+        self._prefetched: dict[str, list[dict]] = {}
+        self._store = PageviewStore()
+        self._store.prune(
+            (date.today() - timedelta(days=STORE_KEEP_DAYS)).strftime("%Y%m%d")
+        )
+
+    @staticmethod
+    def _settled_end() -> date:
+        """Last day whose pageviews are settled."""
+        return date.today() - timedelta(days=SETTLE_DAYS)
+
+    def _settled_items(self, article_title: str, start_date: date) -> list[dict] | None:
+        """
+        Stored pageview items for every settled day from start_date on.
+
+        Returns:
+            Items in the per-article endpoint's shape, or None unless every
+            settled day of the window is stored.
+        """
+        end_date = self._settled_end()
+        stored = self._store.get(
+            article_title, start_date.strftime("%Y%m%d"), end_date.strftime("%Y%m%d")
+        )
+        if len(stored) < (end_date - start_date).days + 1:
+            return None
+        return [{"timestamp": f"{day}00", "views": views} for day, views in sorted(stored.items())]
+
+    def _merge_settled(
+        self, article_title: str, settled: list[dict] | None, fetched: list[dict]
+    ) -> list[dict]:
+        """Combine stored settled days with freshly fetched ones and store the settled part."""
+        settled_end = self._settled_end().strftime("%Y%m%d")
+        if settled is not None:
+            fetched = [i for i in fetched if i.get("timestamp", "")[:8] > settled_end]
+            items = settled + fetched
+        else:
+            items = fetched
+        self._store.put(article_title, {
+            i["timestamp"][:8]: i.get("views", 0)
+            for i in items
+            if len(i.get("timestamp", "")) >= 8 and i["timestamp"][:8] <= settled_end
         })
+        return items
+
+    @http_retry
+    def _get(self, url: str, params: dict[str, Any] | None = None) -> requests.Response:
+        """GET with jittered backoff on 429/5xx and connection errors."""
+        _WIKIMEDIA_BUCKET.acquire()
+        resp = _WIKI_SESSION.get(url, params=params, timeout=self._timeout)
+        raise_for_transient(resp)
+        return resp
+
+    def _fetch_pageviews_batch(
+        self,
+        titles: list[str],
+        days: int = 7,
+    ) -> dict[str, list[dict]]:
+        """
+        Fetch daily pageviews for up to MAX_TITLES_PER_REQUEST articles in one call.
+
+        Uses the action API's prop=pageviews and reshapes each page's
+        {date: views} map into the per-article endpoint's items, limited to
+        the same date window. Days with no data yet (null) are dropped.
+
+        Args:
+            titles: Wikipedia article titles, as configured (underscores ok).
+            days: Number of days to fetch (default 7).
+
+        Returns:
+            Dict mapping each requested title that has data -> items list.
+        """
+        start_date = date.today() - timedelta(days=days)
+        start = start_date.isoformat()
+        settled = {t: self._settled_items(t, start_date) for t in titles}
+        # Only the unsettled tail is needed once every title's settled days are stored
+        all_settled = all(items is not None for items in settled.values())
+        params: dict[str, Any] = {
+            "action": "query",
+            "prop": "pageviews",
+            "titles": "|".join(titles),
+            "pvipdays": SETTLE_DAYS if all_settled else days + 1,
+            "format": "json",
+            "formatversion": 2,
+        }
+
+        views_by_title: dict[str, dict[str, int | None]] = {}
+        requested_as: dict[str, str] = {t: t for t in titles}
+        while True:
+            data = orjson.loads(self._get(WIKIPEDIA_ACTION_API, params).content)
+            query = data.get("query", {})
+            # The API reports titles back normalized ("Claude_(x)" -> "Claude (x)")
+            for norm in query.get("normalized", []):
+                requested_as[norm["to"]] = norm["from"]
+            for page in query.get("pages", []):
+                if page.get("pageviews"):
+                    views = views_by_title.setdefault(page["title"], {})
+                    views.update(page["pageviews"])
+            if "continue" not in data:
+                break
+            params = {**params, **data["continue"]}
+
+        fetched: dict[str, list[dict]] = {}
+        for title, views in views_by_title.items():
+            fetched[requested_as.get(title, title)] = [
+                {"timestamp": day.replace("-", "") + "00", "views": count}
+                for day, count in sorted(views.items())
+                if count is not None and day >= start
+            ]
+
+        items_by_title: dict[str, list[dict]] = {}
+        for title in titles:
+            items = self._merge_settled(title, settled[title], fetched.get(title, []))
+            if items:
+                items_by_title[title] = items
+        return items_by_title
+
+    def prefetch_pageviews(self, titles: list[str], days: int = 7) -> int:
+        """
+        Load pageviews for many articles in as few requests as possible.
+
+        fetch() then serves these titles from memory; any title missing
+        here still goes through the per-article endpoint.
+
+        Args:
+            titles: Article titles, typically each model's primary alias.
+            days: Number of days to fetch (default 7).
+
+        Returns:
+            Number of titles with pageview data.
+        """
+        unique = list(dict.fromkeys(titles))
+        for i in range(0, len(unique), MAX_TITLES_PER_REQUEST):
+            batch = unique[i:i + MAX_TITLES_PER_REQUEST]
+            try:
+                self._prefetched.update(self._fetch_pageviews_batch(batch, days))
+            except (requests.RequestException, TransientHTTPError, ValueError) as e:
+                self.logger.warning(f"Wikipedia batch pageviews failed for {len(batch)} titles: {e}")
+        self.logger.info(
+            f"Prefetched Wikipedia pageviews for {len(self._prefetched)}/{len(unique)} articles"
+        )
+        return len(self._prefetched)
 
     def _fetch_pageviews(
         self,
@@ -62,8 +231,12 @@ class WikipediaCollector(BaseCollector):
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
 
+        # With every settled day stored, only the newest days need fetching
+        settled = self._settled_items(article_title, start_date)
+        fetch_start = start_date if settled is None else self._settled_end() + timedelta(days=1)
+
         # Wikimedia API date format: YYYYMMDD
-        start_str = start_date.strftime("%Y%m%d")
+        start_str = fetch_start.strftime("%Y%m%d")
         end_str = end_date.strftime("%Y%m%d")
 
         url = (
@@ -72,7 +245,11 @@ class WikipediaCollector(BaseCollector):
         )
 
         try:
-            resp = self._session.get(url, timeout=self._timeout)
+            resp = self._get(url)
+
+            if resp.status_code == 404 and settled:
+                # No data yet for the newest days
+                return settled
 
             if resp.status_code == 404:
                 self.logger.warning(
@@ -87,8 +264,8 @@ class WikipediaCollector(BaseCollector):
                 )
                 return None
 
-            data = resp.json()
-            items = data.get("items", [])
+            data = orjson.loads(resp.content)
+            items = self._merge_settled(article_title, settled, data.get("items", []))
 
             if not items:
                 self.logger.warning(f"No pageview data returned for '{article_title}'")
@@ -96,7 +273,7 @@ class WikipediaCollector(BaseCollector):
 
             return items
 
-        except requests.RequestException as e:
+        except (requests.RequestException, TransientHTTPError, ValueError) as e:
             self.logger.error(f"Wikimedia API error for '{article_title}': {e}")
             return None
 
@@ -132,11 +309,10 @@ class WikipediaCollector(BaseCollector):
         items = None
         used_article = None
         for article_title in aliases:
-            items = self._fetch_pageviews(article_title, days=7)
+            items = self._prefetched.get(article_title) or self._fetch_pageviews(article_title, days=7)
             if items:
                 used_article = article_title
                 break
-            time.sleep(REQUEST_DELAY_SECS)
 
         if not items:
             self.logger.warning(
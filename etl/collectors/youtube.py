@@ -17,42 +17,83 @@ Quota strategy (10,000 units/day):
 """
 
 import logging
-import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import orjson
+import requests
 
 from etl.config import YOUTUBE_API_KEY
-from .base import BaseCollector
+from .base import BaseCollector, parse_retry_after, pooled_session
+from .throttle import AdaptiveLimiter, TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# YouTube Data API v3 REST endpoints (called directly: no discovery document)
+YOUTUBE_API_BASE = "https://youtube.googleapis.com/youtube/v3"
+
 # Max results per search query (API max is 50)
 MAX_RESULTS_PER_SEARCH = 50
 
 # Delay between API calls to be respectful
 REQUEST_DELAY_SECS = 0.5
 
+# Paces API calls across all workers at ~1 per REQUEST_DELAY_SECS, with a
+# small burst so concurrent models don't each sleep before their first call
+_YOUTUBE_BUCKET = TokenBucket(rate=1 / REQUEST_DELAY_SECS, capacity=4)
+
+# On top of the steady pace: extra spacing learned from 429s (doubling per
+# 429, honoring Retry-After, relaxing on success)
+YOUTUBE_HOST = "youtube.googleapis.com"
+_YOUTUBE_LIMITER = AdaptiveLimiter(backoff=5.0, max_delay=120)
+
 
 class YouTubeCollector(BaseCollector):
     """Collects YouTube video activity for AI models."""
 
     source_name: str = "youtube"
+    max_workers: int = 4
 
-    def __init__(self, max_results: int = MAX_RESULTS_PER_SEARCH):
+    def __init__(self, max_results: int = MAX_RESULTS_PER_SEARCH, timeout: int = 15):
         super().__init__()
         self._max_results = max_results
-        self._youtube = None
+        self._timeout = timeout
+        # Keep-alive pool shared by the worker threads
+        self._session = pooled_session({"Accept": "application/json"})
+
+    def _get(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        GET a YouTube Data API endpoint with the API key.
+
+        Args:
+            endpoint: Resource name, e.g. 'search' or 'videos'.
+            params: Query params (the key goes in the X-Goog-Api-Key header).
+
+        Returns:
+            Parsed JSON body.
 
-    def _get_client(self):
-        """Lazy-init the YouTube API client."""
-        if self._youtube is None:
-            if not YOUTUBE_API_KEY:
-                raise RuntimeError("YOUTUBE_API_KEY is not set in .env")
-            self._youtube = build("youtube", "v3", developerKey=YOUTUBE_API_KEY)
-        return self._youtube
+        Raises:
+            requests.HTTPError: On a non-2xx status (403 = quota / forbidden).
+        """
+        if not YOUTUBE_API_KEY:
+            raise RuntimeError("YOUTUBE_API_KEY is not set in .env")
+
+        _YOUTUBE_BUCKET.acquire()
+        _YOUTUBE_LIMITER.acquire(YOUTUBE_HOST)
+        resp = self._session.get(
+            f"{YOUTUBE_API_BASE}/{endpoint}",
+            params=params,
+            # Header rather than ?key=, so the key stays out of logged URLs
+            headers={"X-Goog-Api-Key": YOUTUBE_API_KEY},
+            timeout=self._timeout,
+        )
+        if resp.status_code == 429:
+            _YOUTUBE_LIMITER.record_throttle(
+                YOUTUBE_HOST, parse_retry_after(resp.headers.get("Retry-After"))
+            )
+        resp.raise_for_status()
+        _YOUTUBE_LIMITER.record_success(YOUTUBE_HOST)
+        return orjson.loads(resp.content)
 
     def _search_videos(
         self,
@@ -69,28 +110,26 @@ class YouTubeCollector(BaseCollector):
         Returns:
             List of video IDs.
         """
-        youtube = self._get_client()
         video_ids: list[str] = []
 
         try:
-            request = youtube.search().list(
-                q=query,
-                type="video",
-                part="id",
-                publishedAfter=published_after,
-                maxResults=self._max_results,
-                order="viewCount",
-                relevanceLanguage="en",
-            )
-            response = request.execute()
+            response = self._get("search", {
+                "q": query,
+                "type": "video",
+                "part": "id",
+                "publishedAfter": published_after,
+                "maxResults": self._max_results,
+                "order": "viewCount",
+                "relevanceLanguage": "en",
+            })
 
             for item in response.get("items", []):
                 vid = item.get("id", {}).get("videoId")
                 if vid:
                     video_ids.append(vid)
 
-        except HttpError as e:
-            if e.resp.status == 403:
+        except requests.HTTPError as e:
+            if e.response.status_code == 403:
                 self.logger.error(f"YouTube API quota exceeded or forbidden: {e}")
             else:
                 self.logger.error(f"YouTube search API error: {e}")
@@ -111,18 +150,16 @@ class YouTubeCollector(BaseCollector):
         if not video_ids:
             return []
 
-        youtube = self._get_client()
         stats: list[dict[str, Any]] = []
 
         # videos.list accepts up to 50 IDs per request
         for i in range(0, len(video_ids), 50):
             batch = video_ids[i:i + 50]
             try:
-                request = youtube.videos().list(
-                    part="statistics",
-                    id=",".join(batch),
-                )
-                response = request.execute()
+                response = self._get("videos", {
+                    "part": "statistics",
+                    "id": ",".join(batch),
+                })
 
                 for item in response.get("items", []):
                     s = item.get("statistics", {})
@@ -133,14 +170,11 @@ class YouTubeCollector(BaseCollector):
                         "comment_count": int(s.get("commentCount", 0)),
                     })
 
-            except HttpError as e:
+            except (requests.RequestException, ValueError) as e:
                 self.logger.warning(f"YouTube videos.list error: {e}")
                 # Return what we have so far
                 break
 
-            if i + 50 < len(video_ids):
-                time.sleep(REQUEST_DELAY_SECS)
-
         return stats
 
     def fetch(self, model_slug: str, aliases: list[str]) -> dict[str, Any] | None:
@@ -182,29 +216,24 @@ class YouTubeCollector(BaseCollector):
 
             if not video_ids:
                 # No videos found — return zeros (valid result, not a failure)
-                return self._make_youtube_result(model_slug, aliases, 0, 0, 0.0, [])
-
-            time.sleep(REQUEST_DELAY_SECS)
+                return self._make_youtube_result(model_slug, aliases, query, 0, 0, 0.0, [])
 
             # Step 2: Get video statistics (1 quota unit per call)
             stats = self._get_video_stats(video_ids)
 
             # Step 3: Calculate aggregate metrics
             video_count = len(stats)
-            total_views = sum(s["view_count"] for s in stats)
-            total_engagement = sum(
-                s["like_count"] + s["comment_count"] for s in stats
-            )
+            total_views, total_engagement, top_videos = self._aggregate_stats(stats)
             avg_engagement = (
                 total_engagement / total_views if total_views > 0 else 0.0
             )
 
             return self._make_youtube_result(
-                model_slug, aliases, video_count, total_views, avg_engagement, stats
+                model_slug, aliases, query, video_count, total_views, avg_engagement, top_videos
             )
 
-        except HttpError as e:
-            if e.resp.status == 403:
+        except requests.HTTPError as e:
+            if e.response.status_code == 403:
                 # Quota exceeded — return partial data if possible
                 self.logger.error(
                     f"YouTube quota exceeded for {model_slug}. "
@@ -217,14 +246,31 @@ class YouTubeCollector(BaseCollector):
             self.logger.error(f"Unexpected error fetching YouTube for {model_slug}: {e}")
             return None
 
+    @staticmethod
+    def _aggregate_stats(
+        stats: list[dict[str, Any]], top_n: int = 5
+    ) -> tuple[int, int, list[dict[str, Any]]]:
+        """
+        Total views, total engagement (likes + comments) and the most-viewed videos.
+
+        Returns:
+            (total_views, total_engagement, top_n stats dicts by views, descending).
+        """
+        total_views = sum(s["view_count"] for s in stats)
+        total_engagement = sum(s["like_count"] + s["comment_count"] for s in stats)
+        # Most views first; the sort is stable, so ties keep their search order
+        top_videos = sorted(stats, key=lambda s: s["view_count"], reverse=True)[:top_n]
+        return total_views, total_engagement, top_videos
+
     def _make_youtube_result(
         self,
         model_slug: str,
         aliases: list[str],
+        query: str,
         video_count: int,
         total_views: int,
         avg_engagement: float,
-        stats: list[dict],
+        top_videos: list[dict],
     ) -> dict[str, Any]:
         """Build the standardized result dict."""
         result = self.make_result(
@@ -237,10 +283,9 @@ class YouTubeCollector(BaseCollector):
         )
         result["raw_json"] = {
             "aliases_queried": aliases,
-            "query_combined": " | ".join(f'"{a}"' for a in aliases),
+            "query_combined": query,
             "video_count": video_count,
-            "top_videos": sorted(stats, key=lambda x: x["view_count"], reverse=True)[:5]
-            if stats else [],
+            "top_videos": top_videos,
         }
 
         self.logger.info(
@@ -32,6 +32,10 @@ REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT", "AVI/1.0")
 UPSTASH_REDIS_URL = os.getenv("UPSTASH_REDIS_URL", "")
 UPSTASH_REDIS_TOKEN = os.getenv("UPSTASH_REDIS_TOKEN", "")
 
+# --- On-disk HTTP response cache (collectors) ---
+# Empty string disables it
+ETL_CACHE_DIR = os.getenv("ETL_CACHE_DIR", str(PROJECT_ROOT / ".cache"))
+
 # --- Resend (email digest) ---
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 
@@ -11,21 +11,49 @@ Requires: RESEND_API_KEY in .env
 import os
 import sys
 import json
-import hashlib
 import hmac
-import requests
+import uuid
 from datetime import datetime
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from urllib.parse import quote
+
+import orjson
+import requests
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 # Load config
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from etl.config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
+from etl.collectors.base import (
+    TransientHTTPError,
+    http_retry,
+    pooled_session,
+    raise_for_transient,
+)
 
 RESEND_API_KEY = os.getenv("RESEND_API_KEY", "")
 RESEND_FROM = os.getenv("RESEND_FROM", "AI Virality Index <digest@aiviralityindex.com>")
 SITE_URL = os.getenv("SITE_URL", "https://aiviralityindex.com")
 UNSUBSCRIBE_SECRET = os.getenv("UNSUBSCRIBE_SECRET", "avi-unsub-secret-2026")
+# Encoded once; hmac.digest() signs each email in a single C call
+_UNSUBSCRIBE_KEY = UNSUBSCRIBE_SECRET.encode()
+# Rendered in place of the per-recipient unsubscribe URL, then split on
+UNSUBSCRIBE_PLACEHOLDER = "{{UNSUBSCRIBE_URL}}"
+
+# Resend batch endpoint: up to 100 emails per request, so a send costs one
+# round trip per 100 subscribers instead of one per subscriber
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+# Single-email endpoint, used when Resend rejects a whole batch
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+BATCH_SIZE = 100
+
+# Built once per process; the template never changes mid-run, so skip the
+# per-render mtime check. HTML autoescaping guards against markup in model names.
+_TEMPLATES = Environment(
+    loader=FileSystemLoader(str(Path(__file__).parent / "templates")),
+    auto_reload=False,
+    autoescape=select_autoescape(["html"]),
+)
 
 # Supabase REST helpers
 HEADERS = {
@@ -34,108 +62,157 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Seconds before a Supabase or Resend request is abandoned
+REQUEST_TIMEOUT_SECS = 30
 
-def supabase_get(table: str, params: str = "") -> list:
-    """GET from Supabase REST API."""
-    url = f"{SUPABASE_URL}/rest/v1/{table}?{params}"
-    resp = requests.get(url, headers=HEADERS)
-    resp.raise_for_status()
-    return resp.json()
+# Keep-alive sessions: every call after the first skips the TCP + TLS handshake
+_SUPABASE_SESSION = pooled_session(HEADERS)
+_RESEND_SESSION = pooled_session({"Content-Type": "application/json"})
 
 
-def get_active_subscribers() -> list[dict]:
-    """Get all active newsletter subscribers."""
-    return supabase_get(
-        "newsletter_subscribers",
-        "select=email&is_active=eq.true&order=subscribed_at.asc"
-    )
+@http_retry
+def supabase_rpc(function: str, args: dict | None = None):
+    """Call a Postgres function through the Supabase REST API."""
+    url = f"{SUPABASE_URL}/rest/v1/rpc/{function}"
+    resp = _SUPABASE_SESSION.post(url, json=args or {}, timeout=REQUEST_TIMEOUT_SECS)
+    raise_for_transient(resp)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
 
 
-def get_latest_scores() -> list[dict]:
-    """Get latest index scores for all models."""
-    data = supabase_get(
-        "daily_scores",
-        "select=vi_trade,vi_content,delta7_trade,delta7_content,date,models(slug,name,company,color)"
-        "&order=date.desc&limit=49"
-    )
+def get_digest_payload() -> tuple[list[dict], list[dict]]:
+    """
+    Get active subscribers and latest index scores in one round trip.
 
-    # Deduplicate — keep latest per model
-    seen = set()
-    latest = []
-    for row in data:
-        slug = row.get("models", {}).get("slug")
-        if not slug or slug in seen:
-            continue
-        seen.add(slug)
-        latest.append(row)
+    Uses the weekly_digest_payload() RPC (migration 012), which keeps the
+    latest row per model server-side and sorts by vi_trade descending.
 
-    # Sort by vi_trade descending
-    return sorted(latest, key=lambda x: x.get("vi_trade", 0), reverse=True)
+    Returns:
+        (subscribers, scores): [{email}], [{vi_trade, ..., models: {slug, ...}}].
+    """
+    payload = supabase_rpc("weekly_digest_payload")
+    return payload.get("subscribers", []), payload.get("latest_scores", [])
 
 
 def generate_unsubscribe_url(email: str) -> str:
     """Generate HMAC-signed unsubscribe URL."""
-    token = hmac.new(
-        UNSUBSCRIBE_SECRET.encode(),
-        email.encode(),
-        hashlib.sha256
-    ).hexdigest()[:32]
-    return f"{SITE_URL}/api/newsletter/unsubscribe?email={requests.utils.quote(email)}&token={token}"
+    token = hmac.digest(_UNSUBSCRIBE_KEY, email.encode(), "sha256").hex()[:32]
+    return f"{SITE_URL}/api/newsletter/unsubscribe?email={quote(email)}&token={token}"
+
+
+def _abs_delta7(score: dict) -> float:
+    return abs(score.get("delta7_trade") or 0)
 
 
-def render_digest(scores: list[dict]) -> str:
-    """Render the weekly digest HTML using Jinja2 template."""
-    templates_dir = Path(__file__).parent / "templates"
-    env = Environment(loader=FileSystemLoader(str(templates_dir)))
-    template = env.get_template("weekly_digest.html")
+def render_digest(scores: list[dict]) -> tuple[str, str]:
+    """
+    Render the weekly digest HTML using Jinja2 template.
+
+    Returns:
+        (prefix, suffix): the HTML split around the unsubscribe URL, so each
+        recipient's email is prefix + url + suffix.
+    """
+    template = _TEMPLATES.get_template("weekly_digest.html")
 
     # Calculate averages and top mover
     avg_score = sum(s.get("vi_trade", 0) for s in scores) / max(len(scores), 1)
 
-    top_mover = None
-    max_abs_delta = 0
-    for s in scores:
-        d = abs(s.get("delta7_trade") or 0)
-        if d > max_abs_delta:
-            max_abs_delta = d
-            top_mover = s
+    # Largest |7d change| (first one on ties); none if nothing moved
+    top_mover = max(scores, key=_abs_delta7, default=None)
+    if top_mover is not None and not _abs_delta7(top_mover):
+        top_mover = None
 
-    return template.render(
+    html = template.render(
         week_date=datetime.utcnow().strftime("%B %d, %Y"),
         scores=scores,
         avg_score=avg_score,
         top_mover=top_mover,
         site_url=SITE_URL,
-        unsubscribe_url="{{UNSUBSCRIBE_URL}}",  # replaced per-recipient
+        unsubscribe_url=UNSUBSCRIBE_PLACEHOLDER,
     )
+    prefix, _, suffix = html.partition(UNSUBSCRIBE_PLACEHOLDER)
+    return prefix, suffix
 
 
-def send_email(to: str, subject: str, html: str) -> bool:
-    """Send email via Resend API."""
-    if not RESEND_API_KEY:
-        print(f"  [SKIP] No RESEND_API_KEY — would send to {to}")
-        return False
+@http_retry
+def _resend_post(url: str, payload: dict | list, idempotency_key: str):
+    """
+    POST to the Resend API, retrying 429/5xx and connection errors.
 
-    resp = requests.post(
-        "https://api.resend.com/emails",
+    The same Idempotency-Key is sent on every attempt, so Resend drops a
+    retry of a request it already accepted instead of mailing twice.
+    """
+    resp = _RESEND_SESSION.post(
+        url,
         headers={
             "Authorization": f"Bearer {RESEND_API_KEY}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "from": RESEND_FROM,
-            "to": [to],
-            "subject": subject,
-            "html": html,
+            "Idempotency-Key": idempotency_key,
         },
+        json=payload,
+        timeout=REQUEST_TIMEOUT_SECS,
     )
+    raise_for_transient(resp)
+    return resp
+
+
+def send_email(message: dict) -> bool:
+    """Send one email via Resend's single-email endpoint."""
+    to = message["to"][0]
+    try:
+        resp = _resend_post(RESEND_EMAILS_URL, message, str(uuid.uuid4()))
+    except (requests.RequestException, TransientHTTPError) as e:
+        print(f"  [ERR] Failed to send to {to}: {e}")
+        return False
 
     if resp.status_code in (200, 201):
         print(f"  [OK] Sent to {to}")
         return True
-    else:
-        print(f"  [ERR] Failed to send to {to}: {resp.status_code} {resp.text}")
-        return False
+    print(f"  [ERR] Failed to send to {to}: {resp.status_code} {resp.text}")
+    return False
+
+
+def send_batch(messages: list[dict]) -> int:
+    """
+    Send emails via Resend's batch endpoint, BATCH_SIZE per request.
+
+    A batch is accepted or rejected as a whole. When Resend rejects one
+    (4xx, e.g. a single invalid address), its messages are sent one at a
+    time so only the bad recipients fail. A batch that still fails after
+    retries is counted as failed and the remaining batches go out.
+
+    Args:
+        messages: Resend email objects ({from, to, subject, html}).
+
+    Returns:
+        Number of emails accepted by Resend.
+    """
+    if not RESEND_API_KEY:
+        for msg in messages:
+            print(f"  [SKIP] No RESEND_API_KEY — would send to {msg['to'][0]}")
+        return 0
+
+    sent = 0
+    for i in range(0, len(messages), BATCH_SIZE):
+        batch = messages[i:i + BATCH_SIZE]
+        try:
+            resp = _resend_post(RESEND_BATCH_URL, batch, str(uuid.uuid4()))
+        except (requests.RequestException, TransientHTTPError) as e:
+            print(f"  [ERR] Failed to send batch of {len(batch)}: {e}")
+            continue
+
+        if resp.status_code in (200, 201):
+            print(f"  [OK] Sent batch of {len(batch)}")
+            sent += len(batch)
+        elif 400 <= resp.status_code < 500:
+            print(
+                f"  [WARN] Batch of {len(batch)} rejected: {resp.status_code} {resp.text}"
+                f" — sending individually"
+            )
+            sent += sum(send_email(msg) for msg in batch)
+        else:
+            print(f"  [ERR] Failed to send batch of {len(batch)}: {resp.status_code} {resp.text}")
+
+    return sent
 
 
 def main():
@@ -147,43 +224,43 @@ def main():
     print(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
     print("=" * 60)
 
-    # 1. Get subscribers
-    subscribers = get_active_subscribers()
+    # 1. Get subscribers and latest scores
+    subscribers, scores = get_digest_payload()
     print(f"\nActive subscribers: {len(subscribers)}")
 
     if not subscribers:
         print("No active subscribers. Exiting.")
         return
 
-    # 2. Get latest scores
-    scores = get_latest_scores()
     print(f"Models with scores: {len(scores)}")
 
     if not scores:
         print("No index data available. Exiting.")
         return
 
-    # 3. Render template
-    base_html = render_digest(scores)
+    # 2. Render template
+    prefix, suffix = render_digest(scores)
     subject = f"AI Virality Weekly — {datetime.utcnow().strftime('%b %d, %Y')}"
 
-    # 4. Send to each subscriber
-    sent = 0
-    failed = 0
-
+    # 3. Personalize per subscriber, then send in batches
+    messages = []
     for sub in subscribers:
         email = sub["email"]
         unsub_url = generate_unsubscribe_url(email)
-        html = base_html.replace("{{UNSUBSCRIBE_URL}}", unsub_url)
+        messages.append({
+            "from": RESEND_FROM,
+            "to": [email],
+            "subject": subject,
+            "html": prefix + unsub_url + suffix,
+        })
 
-        if dry_run:
-            print(f"  [DRY] Would send to {email}")
-            sent += 1
-        else:
-            if send_email(email, subject, html):
-                sent += 1
-            else:
-                failed += 1
+    if dry_run:
+        for msg in messages:
+            print(f"  [DRY] Would send to {msg['to'][0]}")
+        sent = len(messages)
+    else:
+        sent = send_batch(messages)
+    failed = len(messages) - sent
 
     print(f"\n{'=' * 60}")
     print(f"Done. Sent: {sent}, Failed: {failed}")
@@ -10,52 +10,184 @@ Usage:
     python -m etl.main --source youtube      # Single source
     python -m etl.main --dry-run             # Fetch but don't write to DB
     python -m etl.main --skip-fetch          # Skip fetch, only recalculate index + signals
+    python -m etl.main --warm-trends         # Off-peak: fill today's Trends Redis cache
     python -m etl.main --model chatgpt --source github --dry-run
 """
 
 import argparse
+import importlib
 import logging
 import sys
 import time
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
 from typing import Any
 
-from etl.storage.supabase_client import (
-    get_all_models,
-    get_model_id,
-    get_aliases,
-    upsert_raw_metrics,
-)
-from etl.collectors.trends import TrendsCollector
-from etl.collectors.youtube import YouTubeCollector
-from etl.collectors.hackernews import HackerNewsCollector
-from etl.collectors.github_collector import GitHubCollector
-from etl.collectors.news import GDELTNewsCollector
-from etl.collectors.quality import QualityCollector
-from etl.collectors.wikipedia import WikipediaCollector
-from etl.collectors.devadoption import DevAdoptionCollector
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
-)
+# Only stdlib at import time: the Supabase client and collector packages
+# load inside the functions that use them, so `--help` and importing
+# COLLECTOR_REGISTRY stay fast
 logger = logging.getLogger("etl.main")
 
-# Map source name -> (CollectorClass, alias_type used in Supabase)
-COLLECTOR_REGISTRY: dict[str, tuple[type, str]] = {
-    "trends":     (TrendsCollector,      "search_query"),
-    "youtube":    (YouTubeCollector,      "search_query"),
-    "hackernews": (HackerNewsCollector,   "hn_query"),
-    "github":     (GitHubCollector,       "github_repo"),
-    "gdelt":      (GDELTNewsCollector,    "gdelt_query"),
+# Map source name -> ("module:CollectorClass", alias_type used in Supabase).
+# Collector modules are imported only for the sources a run uses, so
+# `--source github` doesn't pay for pytrends/pandas and friends.
+COLLECTOR_REGISTRY: dict[str, tuple[str, str]] = {
+    "trends":     ("etl.collectors.trends:TrendsCollector",             "search_query"),
+    "youtube":    ("etl.collectors.youtube:YouTubeCollector",           "search_query"),
+    "hackernews": ("etl.collectors.hackernews:HackerNewsCollector",     "hn_query"),
+    "github":     ("etl.collectors.github_collector:GitHubCollector",   "github_repo"),
+    "gdelt":      ("etl.collectors.news:GDELTNewsCollector",            "gdelt_query"),
     # arena: kept for metadata (Elo badge) but NOT in index formula (replaced by D)
-    "arena":      (QualityCollector,      "arena_name"),
-    "wikipedia":  (WikipediaCollector,     "wikipedia_article"),
-    "devadoption": (DevAdoptionCollector,  "devadoption_package"),
+    "arena":      ("etl.collectors.quality:QualityCollector",           "arena_name"),
+    "wikipedia":  ("etl.collectors.wikipedia:WikipediaCollector",       "wikipedia_article"),
+    "devadoption": ("etl.collectors.devadoption:DevAdoptionCollector",  "devadoption_package"),
 }
 
-# Sources that are slow/fragile and need extra delay between models
-SLOW_SOURCES = {"trends", "gdelt"}
+# Model fetches per second for sources that walk models one at a time
+# (max_workers == 1). A capacity-1 token bucket spaces fetch starts, so a
+# fetch that already took longer than the interval isn't followed by a sleep.
+# Slow/fragile sources get more room; different sources run concurrently.
+SOURCE_RATES = {"trends": 0.5, "gdelt": 0.5}
+DEFAULT_SOURCE_RATE = 2.0
+
+
+def _load_collector_class(source_name: str) -> type:
+    """Import a source's collector module and return its collector class."""
+    path, _ = COLLECTOR_REGISTRY[source_name]
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _collect_model(
+    source_name: str,
+    collector: Any,
+    model: dict[str, Any],
+    aliases: list[str],
+    dry_run: bool,
+) -> tuple[dict, list[dict]]:
+    """
+    Fetch one source for one model and build its raw_metrics rows.
+
+    Returns:
+        (summary entry {model, source, metrics, status}, rows to upsert;
+        no rows on a dry run or failure).
+    """
+    from etl.storage.supabase_client import build_raw_metric_rows
+
+    slug = model["slug"]
+    model_id = model["id"]
+
+    try:
+        result = collector.fetch(slug, aliases)
+
+        if result is None:
+            logger.warning(f"  {slug}/{source_name}: returned None")
+            return {
+                "model": slug,
+                "source": source_name,
+                "metrics": 0,
+                "status": "ERROR: returned None",
+            }, []
+
+        metrics = result.get("metrics", {})
+        metric_count = len([v for v in metrics.values() if v is not None])
+
+        rows = []
+        if not dry_run:
+            rows = build_raw_metric_rows(
+                model_id=model_id,
+                metric_date=date.fromisoformat(result["date"]),
+                source=result["source"],
+                metrics=metrics,
+                raw_json=result.get("raw_json"),
+            )
+
+        logger.info(f"  {slug}/{source_name}: {metric_count} metrics OK")
+        return {
+            "model": slug,
+            "source": source_name,
+            "metrics": metric_count,
+            "status": "OK",
+        }, rows
+
+    except Exception as e:
+        logger.error(f"  {slug}/{source_name}: FAILED — {e}")
+        return {
+            "model": slug,
+            "source": source_name,
+            "metrics": 0,
+            "status": f"ERROR: {e}",
+        }, []
+
+
+def _run_source(
+    source_name: str,
+    collector: Any,
+    models: list[dict[str, Any]],
+    aliases_map: dict[tuple[str, str], list[str]],
+    dry_run: bool,
+) -> list[dict]:
+    """
+    Fetch one source for every model, then upsert all its rows at once.
+
+    Runs on its own worker thread. Collectors with max_workers > 1 fan their
+    models out over that many workers; the rest go model by model, paced
+    by a per-source token bucket (SOURCE_RATES). The source's metrics are
+    written in a single raw_metrics upsert; if it fails, every model that
+    had metrics is reported as an error.
+
+    Args:
+        aliases_map: {(model_id, alias_type): aliases} from get_aliases_bulk().
+
+    Returns:
+        One summary entry per model, in model order:
+        {model, source, metrics, status, secs}.
+    """
+    from etl.collectors.throttle import TokenBucket
+    from etl.storage.supabase_client import upsert_raw_metric_rows
+
+    _, alias_type = COLLECTOR_REGISTRY[source_name]
+
+    def collect(model: dict[str, Any]) -> tuple[dict, list[dict]]:
+        model_started = time.monotonic()
+        aliases = aliases_map.get((model["id"], alias_type), [])
+        entry, rows = _collect_model(source_name, collector, model, aliases, dry_run)
+        entry["secs"] = round(time.monotonic() - model_started, 2)
+        return entry, rows
+
+    started = time.monotonic()
+    workers = min(collector.max_workers, len(models))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(collect, models))
+    else:
+        bucket = TokenBucket(
+            rate=SOURCE_RATES.get(source_name, DEFAULT_SOURCE_RATE), capacity=1
+        )
+        results = []
+        for model in models:
+            bucket.acquire()
+            results.append(collect(model))
+    summary = [entry for entry, _ in results]
+
+    rows = [row for _, model_rows in results for row in model_rows]
+    if rows:
+        try:
+            upsert_raw_metric_rows(rows)
+            logger.info(f"  {source_name}: upserted {len(rows)} metrics")
+        except Exception as e:
+            logger.error(f"  {source_name}: upsert FAILED — {e}")
+            for entry in summary:
+                if entry["metrics"]:
+                    entry["metrics"] = 0
+                    entry["status"] = f"ERROR: upsert failed — {e}"
+
+    model_secs = [entry["secs"] for entry in summary]
+    logger.info(
+        f"  {source_name}: {len(models)} models in {time.monotonic() - started:.1f}s "
+        f"({workers} worker(s), slowest model {max(model_secs, default=0):.1f}s)"
+    )
+    return summary
 
 
 def run_pipeline(
@@ -77,6 +209,7 @@ def run_pipeline(
         Summary dict with counts.
     """
     today = date.today()
+    run_ts = datetime.now(timezone.utc)
     logger.info(f"{'='*60}")
     logger.info(f"ETL Pipeline — {today}")
     logger.info(f"{'='*60}")
@@ -92,6 +225,8 @@ def run_pipeline(
 
     # ── Step 1: Data Fetch ──
     if not skip_fetch:
+        from etl.storage.supabase_client import get_all_models, get_aliases_bulk
+
         # Load models from Supabase
         models = get_all_models()
         if target_model:
@@ -116,80 +251,99 @@ def run_pipeline(
         # Initialize collectors (once, reused across models)
         collectors: dict[str, Any] = {}
         for source_name in sources:
-            collector_cls, _ = COLLECTOR_REGISTRY[source_name]
             try:
-                collectors[source_name] = collector_cls()
+                collectors[source_name] = _load_collector_class(source_name)()
+                collectors[source_name].set_run_clock(today, run_ts)
                 logger.info(f"Initialized {source_name} collector")
             except Exception as e:
                 logger.error(f"Failed to init {source_name} collector: {e}")
 
-        # Run fetch pipeline
-        for model in models:
-            slug = model["slug"]
-            model_id = model["id"]
-            logger.info(f"\n--- {slug} ({model['name']} by {model['company']}) ---")
-
-            for source_name, collector in collectors.items():
-                _, alias_type = COLLECTOR_REGISTRY[source_name]
-
-                # Get aliases for this model+source
-                try:
-                    aliases = get_aliases(model_id, alias_type)
-                except Exception as e:
-                    logger.error(f"  {source_name}: failed to fetch aliases — {e}")
-                    total_errors += 1
-                    results_summary.append({
-                        "model": slug,
-                        "source": source_name,
-                        "metrics": 0,
-                        "status": f"ERROR: aliases fetch failed — {e}",
-                    })
-                    continue
-
-                try:
-                    result = collector.fetch(slug, aliases)
-
-                    if result is None:
-                        logger.warning(f"  {source_name}: returned None")
-                        total_errors += 1
-                        continue
-
-                    metrics = result.get("metrics", {})
-                    metric_count = len([v for v in metrics.values() if v is not None])
-
-                    if not dry_run:
-                        upsert_raw_metrics(
-                            model_id=model_id,
-                            metric_date=date.fromisoformat(result["date"]),
-                            source=result["source"],
-                            metrics=metrics,
-                            raw_json=result.get("raw_json"),
-                        )
-
-                    total_metrics += metric_count
-                    results_summary.append({
-                        "model": slug,
-                        "source": source_name,
-                        "metrics": metric_count,
-                        "status": "OK",
-                    })
-                    logger.info(f"  {source_name}: {metric_count} metrics OK")
-
-                except Exception as e:
-                    total_errors += 1
-                    results_summary.append({
-                        "model": slug,
-                        "source": source_name,
-                        "metrics": 0,
-                        "status": f"ERROR: {e}",
-                    })
-                    logger.error(f"  {source_name}: FAILED — {e}")
-
-                # Small delay between sources
-                if source_name in SLOW_SOURCES:
-                    time.sleep(2.0)
-                else:
-                    time.sleep(0.5)
+        # Every model's aliases for the sources in this run, in one query.
+        # Without aliases nothing can be fetched: report every (model, source)
+        # as an error and go on to the downstream steps.
+        try:
+            aliases_map = get_aliases_bulk(
+                [m["id"] for m in models],
+                sorted({COLLECTOR_REGISTRY[name][1] for name in collectors}),
+            )
+        except Exception as e:
+            logger.error(f"Failed to fetch aliases — skipping all sources: {e}")
+            results_summary.extend(
+                {
+                    "model": m["slug"],
+                    "source": source_name,
+                    "metrics": 0,
+                    "status": f"ERROR: aliases fetch failed — {e}",
+                }
+                for source_name in collectors
+                for m in models
+            )
+            aliases_map = {}
+            collectors = {}
+
+        model_ids = {m["slug"]: m["id"] for m in models}
+
+        # Load previous GitHub readings for all models at once (for deltas)
+        if "github" in collectors:
+            try:
+                collectors["github"].prefetch_previous_metrics(model_ids)
+            except Exception as e:
+                logger.warning(f"GitHub previous-metrics prefetch failed: {e}")
+
+        # Same for the Arena Elo ratings from a week ago (for elo_delta_7d)
+        if "arena" in collectors:
+            try:
+                collectors["arena"].prefetch_week_ago_elos(model_ids)
+            except Exception as e:
+                logger.warning(f"Arena week-ago Elo prefetch failed: {e}")
+
+        # Wikipedia pageviews for every model's primary article, 50 titles per request
+        if "wikipedia" in collectors:
+            try:
+                _, alias_type = COLLECTOR_REGISTRY["wikipedia"]
+                titles = [
+                    aliases[0]
+                    for aliases in (aliases_map.get((m["id"], alias_type)) for m in models)
+                    if aliases
+                ]
+                collectors["wikipedia"].prefetch_pageviews(titles)
+            except Exception as e:
+                logger.warning(f"Wikipedia pageviews prefetch failed: {e}")
+
+        # Each source's Redis cache entries for all models, one pipeline
+        # request per source instead of one GET per model or package
+        for source_name, collector in collectors.items():
+            _, alias_type = COLLECTOR_REGISTRY[source_name]
+            try:
+                collector.prefetch_cache({
+                    m["slug"]: aliases_map.get((m["id"], alias_type)) or []
+                    for m in models
+                })
+            except Exception as e:
+                logger.warning(f"{source_name} cache prefetch failed: {e}")
+
+        # Run fetch pipeline: one worker per source walks all models (fanning
+        # out per collector.max_workers), so sources on different hosts overlap
+        with ThreadPoolExecutor(max_workers=max(1, len(collectors))) as pool:
+            futures = [
+                pool.submit(_run_source, source_name, collector, models, aliases_map, dry_run)
+                for source_name, collector in collectors.items()
+            ]
+            for future in futures:
+                results_summary.extend(future.result())
+
+        # Store what the sources fetched in Redis, one pipeline request each
+        for source_name, collector in collectors.items():
+            try:
+                collector.flush_cache()
+            except Exception as e:
+                logger.warning(f"{source_name} cache flush failed: {e}")
+
+        for entry in results_summary:
+            if entry["status"] == "OK":
+                total_metrics += entry["metrics"]
+            else:
+                total_errors += 1
 
         ok_count = sum(1 for r in results_summary if r["status"] == "OK")
         logger.info(f"\nFetch complete: {ok_count} OK, {total_errors} errors, {total_metrics} metrics")
@@ -302,6 +456,43 @@ def run_pipeline(
     }
 
 
+def run_trends_warmup(target_model: str | None = None) -> dict[str, Any]:
+    """
+    Fetch Google Trends for every model ahead of the scheduled runs.
+
+    Fills today's per-model Redis entries through TrendsCollector.warm_cache,
+    so a later run that finds pytrends blocked answers from the cache
+    instead of trying trendspy. Nothing is written to Supabase.
+
+    Args:
+        target_model: If set, only warm this model slug.
+
+    Returns:
+        Summary dict with the model and warmed counts.
+    """
+    from etl.storage.supabase_client import get_all_models, get_aliases_bulk
+
+    today = date.today()
+    logger.info(f"Trends cache warm-up — {today}")
+
+    models = get_all_models()
+    if target_model:
+        models = [m for m in models if m["slug"] == target_model]
+        if not models:
+            logger.error(f"Model '{target_model}' not found in Supabase")
+            return {"error": f"Model not found: {target_model}"}
+
+    _, alias_type = COLLECTOR_REGISTRY["trends"]
+    aliases_map = get_aliases_bulk([m["id"] for m in models], [alias_type])
+
+    collector = _load_collector_class("trends")()
+    collector.set_run_clock(today, datetime.now(timezone.utc))
+    warmed = collector.warm_cache(
+        [(m["slug"], aliases_map.get((m["id"], alias_type), [])) for m in models]
+    )
+    return {"date": today.isoformat(), "models": len(models), "warmed": warmed}
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -332,9 +523,26 @@ def main():
         action="store_true",
         help="Skip data fetching, only recalculate index and detect signals",
     )
+    parser.add_argument(
+        "--warm-trends",
+        action="store_true",
+        help="Only fetch Google Trends to fill today's Redis cache (off-peak job)",
+    )
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+    )
+
+    if args.warm_trends:
+        summary = run_trends_warmup(target_model=args.model)
+        if "error" in summary or (summary["models"] and not summary["warmed"]):
+            logger.error("Trends warm-up cached no models — exiting with error")
+            sys.exit(1)
+        return
+
     summary = run_pipeline(
         target_model=args.model,
         target_source=args.source,
@@ -0,0 +1,8 @@
+-- Migration 011: zstd-compressed raw_json for raw_metrics
+-- The ETL now writes raw API payloads as zstd-compressed JSON (bytea);
+-- raw_json JSONB is kept for rows written before this migration.
+
+ALTER TABLE raw_metrics ADD COLUMN IF NOT EXISTS raw_json_zstd BYTEA;
+
+COMMENT ON COLUMN raw_metrics.raw_json_zstd IS
+    'zstd-compressed JSON of the raw API response (decode with etl.storage.supabase_client.decompress_raw_json)';
@@ -0,0 +1,34 @@
+-- Migration 012: weekly digest payload RPC
+-- One round trip for etl/email_digest.py: active subscribers plus each
+-- model's latest daily score (deduplicated server-side with DISTINCT ON),
+-- callable as POST /rest/v1/rpc/weekly_digest_payload.
+
+CREATE OR REPLACE FUNCTION weekly_digest_payload()
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'subscribers', COALESCE((
+            SELECT jsonb_agg(jsonb_build_object('email', s.email) ORDER BY s.subscribed_at)
+            FROM newsletter_subscribers s
+            WHERE s.is_active = true
+        ), '[]'::jsonb),
+        'latest_scores', COALESCE((
+            SELECT jsonb_agg(to_jsonb(latest) ORDER BY latest.vi_trade DESC NULLS LAST)
+            FROM (
+                SELECT DISTINCT ON (d.model_id)
+                    d.vi_trade, d.vi_content, d.delta7_trade, d.delta7_content, d.date,
+                    jsonb_build_object(
+                        'slug', m.slug, 'name', m.name, 'company', m.company, 'color', m.color
+                    ) AS models
+                FROM daily_scores d
+                JOIN models m ON m.id = d.model_id
+                ORDER BY d.model_id, d.date DESC
+            ) latest
+        ), '[]'::jsonb)
+    );
+$$;
+
+REVOKE ALL ON FUNCTION weekly_digest_payload() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION weekly_digest_payload() TO service_role;
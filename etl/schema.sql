@@ -41,6 +41,7 @@ CREATE TABLE IF NOT EXISTS raw_metrics (
     metric_name TEXT NOT NULL,
     metric_value NUMERIC NOT NULL,
     raw_json JSONB,
+    raw_json_zstd BYTEA,  -- zstd-compressed raw_json (written by the ETL)
     fetched_at TIMESTAMPTZ DEFAULT now(),
     UNIQUE(model_id, date, source, metric_name)
 );
@@ -3,7 +3,10 @@ from .supabase_client import (
     get_client,
     get_model_id,
     get_aliases,
+    get_aliases_bulk,
     get_all_models,
+    build_raw_metric_rows,
+    upsert_raw_metric_rows,
     upsert_raw_metrics,
     get_raw_metrics,
 )
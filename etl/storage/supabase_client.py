@@ -6,9 +6,11 @@ Uses service_role key for full access (bypasses RLS).
 import logging
 import time
 from datetime import date
-from typing import Any
+from typing import Any, Callable, Iterator
 from uuid import UUID
 
+import orjson
+import zstandard
 from supabase import create_client, Client
 
 from etl.config import SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY
@@ -17,6 +19,12 @@ logger = logging.getLogger(__name__)
 
 _client: Client | None = None
 
+# Rows per page for paginate(); PostgREST caps responses at 1000 rows by default
+PAGE_SIZE = 1000
+
+# zstd level for raw_json payloads (fast, and plenty for repetitive API JSON)
+RAW_JSON_ZSTD_LEVEL = 3
+
 
 def get_client() -> Client:
     """Get or create Supabase client (singleton)."""
@@ -28,6 +36,58 @@ def get_client() -> Client:
     return _client
 
 
+def paginate(
+    build_query: Callable[[], Any],
+    page_size: int | None = None,
+    call: Callable[[Callable[[], Any]], Any] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield rows from a select query one page at a time via .range().
+
+    Args:
+        build_query: Returns a fresh, ordered select query. Called once per
+            page, since .range() appends to a builder rather than replacing.
+        page_size: Rows fetched per request (default PAGE_SIZE).
+        call: Optional wrapper for each page's execute (e.g. a circuit
+            breaker's .call); defaults to calling it directly.
+
+    Yields:
+        Row dicts, in query order.
+    """
+    page_size = page_size or PAGE_SIZE
+    start = 0
+    while True:
+        execute = build_query().range(start, start + page_size - 1).execute
+        batch = (call(execute) if call else execute()).data
+        yield from batch
+        if len(batch) < page_size:
+            return
+        start += page_size
+
+
+def compress_raw_json(raw_json: Any) -> str:
+    """
+    Encode a raw API payload as zstd-compressed JSON for the raw_json_zstd
+    bytea column, in PostgREST's hex input format ('\\x...').
+    """
+    compressed = zstandard.ZstdCompressor(level=RAW_JSON_ZSTD_LEVEL).compress(
+        orjson.dumps(raw_json)
+    )
+    return "\\x" + compressed.hex()
+
+
+def decompress_raw_json(value: str | bytes | None) -> Any | None:
+    """
+    Decode a raw_json_zstd value as returned by PostgREST (hex string) or as
+    raw bytes back into the original JSON object.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = bytes.fromhex(value.removeprefix("\\x"))
+    return orjson.loads(zstandard.ZstdDecompressor().decompress(value))
+
+
 def get_model_id(slug: str) -> str | None:
     """
     Look up model UUID by slug.
@@ -85,6 +145,48 @@ def get_aliases(model_id: str, alias_type: str) -> list[str]:
     raise last_error  # type: ignore[misc]
 
 
+def get_aliases_bulk(
+    model_ids: list[str], alias_types: list[str]
+) -> dict[tuple[str, str], list[str]]:
+    """
+    Get aliases for many models and alias types in one query.
+    Retries up to 3 times on transient errors, like get_aliases().
+
+    Args:
+        model_ids: UUIDs of the models
+        alias_types: Alias types to load (e.g. ['search_query', 'github_repo'])
+
+    Returns:
+        Dict like {(model_id, alias_type): [alias_value, ...]}; pairs with
+        no aliases are absent.
+    """
+    client = get_client()
+    last_error = None
+    for attempt in range(3):
+        try:
+            result = (
+                client.table("model_aliases")
+                .select("model_id, alias_type, alias_value")
+                .in_("model_id", model_ids)
+                .in_("alias_type", alias_types)
+                .execute()
+            )
+            aliases: dict[tuple[str, str], list[str]] = {}
+            for row in result.data:
+                aliases.setdefault((row["model_id"], row["alias_type"]), []).append(
+                    row["alias_value"]
+                )
+            return aliases
+        except Exception as e:
+            last_error = e
+            wait = (attempt + 1) * 5
+            logger.warning(
+                f"get_aliases_bulk failed (attempt {attempt+1}/3): {e}, retrying in {wait}s"
+            )
+            time.sleep(wait)
+    raise last_error  # type: ignore[misc]
+
+
 def get_all_models() -> list[dict[str, Any]]:
     """Get all active models with their IDs and slugs."""
     client = get_client()
@@ -98,25 +200,27 @@ def get_all_models() -> list[dict[str, Any]]:
     return result.data
 
 
-def upsert_raw_metrics(
+def build_raw_metric_rows(
     model_id: str,
     metric_date: date,
     source: str,
     metrics: dict[str, Any],
     raw_json: dict | None = None,
-) -> None:
+) -> list[dict[str, Any]]:
     """
-    Upsert raw metrics into raw_metrics table.
-    One row per (model_id, date, source, metric_name).
+    Build raw_metrics rows, one per (model_id, date, source, metric_name).
+    None-valued metrics are skipped.
 
     Args:
         model_id: UUID of the model
         metric_date: Date of the measurement
         source: Data source ('trends', 'youtube', 'reddit', etc.)
         metrics: Dict of {metric_name: metric_value}
-        raw_json: Optional raw API response for debugging
+        raw_json: Optional raw API response for debugging; stored
+            zstd-compressed in raw_json_zstd
     """
-    client = get_client()
+    # Compress once; every metric row for this fetch carries the same payload
+    raw_json_zstd = compress_raw_json(raw_json) if raw_json is not None else None
     rows = []
     for metric_name, metric_value in metrics.items():
         if metric_value is None:
@@ -127,18 +231,50 @@ def upsert_raw_metrics(
             "source": source,
             "metric_name": metric_name,
             "metric_value": float(metric_value),
-            "raw_json": raw_json,
+            "raw_json_zstd": raw_json_zstd,
         })
+    return rows
+
+
+def upsert_raw_metric_rows(rows: list[dict[str, Any]]) -> None:
+    """
+    Upsert prebuilt raw_metrics rows (any mix of models/sources) in one request.
+
+    Args:
+        rows: Rows from build_raw_metric_rows().
+    """
+    if not rows:
+        return
+    get_client().table("raw_metrics").upsert(
+        rows, on_conflict="model_id,date,source,metric_name"
+    ).execute()
+
+
+def upsert_raw_metrics(
+    model_id: str,
+    metric_date: date,
+    source: str,
+    metrics: dict[str, Any],
+    raw_json: dict | None = None,
+) -> None:
+    """
+    Upsert raw metrics into raw_metrics table.
+    One row per (model_id, date, source, metric_name).
 
+    Args:
+        model_id: UUID of the model
+        metric_date: Date of the measurement
+        source: Data source ('trends', 'youtube', 'reddit', etc.)
+        metrics: Dict of {metric_name: metric_value}
+        raw_json: Optional raw API response for debugging; stored
+            zstd-compressed in raw_json_zstd
+    """
+    rows = build_raw_metric_rows(model_id, metric_date, source, metrics, raw_json)
     if not rows:
         logger.warning(f"No metrics to upsert for {source}/{model_id} on {metric_date}")
         return
 
-    result = (
-        client.table("raw_metrics")
-        .upsert(rows, on_conflict="model_id,date,source,metric_name")
-        .execute()
-    )
+    upsert_raw_metric_rows(rows)
     logger.info(
         f"Upserted {len(rows)} metrics for source={source}, model={model_id}, date={metric_date}"
     )
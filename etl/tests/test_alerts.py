@@ -10,8 +10,19 @@ Uses mocking to avoid Supabase and HTTP calls.
 """
 
 import unittest
+from datetime import date
+from unittest.mock import MagicMock, patch
 
-from etl.alerts import _validate_webhook_url, _check_condition
+import httpx
+
+from etl.alerts import (
+    _check_condition,
+    _get_alerts_with_context,
+    _score_lookup,
+    _send_webhook,
+    _validate_webhook_url,
+    run_alert_checks,
+)
 
 
 class TestWebhookUrlValidation(unittest.TestCase):
@@ -70,11 +81,60 @@ class TestWebhookUrlValidation(unittest.TestCase):
         self.assertTrue(_validate_webhook_url("https://webhook.site/abc-123"))
 
 
+class TestSendWebhook(unittest.TestCase):
+    """Test webhook retry behaviour with the HTTP client mocked out."""
+
+    URL = "https://example.com/webhook"
+
+    def _response(self, status, headers=None):
+        return MagicMock(status_code=status, headers=headers or {})
+
+    def _send(self, responses):
+        with patch("etl.alerts._WEBHOOK_CLIENT") as client, \
+                patch("etl.alerts.time.sleep") as sleep:
+            client.post.side_effect = responses
+            ok = _send_webhook(self.URL, {"event": "test"})
+        return ok, client.post, sleep
+
+    def test_success_first_try(self):
+        ok, post, sleep = self._send([self._response(200)])
+        self.assertTrue(ok)
+        self.assertEqual(post.call_count, 1)
+        sleep.assert_not_called()
+
+    def test_retries_on_5xx_then_succeeds(self):
+        ok, post, sleep = self._send([self._response(503), self._response(200)])
+        self.assertTrue(ok)
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(sleep.call_count, 1)
+
+    def test_honors_retry_after_on_429(self):
+        ok, _, sleep = self._send([
+            self._response(429, {"Retry-After": "2"}),
+            self._response(204),
+        ])
+        self.assertTrue(ok)
+        sleep.assert_called_once_with(2.0)
+
+    def test_no_retry_on_4xx(self):
+        ok, post, sleep = self._send([self._response(404)])
+        self.assertFalse(ok)
+        self.assertEqual(post.call_count, 1)
+        sleep.assert_not_called()
+
+    def test_gives_up_after_max_attempts(self):
+        ok, post, sleep = self._send([httpx.ConnectError("refused")] * 3)
+        self.assertFalse(ok)
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+
 class TestCheckCondition(unittest.TestCase):
     """Test _check_condition logic for different condition types."""
 
     def _make_alert(self, condition, threshold=50.0, mode="trade", models=None):
         return {
+            "model_id": "m1",
             "condition": condition,
             "threshold": threshold,
             "mode": mode,
@@ -84,7 +144,7 @@ class TestCheckCondition(unittest.TestCase):
     def test_vi_above_triggered(self):
         alert = self._make_alert("vi_above", threshold=60.0)
         scores = {"vi_trade": 65.0, "delta7_trade": 5.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertTrue(fired)
         self.assertAlmostEqual(value, 65.0)
         self.assertIn("above", msg)
@@ -92,76 +152,219 @@ class TestCheckCondition(unittest.TestCase):
     def test_vi_above_not_triggered(self):
         alert = self._make_alert("vi_above", threshold=70.0)
         scores = {"vi_trade": 65.0, "delta7_trade": 5.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertFalse(fired)
 
     def test_vi_below_triggered(self):
         alert = self._make_alert("vi_below", threshold=40.0)
         scores = {"vi_trade": 35.0, "delta7_trade": -5.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertTrue(fired)
         self.assertAlmostEqual(value, 35.0)
 
     def test_vi_below_not_triggered(self):
         alert = self._make_alert("vi_below", threshold=30.0)
         scores = {"vi_trade": 35.0, "delta7_trade": -5.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertFalse(fired)
 
     def test_delta7_above_triggered(self):
         alert = self._make_alert("delta7_above", threshold=10.0)
         scores = {"vi_trade": 60.0, "delta7_trade": 15.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertTrue(fired)
         self.assertAlmostEqual(value, 15.0)
 
     def test_delta7_below_triggered(self):
         alert = self._make_alert("delta7_below", threshold=-5.0)
         scores = {"vi_trade": 40.0, "delta7_trade": -10.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertTrue(fired)
         self.assertAlmostEqual(value, -10.0)
 
     def test_new_signal_triggered(self):
         alert = self._make_alert("new_signal")
         signals = [{"signal_type": "divergence", "direction": "bullish", "strength": 75}]
-        fired, value, msg = _check_condition(alert, None, signals)
+        fired, value, msg = _check_condition(alert, {}, signals)
         self.assertTrue(fired)
         self.assertIn("divergence", msg)
 
     def test_new_signal_no_signals(self):
         alert = self._make_alert("new_signal")
-        fired, value, msg = _check_condition(alert, None, None)
+        fired, value, msg = _check_condition(alert, {}, None)
         self.assertFalse(fired)
 
     def test_new_signal_empty_list(self):
         alert = self._make_alert("new_signal")
-        fired, value, msg = _check_condition(alert, None, [])
+        fired, value, msg = _check_condition(alert, {}, [])
         self.assertFalse(fired)
 
     def test_content_mode_uses_content_scores(self):
         alert = self._make_alert("vi_above", threshold=50.0, mode="content")
         scores = {"vi_trade": 40.0, "vi_content": 60.0,
                   "delta7_trade": 0.0, "delta7_content": 5.0}
-        fired, value, msg = _check_condition(alert, scores, None)
+        fired, value, msg = _check_condition(alert, _score_lookup({"m1": scores}), None)
         self.assertTrue(fired)
         self.assertAlmostEqual(value, 60.0)
         self.assertIn("Content", msg)
 
     def test_no_scores_returns_false(self):
         alert = self._make_alert("vi_above", threshold=50.0)
-        fired, value, msg = _check_condition(alert, None, None)
+        fired, value, msg = _check_condition(alert, {}, None)
+        self.assertFalse(fired)
+
+    def test_missing_score_field_counts_as_zero(self):
+        alert = self._make_alert("vi_below", threshold=10.0, mode="content")
+        scores = {"vi_trade": 65.0, "vi_content": None}
+        fired, value, _ = _check_condition(alert, _score_lookup({"m1": scores}), None)
+        self.assertTrue(fired)
+        self.assertEqual(value, 0.0)
+
+    def test_lookup_without_model_scores(self):
+        alert = self._make_alert("vi_below", threshold=50.0)
+        alert["model_id"] = "m2"
+        fired, _, _ = _check_condition(alert, _score_lookup({"m1": {"vi_trade": 1.0}}), None)
         self.assertFalse(fired)
 
     def test_none_threshold(self):
-        """Threshold=None should not crash."""
+        """An alert without a threshold never fires."""
         alert = self._make_alert("vi_above", threshold=None)
         scores = {"vi_trade": 50.0, "delta7_trade": 0.0}
-        # Should handle gracefully (comparison with None may differ)
-        try:
-            fired, value, msg = _check_condition(alert, scores, None)
-        except TypeError:
-            pass  # acceptable — threshold shouldn't be None for vi_above
+        fired, _, _ = _check_condition(alert, _score_lookup({"m1": scores}), None)
+        self.assertFalse(fired)
+
+
+class TestRunAlertChecks(unittest.TestCase):
+    """Test run_alert_checks orchestration with Supabase and HTTP mocked out."""
+
+    def _make_alert(self, alert_id, condition, threshold, channel="webhook"):
+        return {
+            "id": alert_id,
+            "user_id": "user-1",
+            "model_id": "model-1",
+            "condition": condition,
+            "threshold": threshold,
+            "mode": "trade",
+            "channel": channel,
+            "webhook_url": f"https://example.com/{alert_id}",
+            "models": {"slug": "chatgpt", "name": "ChatGPT"},
+        }
+
+    def _run(self, alerts, webhook_ok, client=None):
+        scores = {"model-1": {"vi_trade": 65.0, "delta7_trade": 5.0}}
+        client = client or MagicMock()
+        with patch("etl.alerts.get_client", return_value=client), \
+                patch("etl.alerts._get_alerts_with_context",
+                      return_value=(alerts, scores, {})), \
+                patch("etl.alerts._send_webhook", side_effect=webhook_ok) as send:
+            summary = run_alert_checks(date(2026, 3, 1))
+        return summary, send
+
+    def test_no_alerts(self):
+        summary, send = self._run([], webhook_ok=lambda url, payload: True)
+        self.assertEqual(summary, {"checked": 0, "triggered": 0, "delivered": 0})
+        send.assert_not_called()
+
+    def test_webhooks_delivered_for_triggered_alerts_only(self):
+        alerts = [
+            self._make_alert("a1", "vi_above", 60.0),
+            self._make_alert("a2", "vi_above", 90.0),  # not triggered
+            self._make_alert("a3", "vi_below", 70.0),
+        ]
+        summary, send = self._run(alerts, webhook_ok=lambda url, payload: True)
+        self.assertEqual(summary, {"checked": 3, "triggered": 2, "delivered": 2})
+        urls = sorted(call.args[0] for call in send.call_args_list)
+        self.assertEqual(urls, ["https://example.com/a1", "https://example.com/a3"])
+
+    def test_failed_webhook_not_counted_as_delivered(self):
+        alerts = [
+            self._make_alert("a1", "vi_above", 60.0),
+            self._make_alert("a2", "vi_above", 60.0),
+        ]
+        summary, _ = self._run(
+            alerts, webhook_ok=lambda url, payload: url.endswith("a1")
+        )
+        self.assertEqual(summary["triggered"], 2)
+        self.assertEqual(summary["delivered"], 1)
+
+    def test_email_channel_marked_delivered_without_webhook(self):
+        alerts = [self._make_alert("a1", "vi_above", 60.0, channel="email")]
+        summary, send = self._run(alerts, webhook_ok=lambda url, payload: True)
+        self.assertEqual(summary["delivered"], 1)
+        send.assert_not_called()
+
+    def test_history_and_timestamps_written_in_one_batch(self):
+        alerts = [
+            self._make_alert("a1", "vi_above", 60.0),
+            self._make_alert("a2", "vi_below", 70.0),
+        ]
+        client = MagicMock()
+        self._run(alerts, webhook_ok=lambda url, payload: True, client=client)
+
+        table = client.table.return_value
+        table.insert.assert_called_once()
+        rows = table.insert.call_args.args[0]
+        self.assertEqual([r["alert_id"] for r in rows], ["a1", "a2"])
+        self.assertTrue(all(r["delivered"] for r in rows))
+        table.update.return_value.in_.assert_called_once_with("id", ["a1", "a2"])
+
+    def test_batch_insert_failure_falls_back_to_per_row(self):
+        alerts = [
+            self._make_alert("a1", "vi_above", 60.0),
+            self._make_alert("a2", "vi_below", 70.0),
+        ]
+        client = MagicMock()
+        insert = client.table.return_value.insert
+        insert.return_value.execute.side_effect = [Exception("bad row"), None, None]
+        self._run(alerts, webhook_ok=lambda url, payload: True, client=client)
+
+        self.assertEqual(insert.call_count, 3)
+        self.assertEqual(insert.call_args_list[1].args[0]["alert_id"], "a1")
+        self.assertEqual(insert.call_args_list[2].args[0]["alert_id"], "a2")
+
+
+class TestGetAlertsWithContext(unittest.TestCase):
+    """Test folding of the embedded scores/signals response."""
+
+    def test_scores_and_signals_keyed_by_model(self):
+        sig = {"signal_type": "spike", "direction": "rising", "strength": 80}
+        rows = [
+            {"id": "a1", "model_id": "m1", "models": {
+                "slug": "chatgpt", "name": "ChatGPT",
+                "daily_scores": [{"vi_trade": 70.0}], "signals": [sig]}},
+            {"id": "a2", "model_id": "m2", "models": {
+                "slug": "claude", "name": "Claude",
+                "daily_scores": [], "signals": []}},
+        ]
+        client = MagicMock()
+        query = client.table.return_value.select.return_value
+        query.eq.return_value.eq.return_value.eq.return_value.order.return_value \
+            .range.return_value.execute.return_value = MagicMock(data=rows)
+
+        with patch("etl.alerts.get_client", return_value=client):
+            alerts, scores, signals = _get_alerts_with_context(date(2026, 3, 1))
+
+        self.assertEqual(len(alerts), 2)
+        self.assertEqual(scores, {"m1": {"vi_trade": 70.0}})
+        self.assertEqual(signals, {"m1": [sig]})
+
+    def test_reads_all_pages(self):
+        rows = [{"id": f"a{i}", "model_id": "m1", "models": {}} for i in range(5)]
+        client = MagicMock()
+        ranged = (client.table.return_value.select.return_value
+                  .eq.return_value.eq.return_value.eq.return_value.order.return_value.range)
+        ranged.side_effect = lambda start, end: MagicMock(
+            execute=MagicMock(return_value=MagicMock(data=rows[start:end + 1]))
+        )
+
+        with patch("etl.alerts.get_client", return_value=client), \
+                patch("etl.storage.supabase_client.PAGE_SIZE", 2):
+            alerts, _, _ = _get_alerts_with_context(date(2026, 3, 1))
+
+        self.assertEqual([a["id"] for a in alerts], [f"a{i}" for i in range(5)])
+        self.assertEqual(
+            [c.args for c in ranged.call_args_list], [(0, 1), (2, 3), (4, 5)]
+        )
 
 
 if __name__ == "__main__":
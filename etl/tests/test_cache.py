@@ -0,0 +1,92 @@
+"""Tests for etl/cache.py"""
+
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from etl import cache
+from etl.cache import CacheBatch, cache_mget, cache_mset
+
+
+@pytest.fixture(autouse=True)
+def configured():
+    with patch.object(cache, "_is_configured", return_value=True):
+        yield
+
+
+class TestCacheMget:
+    def test_parses_results_in_key_order(self):
+        replies = [
+            {"result": orjson.dumps({"stars": 5}).decode()},
+            {"result": None},
+            {"result": "12"},
+        ]
+        with patch.object(cache, "_pipeline", return_value=replies) as pipeline:
+            assert cache_mget(["a", "b", "c"]) == [{"stars": 5}, None, 12]
+        pipeline.assert_called_once_with([["GET", "a"], ["GET", "b"], ["GET", "c"]])
+
+    def test_error_reply_is_a_miss(self):
+        replies = [{"error": "WRONGTYPE"}, {"result": "1"}]
+        with patch.object(cache, "_pipeline", return_value=replies):
+            assert cache_mget(["a", "b"]) == [None, 1]
+
+    def test_non_json_value_is_a_miss(self):
+        replies = [{"result": "not json"}, {"result": '"ok"'}]
+        with patch.object(cache, "_pipeline", return_value=replies):
+            assert cache_mget(["a", "b"]) == [None, "ok"]
+
+    def test_failed_pipeline_is_all_misses(self):
+        with patch.object(cache, "_pipeline", return_value=None):
+            assert cache_mget(["a", "b"]) == [None, None]
+        with patch.object(cache, "_pipeline", side_effect=ConnectionError("down")):
+            assert cache_mget(["a"]) == [None]
+
+    def test_unconfigured_skips_request(self):
+        with patch.object(cache, "_is_configured", return_value=False), \
+                patch.object(cache, "_pipeline") as pipeline:
+            assert cache_mget(["a"]) == [None]
+        pipeline.assert_not_called()
+
+
+class TestCacheMset:
+    def test_sets_all_with_ttl(self):
+        with patch.object(cache, "_pipeline", return_value=[{"result": "OK"}] * 2) as pipeline:
+            assert cache_mset({"a": 1, "b": {"x": 2}}, ttl=60)
+        pipeline.assert_called_once_with([
+            ["SET", "a", "1", "EX", 60],
+            ["SET", "b", '{"x":2}', "EX", 60],
+        ])
+
+    def test_any_error_fails(self):
+        replies = [{"result": "OK"}, {"error": "OOM"}]
+        with patch.object(cache, "_pipeline", return_value=replies):
+            assert not cache_mset({"a": 1, "b": 2})
+
+
+class TestCacheBatch:
+    def test_prefetched_keys_need_no_more_requests(self):
+        batch = CacheBatch()
+        with patch.object(cache, "cache_mget", return_value=[7, None]) as mget, \
+                patch.object(cache, "cache_get") as get:
+            batch.prefetch(["a", "b", "a"])
+            assert batch.get("a") == 7
+            assert batch.get("b") is None
+        mget.assert_called_once_with(["a", "b"])
+        get.assert_not_called()
+
+    def test_unknown_key_falls_back_to_single_get(self):
+        batch = CacheBatch()
+        with patch.object(cache, "cache_get", return_value=3) as get:
+            assert batch.get("c") == 3
+        get.assert_called_once_with("c")
+
+    def test_writes_are_flushed_once(self):
+        batch = CacheBatch(ttl=60)
+        batch.set("a", 1)
+        batch.set("b", 2)
+        assert batch.get("a") == 1
+        with patch.object(cache, "cache_mset", return_value=True) as mset:
+            assert batch.flush()
+            assert batch.flush()
+        mset.assert_called_once_with({"a": 1, "b": 2}, ttl=60)
@@ -0,0 +1,105 @@
+"""Tests for etl/circuit_breaker.py"""
+
+import pytest
+
+from etl.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _boom():
+    raise TimeoutError("upstream timed out")
+
+
+class TestCircuitBreaker:
+    def _breaker(self, clock, threshold=3, reset=30.0):
+        return CircuitBreaker("test", fail_threshold=threshold, reset_timeout=reset, clock=clock)
+
+    def test_passes_through_when_closed(self):
+        breaker = self._breaker(FakeClock())
+        assert breaker.call(lambda x: x * 2, 21) == 42
+        assert breaker.state == CLOSED
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = self._breaker(FakeClock(), threshold=3)
+        for _ in range(3):
+            with pytest.raises(TimeoutError):
+                breaker.call(_boom)
+        assert breaker.state == OPEN
+
+        # Further calls fail fast without invoking the function
+        calls = []
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: calls.append(1))
+        assert calls == []
+
+    def test_success_resets_failure_count(self):
+        breaker = self._breaker(FakeClock(), threshold=3)
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                breaker.call(_boom)
+        breaker.call(lambda: None)
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                breaker.call(_boom)
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_success_closes(self):
+        clock = FakeClock()
+        breaker = self._breaker(clock, threshold=1, reset=30.0)
+        with pytest.raises(TimeoutError):
+            breaker.call(_boom)
+        assert breaker.state == OPEN
+
+        clock.now = 31.0
+        assert breaker.state == HALF_OPEN
+        assert breaker.call(lambda: "ok") == "ok"
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_failure_reopens(self):
+        clock = FakeClock()
+        breaker = self._breaker(clock, threshold=2, reset=30.0)
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                breaker.call(_boom)
+
+        clock.now = 31.0
+        with pytest.raises(TimeoutError):
+            breaker.call(_boom)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: None)
+
+    def test_only_one_probe_while_half_open(self):
+        clock = FakeClock()
+        breaker = self._breaker(clock, threshold=1, reset=30.0)
+        with pytest.raises(TimeoutError):
+            breaker.call(_boom)
+
+        clock.now = 31.0
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+
+    def test_decorator_form(self):
+        breaker = self._breaker(FakeClock(), threshold=1)
+
+        @breaker
+        def flaky():
+            raise ConnectionError("refused")
+
+        with pytest.raises(ConnectionError):
+            flaky()
+        with pytest.raises(CircuitOpenError):
+            flaky()
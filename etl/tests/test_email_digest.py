@@ -0,0 +1,128 @@
+"""Tests for etl/email_digest.py"""
+
+import hashlib
+import hmac
+from unittest.mock import MagicMock, patch
+
+import orjson
+
+from etl import email_digest
+
+
+def _messages(n):
+    return [
+        {"from": "x@y.z", "to": [f"u{i}@example.com"], "subject": "s", "html": "h"}
+        for i in range(n)
+    ]
+
+
+class TestSendBatch:
+    def _send(self, messages, responses):
+        with patch.object(email_digest, "RESEND_API_KEY", "key"), \
+                patch.object(email_digest._resend_post.retry, "sleep", lambda s: None), \
+                patch.object(email_digest._RESEND_SESSION, "post") as post:
+            post.side_effect = responses
+            sent = email_digest.send_batch(messages)
+        return sent, post
+
+    def test_chunks_by_batch_size(self):
+        sent, post = self._send(_messages(250), [MagicMock(status_code=200)] * 3)
+        assert sent == 250
+        assert [len(c.kwargs["json"]) for c in post.call_args_list] == [100, 100, 50]
+        assert post.call_args.args[0] == email_digest.RESEND_BATCH_URL
+
+    def test_rejected_batch_falls_back_to_single_sends(self):
+        responses = [
+            MagicMock(status_code=422, text="invalid `to`"),
+            MagicMock(status_code=200),
+            MagicMock(status_code=422, text="invalid `to`"),
+            MagicMock(status_code=200),
+        ]
+        sent, post = self._send(_messages(3), responses)
+        assert sent == 2
+        assert [c.args[0] for c in post.call_args_list] == (
+            [email_digest.RESEND_BATCH_URL] + [email_digest.RESEND_EMAILS_URL] * 3
+        )
+
+    def test_transient_error_retried_with_same_idempotency_key(self):
+        sent, post = self._send(
+            _messages(2), [MagicMock(status_code=503, headers={}), MagicMock(status_code=200)]
+        )
+        assert sent == 2
+        keys = [c.kwargs["headers"]["Idempotency-Key"] for c in post.call_args_list]
+        assert len(keys) == 2 and keys[0] == keys[1]
+
+    def test_failed_batch_does_not_stop_later_batches(self):
+        timeouts = [email_digest.requests.Timeout("slow")] * 3
+        sent, post = self._send(_messages(150), timeouts + [MagicMock(status_code=200)])
+        assert sent == 50
+        assert post.call_count == 4
+
+    def test_no_api_key_sends_nothing(self):
+        with patch.object(email_digest, "RESEND_API_KEY", ""), \
+                patch.object(email_digest._RESEND_SESSION, "post") as post:
+            assert email_digest.send_batch(_messages(3)) == 0
+        post.assert_not_called()
+
+
+class TestGetDigestPayload:
+    def test_single_rpc_call(self):
+        payload = {
+            "subscribers": [{"email": "a@example.com"}],
+            "latest_scores": [{"vi_trade": 70, "models": {"slug": "claude"}}],
+        }
+        with patch.object(email_digest, "_SUPABASE_SESSION") as session:
+            post = session.post
+            post.return_value = MagicMock(status_code=200, content=orjson.dumps(payload))
+            subscribers, scores = email_digest.get_digest_payload()
+        assert post.call_count == 1
+        assert post.call_args.args[0].endswith("/rest/v1/rpc/weekly_digest_payload")
+        assert subscribers == payload["subscribers"]
+        assert scores == payload["latest_scores"]
+
+    def test_missing_arrays_default_empty(self):
+        with patch.object(email_digest, "_SUPABASE_SESSION") as session:
+            post = session.post
+            post.return_value = MagicMock(status_code=200, content=b"{}")
+            assert email_digest.get_digest_payload() == ([], [])
+
+
+class TestUnsubscribeUrl:
+    def test_token_matches_hmac_sha256_prefix(self):
+        email = "first.last+news@example.com"
+        expected = hmac.new(
+            email_digest.UNSUBSCRIBE_SECRET.encode(), email.encode(), hashlib.sha256
+        ).hexdigest()[:32]
+        url = email_digest.generate_unsubscribe_url(email)
+        assert url.endswith(f"&token={expected}")
+        assert "email=first.last%2Bnews%40example.com" in url
+
+
+class TestRenderDigest:
+    SCORES = [
+        {"vi_trade": 72.5, "vi_content": 60.1, "delta7_trade": 4.2, "delta7_content": 1.0,
+         "date": "2026-02-10", "models": {"slug": "claude", "name": "Claude",
+                                          "company": "Anthropic", "color": "#D4A574"}},
+    ]
+
+    def test_split_around_unsubscribe_url(self):
+        prefix, suffix = email_digest.render_digest(self.SCORES)
+        assert prefix.endswith('<a href="')
+        assert suffix.startswith('"')
+        assert email_digest.UNSUBSCRIBE_PLACEHOLDER not in prefix + suffix
+        assert "Claude" in prefix
+
+    def _top_mover(self, deltas):
+        scores = [dict(self.SCORES[0], delta7_trade=d) for d in deltas]
+        with patch.object(email_digest._TEMPLATES, "get_template") as get_template:
+            get_template.return_value.render.return_value = ""
+            email_digest.render_digest(scores)
+        top_mover = get_template.return_value.render.call_args.kwargs["top_mover"]
+        return None if top_mover is None else top_mover["delta7_trade"]
+
+    def test_top_mover_largest_absolute_change(self):
+        assert self._top_mover([2.0, -5.5, 5.5, None]) == -5.5
+
+    def test_no_top_mover_when_nothing_moved(self):
+        assert self._top_mover([0, None]) is None
+        assert self._top_mover([]) is None
@@ -0,0 +1,93 @@
+"""Tests for etl/collectors/file_cache.py"""
+
+from etl.collectors.file_cache import FileCache
+
+URL = "https://hn.algolia.com/api/v1/search_by_date"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFileCache:
+    def test_miss_then_hit(self, tmp_path):
+        cache = FileCache("hackernews", ttl=60, root=tmp_path)
+        params = {"query": "claude", "page": 0}
+        assert cache.get(URL, params) is None
+        cache.set(URL, params, '{"hits": []}')
+        assert cache.get(URL, params) == '{"hits": []}'
+        assert cache.has(URL, params)
+
+    def test_key_ignores_param_order(self, tmp_path):
+        cache = FileCache("hackernews", ttl=60, root=tmp_path)
+        cache.set(URL, {"a": 1, "b": 2}, "body")
+        assert cache.get(URL, {"b": 2, "a": 1}) == "body"
+        assert cache.get(URL, {"a": 1, "b": 3}) is None
+
+    def test_expires_after_ttl(self, tmp_path):
+        clock = FakeClock()
+        cache = FileCache("gdelt", ttl=60, root=tmp_path, clock=clock)
+        cache.set(URL, None, "body")
+        clock.now += 59
+        assert cache.get(URL) == "body"
+        clock.now += 2
+        assert cache.get(URL) is None
+
+    def test_sources_are_separate(self, tmp_path):
+        FileCache("hackernews", ttl=60, root=tmp_path).set(URL, None, "hn")
+        assert FileCache("gdelt", ttl=60, root=tmp_path).get(URL) is None
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = FileCache("hackernews", ttl=60, root=tmp_path)
+        cache.set(URL, None, "body")
+        path = tmp_path / "hackernews" / f"{FileCache.key(URL)}.json"
+        path.write_text("not json")
+        assert cache.get(URL) is None
+
+    def test_entry_missing_fields_is_a_miss(self, tmp_path):
+        cache = FileCache("hackernews", ttl=60, root=tmp_path)
+        cache.set(URL, None, "body")
+        path = tmp_path / "hackernews" / f"{FileCache.key(URL)}.json"
+        path.write_text('{"body": "body"}')
+        assert cache.get(URL) is None
+        path.write_text('{"ts": "x", "ttl": 60, "body": "body"}')
+        assert cache.get(URL) is None
+        path.write_text("[1, 2]")
+        assert cache.get(URL) is None
+
+    def test_failed_write_removes_temp_file(self, tmp_path, monkeypatch):
+        cache = FileCache("hackernews", ttl=60, root=tmp_path)
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("etl.collectors.file_cache.os.replace", fail_replace)
+        cache.set(URL, None, "body")
+        assert list((tmp_path / "hackernews").iterdir()) == []
+        assert cache.get(URL) is None
+
+    def test_delete(self, tmp_path):
+        cache = FileCache("trends", ttl=60, root=tmp_path)
+        cache.set(URL, None, "body")
+        cache.delete(URL)
+        assert cache.get(URL) is None
+        cache.delete(URL)  # missing entry is fine
+
+    def test_disabled_without_root(self):
+        cache = FileCache("hackernews", ttl=60, root="")
+        cache.set(URL, None, "body")
+        assert cache.get(URL) is None
+
+    def test_expired_entry_keeps_validators(self, tmp_path):
+        clock = FakeClock()
+        cache = FileCache("arena", ttl=60, root=tmp_path, clock=clock)
+        cache.set(URL, None, "body", {"etag": '"abc"'})
+        clock.now += 61
+        assert cache.get(URL) is None
+        entry = cache.get_entry(URL)
+        assert entry["body"] == "body"
+        assert entry["validators"] == {"etag": '"abc"'}
@@ -0,0 +1,81 @@
+"""Tests for etl/collectors/hackernews.py"""
+
+from datetime import date, datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from etl.collectors import hackernews
+from etl.collectors.hackernews import HackerNewsCollector
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+RUN_AT = datetime(2026, 10, 16, 6, 0, tzinfo=timezone.utc)
+
+
+def _response(body: bytes) -> httpx.Response:
+    return httpx.Response(
+        200, content=body, request=httpx.Request("GET", hackernews.HN_SEARCH_DATE_URL)
+    )
+
+
+@pytest.fixture
+def collector():
+    c = HackerNewsCollector()
+    c.set_run_clock(date(2026, 10, 16), RUN_AT)
+    c._cache = MagicMock()
+    c._cache.get.return_value = None
+    return c
+
+
+class TestQueryWords:
+    def test_splits_multi_word_aliases(self):
+        words = HackerNewsCollector._query_words(["Claude Sonnet", "Anthropic", "Claude"])
+        assert words == ["Claude", "Sonnet", "Anthropic"]
+
+
+class TestFetchCombined:
+    def test_optional_words_response_is_post_filtered(self, collector):
+        body = (FIXTURES / "hn_search_by_date_optional_words.json").read_bytes()
+        empty = b'{"hits": [], "nbHits": 0, "nbPages": 0, "page": 0}'
+        sent = []
+
+        def get(params):
+            sent.append(params)
+            return _response(body if params["tags"] == "story" else empty)
+
+        with patch.object(collector, "_get", side_effect=get):
+            best, per_alias = collector._fetch_combined(
+                ["Claude Sonnet", "Anthropic"], collector._since_ts()
+            )
+
+        story_params = next(p for p in sent if p["tags"] == "story")
+        assert story_params["query"] == "Claude Sonnet Anthropic"
+        assert story_params["optionalWords"] == "Claude,Sonnet,Anthropic"
+        # "Claude Shannon" and "Sonnet 18" match single words only
+        assert best["stories_count"] == 2
+        assert best["total_points"] == 388 + 97
+        assert per_alias["Claude Sonnet"]["top_points"] == 388
+        # The system card story links to anthropic.com
+        assert per_alias["Anthropic"]["stories_count"] == 2
+
+    def test_truncated_or_query_falls_back_to_per_alias(self, collector):
+        since_ts = collector._since_ts()
+
+        hit_a = {"objectID": "1", "title": "GPT-4o", "created_at_i": since_ts + 1}
+        hit_b = {"objectID": "2", "title": "ChatGPT", "created_at_i": since_ts + 2}
+        results = {
+            "GPT-4o ChatGPT": ([hit_a], True),
+            "GPT-4o": ([hit_a], False),
+            "ChatGPT": ([hit_a, hit_b], False),
+        }
+
+        with patch.object(
+            collector, "_search_hn", side_effect=lambda q, *a, **k: results[q]
+        ) as search:
+            hits = collector._search_union(["GPT-4o", "ChatGPT"], "story", since_ts)
+
+        assert [h["objectID"] for h in hits] == ["1", "2"]
+        assert search.call_count == 3
@@ -0,0 +1,147 @@
+"""Tests for etl/collectors/news.py"""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import orjson
+
+from etl.collectors.news import GDELTNewsCollector
+
+CUTOFF = datetime(2026, 2, 18, 12, 0, tzinfo=timezone.utc)
+
+
+class TestRecentArticles:
+    def test_filters_by_seendate(self):
+        articles = [
+            {"seendate": "20260218T191500Z", "domain": "a.com"},
+            {"seendate": "20260217T191500Z", "domain": "b.com"},
+        ]
+        recent = GDELTNewsCollector._recent_articles(articles, CUTOFF)
+        assert recent["domain"].tolist() == ["a.com"]
+
+    def test_keeps_missing_and_unparseable_dates(self):
+        articles = [
+            {"seendate": "", "domain": "a.com"},
+            {"seendate": "garbage", "domain": "b.com"},
+            {"domain": "c.com"},
+        ]
+        recent = GDELTNewsCollector._recent_articles(articles, CUTOFF)
+        assert len(recent) == 3
+
+    def test_non_string_seendate_is_kept(self):
+        articles = [
+            {"seendate": None, "domain": "a.com"},
+            {"seendate": 20260218, "domain": "b.com"},
+            {"seendate": "20260218T120000Z", "domain": "c.com"},
+        ]
+        recent = GDELTNewsCollector._recent_articles(articles, CUTOFF)
+        assert recent["domain"].tolist() == ["a.com", "b.com", "c.com"]
+
+    def test_all_dates_missing(self):
+        recent = GDELTNewsCollector._recent_articles([{"domain": "a.com"}], CUTOFF)
+        assert recent["domain"].tolist() == ["a.com"]
+
+    def test_empty_list(self):
+        recent = GDELTNewsCollector._recent_articles([], CUTOFF)
+        assert len(recent) == 0
+        assert recent["domain"].tolist() == []
+
+
+class TestFetch:
+    def test_counts_sources_and_uses_tonechart(self):
+        now = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        articles = [
+            {"seendate": now, "domain": "a.com"},
+            {"seendate": now, "domain": "a.com"},
+            {"seendate": now, "domain": ""},
+            {"seendate": now, "domain": "b.com"},
+        ]
+        collector = GDELTNewsCollector()
+        with patch.object(collector, "_query_gdelt", return_value={"articles": articles}), \
+                patch.object(collector, "_query_gdelt_tone", return_value=-1.5):
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        assert result["metrics"] == {
+            "article_count": 4,
+            "source_count": 2,
+            "avg_tone": -1.5,
+        }
+        assert sorted(result["raw_json"]["sample_sources"]) == ["a.com", "b.com"]
+
+    def test_tonechart_failure_falls_back_to_article_tone(self):
+        now = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        articles = [
+            {"seendate": now, "domain": "a.com", "tone": 4},
+            {"seendate": now, "domain": "b.com", "tone": "-1.5"},
+            {"seendate": now, "domain": "c.com", "tone": None},
+            {"seendate": "20200101T000000Z", "domain": "d.com", "tone": -9},
+        ]
+        collector = GDELTNewsCollector()
+        with patch.object(collector, "_query_gdelt", return_value={"articles": articles}), \
+                patch.object(collector, "_query_gdelt_tone", return_value=None):
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        assert result["metrics"]["avg_tone"] == 1.25
+
+    def test_tonechart_failure_without_article_tones_is_neutral(self):
+        now = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        articles = [{"seendate": now, "domain": "a.com"}]
+        collector = GDELTNewsCollector()
+        with patch.object(collector, "_query_gdelt", return_value={"articles": articles}), \
+                patch.object(collector, "_query_gdelt_tone", return_value=None):
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        assert result["metrics"]["avg_tone"] == 0.0
+
+    def test_no_articles_in_72h_skips_tone_query(self):
+        collector = GDELTNewsCollector()
+        with patch.object(collector, "_query_gdelt", return_value={}), \
+                patch.object(collector, "_query_gdelt_tone") as tone:
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        tone.assert_not_called()
+        assert result["metrics"] == {
+            "article_count": 0,
+            "source_count": 0,
+            "avg_tone": 0.0,
+        }
+
+
+    def test_quiet_24h_still_gets_72h_tone(self):
+        old = "20200101T000000Z"
+        collector = GDELTNewsCollector()
+        with patch.object(
+            collector, "_query_gdelt",
+            return_value={"articles": [{"seendate": old, "domain": "a.com"}]},
+        ), patch.object(collector, "_query_gdelt_tone", return_value=1.25):
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        assert result["metrics"]["article_count"] == 0
+        assert result["metrics"]["avg_tone"] == 1.25
+
+    def test_artlist_failure_still_queries_tone(self):
+        collector = GDELTNewsCollector()
+        with patch.object(collector, "_query_gdelt", return_value=None), \
+                patch.object(collector, "_query_gdelt_tone", return_value=0.5) as tone:
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        tone.assert_called_once()
+        assert result["metrics"]["avg_tone"] == 0.5
+
+
+class TestQueryGdeltTone:
+    def _tone(self, entries):
+        collector = GDELTNewsCollector()
+        body = orjson.dumps({"tonechart": entries}).decode()
+        with patch.object(collector._cache, "get", return_value=body):
+            return collector._query_gdelt_tone('"ChatGPT"')
+
+    def test_count_weighted_mean(self):
+        entries = [{"bin": -2, "count": 1}, {"bin": 1, "count": 3}, {"bin": 5, "count": 0}]
+        assert self._tone(entries) == 0.25
+
+    def test_zero_counts_is_none(self):
+        assert self._tone([{"bin": 3, "count": 0}]) is None
+
+    def test_empty_chart_is_none(self):
+        assert self._tone([]) is None
@@ -0,0 +1,124 @@
+"""Tests for etl/collectors/quality.py"""
+
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from etl.collectors import quality
+from etl.collectors.file_cache import FileCache
+from etl.collectors.quality import QualityCollector
+
+LEADERBOARD = {"gpt-4o": {"name": "GPT-4o", "elo": 1300.0, "rank": 1}}
+
+
+@pytest.fixture(autouse=True)
+def clear_leaderboard_cache():
+    quality._LEADERBOARD_CACHE.clear()
+    yield
+    quality._LEADERBOARD_CACHE.clear()
+
+
+class TestLeaderboardCache:
+    def test_shared_across_instances(self):
+        with patch.object(QualityCollector, "_load_leaderboard", return_value=LEADERBOARD) as load:
+            assert QualityCollector()._fetch_leaderboard() == LEADERBOARD
+            assert QualityCollector()._fetch_leaderboard() == LEADERBOARD
+        assert load.call_count == 1
+
+    def test_expires_after_ttl(self):
+        with patch.object(QualityCollector, "_load_leaderboard", return_value=LEADERBOARD) as load, \
+                patch.object(quality.time, "monotonic", side_effect=[0.0, quality.CACHE_TTL_SECS + 1, quality.CACHE_TTL_SECS + 1]):
+            QualityCollector()._fetch_leaderboard()
+            QualityCollector()._fetch_leaderboard()
+        assert load.call_count == 2
+
+    def test_empty_result_not_shared(self):
+        with patch.object(QualityCollector, "_load_leaderboard", return_value={}) as load:
+            QualityCollector()._fetch_leaderboard()
+            QualityCollector()._fetch_leaderboard()
+        assert load.call_count == 2
+
+
+class TestWeekAgoElo:
+    def _client(self, rows):
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.in_.return_value
+        query.eq.return_value.eq.return_value.eq.return_value.execute.return_value.data = rows
+        return client
+
+    def test_prefetch_one_query(self):
+        collector = QualityCollector()
+        client = self._client([{"model_id": "m1", "metric_value": "1280"}])
+        with patch("etl.storage.supabase_client.get_client", return_value=client):
+            elos = collector.prefetch_week_ago_elos({"chatgpt": "m1", "claude": "m2"})
+
+        assert elos == {"chatgpt": 1280.0, "claude": None}
+        client.table.assert_called_once_with("raw_metrics")
+
+    def test_fetch_uses_prefetched_elo(self):
+        collector = QualityCollector()
+        collector._leaderboard = LEADERBOARD
+        collector._week_ago_elo = {"chatgpt": 1280.0}
+        with patch("etl.storage.supabase_client.get_model_id") as get_model_id, \
+                patch.object(collector, "_get_week_ago_elo") as per_model:
+            result = collector.fetch("chatgpt", ["GPT-4o"])
+
+        get_model_id.assert_not_called()
+        per_model.assert_not_called()
+        assert result["metrics"]["elo_delta_7d"] == 20.0
+
+
+class TestParseLeaderboard:
+    def test_key_spellings_probed_from_first_row(self):
+        data = {"results": [
+            {"Model": "GPT-4o", "Arena Elo": "1300", "Rank": 1},
+            {"Model": "Claude", "Arena Elo": 1290, "Rank": 2},
+            {"Model": "Broken"},
+        ]}
+        leaderboard = QualityCollector()._parse_leaderboard(data)
+        assert leaderboard == {
+            "gpt-4o": {"name": "GPT-4o", "elo": 1300.0, "rank": 1},
+            "claude": {"name": "Claude", "elo": 1290.0, "rank": 2},
+        }
+
+    def test_rank_defaults_to_position(self):
+        data = [{"name": "a", "rating": 1}, {"name": "b", "rating": 2}]
+        leaderboard = QualityCollector()._parse_leaderboard(data)
+        assert [v["rank"] for v in leaderboard.values()] == [1, 2]
+
+    def test_no_rows(self):
+        assert QualityCollector()._parse_leaderboard({"data": []}) is None
+
+
+class TestConditionalGet:
+    BODY = '[{"model": "GPT-4o", "elo": 1300, "rank": 1}]'
+
+    def _collector(self, tmp_path, response):
+        collector = QualityCollector()
+        collector._cache = FileCache("arena", ttl=60, root=tmp_path)
+        collector._client = MagicMock()
+        collector._client.get.return_value = response
+        return collector
+
+    def test_200_stores_validators(self, tmp_path):
+        resp = httpx.Response(200, text=self.BODY, headers={"ETag": '"v1"'})
+        collector = self._collector(tmp_path, resp)
+
+        status, leaderboard = collector._get_leaderboard(quality.LMARENA_API_URL)
+
+        assert status == 200
+        assert "gpt-4o" in leaderboard
+        entry = collector._cache.get_entry(quality.LMARENA_API_URL)
+        assert entry["validators"] == {"etag": '"v1"'}
+
+    def test_304_reuses_stale_body(self, tmp_path):
+        collector = self._collector(tmp_path, httpx.Response(304))
+        collector._cache.set(quality.LMARENA_API_URL, None, self.BODY, {"etag": '"v1"'})
+
+        status, leaderboard = collector._get_leaderboard(quality.LMARENA_API_URL)
+
+        assert status == 304
+        assert leaderboard["gpt-4o"]["elo"] == 1300.0
+        sent = collector._client.get.call_args.kwargs["headers"]
+        assert sent == {"If-None-Match": '"v1"'}
@@ -0,0 +1,55 @@
+"""Tests for etl/collectors/single_flight.py"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from etl.collectors.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_repeat_calls_run_once(self):
+        flight = SingleFlight()
+        calls = []
+        for _ in range(3):
+            assert flight.do("k", lambda: calls.append(1) or "v") == "v"
+        assert len(calls) == 1
+
+    def test_distinct_keys_run_separately(self):
+        flight = SingleFlight()
+        assert flight.do("a", lambda: 1) == 1
+        assert flight.do("b", lambda: 2) == 2
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "v"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(flight.do, "k", slow) for _ in range(4)]
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert results == ["v"] * 4
+        assert len(calls) == 1
+
+    def test_failure_is_not_remembered(self):
+        flight = SingleFlight()
+
+        def boom():
+            raise RuntimeError("down")
+
+        with pytest.raises(RuntimeError):
+            flight.do("k", boom)
+        assert flight.do("k", lambda: "ok") == "ok"
+
+    def test_key_ignores_param_order(self):
+        assert SingleFlight.key("u", params={"a": 1, "b": 2}) == SingleFlight.key(
+            "u", params={"b": 2, "a": 1}
+        )
@@ -0,0 +1,50 @@
+"""Tests for etl/storage/supabase_client.py raw_json compression helpers"""
+
+from unittest.mock import MagicMock, patch
+
+from etl.storage.supabase_client import (
+    compress_raw_json,
+    decompress_raw_json,
+    get_aliases_bulk,
+)
+
+
+class TestRawJsonCompression:
+    def test_round_trip_hex(self):
+        raw = {"repos_queried": ["openai/openai-python"], "repos_data": [{"stars": 1}] * 50}
+        encoded = compress_raw_json(raw)
+        assert encoded.startswith("\\x")
+        assert decompress_raw_json(encoded) == raw
+
+    def test_round_trip_bytes(self):
+        raw = {"packages_data": [{"source": "npm", "package": "openai", "downloads": 5}]}
+        encoded = compress_raw_json(raw)
+        assert decompress_raw_json(bytes.fromhex(encoded[2:])) == raw
+
+    def test_repetitive_payload_shrinks(self):
+        raw = {"repos_data": [{"repo": "org/repo", "stars": 100, "forks": 10}] * 200}
+        assert len(compress_raw_json(raw)) < len(str(raw)) / 4
+
+    def test_none(self):
+        assert decompress_raw_json(None) is None
+
+
+class TestGetAliasesBulk:
+    def test_groups_by_model_and_type_in_row_order(self):
+        rows = [
+            {"model_id": "m1", "alias_type": "search_query", "alias_value": "ChatGPT"},
+            {"model_id": "m2", "alias_type": "search_query", "alias_value": "Claude"},
+            {"model_id": "m1", "alias_type": "search_query", "alias_value": "GPT-4o"},
+            {"model_id": "m1", "alias_type": "hn_query", "alias_value": "OpenAI"},
+        ]
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.in_.return_value.in_.return_value
+        query.execute.return_value = MagicMock(data=rows)
+        with patch("etl.storage.supabase_client.get_client", return_value=client):
+            aliases = get_aliases_bulk(["m1", "m2"], ["hn_query", "search_query"])
+        assert aliases == {
+            ("m1", "search_query"): ["ChatGPT", "GPT-4o"],
+            ("m2", "search_query"): ["Claude"],
+            ("m1", "hn_query"): ["OpenAI"],
+        }
+        assert query.execute.call_count == 1
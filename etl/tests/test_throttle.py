@@ -0,0 +1,110 @@
+"""Tests for etl/collectors/throttle.py"""
+
+import pytest
+
+from etl.collectors.throttle import AdaptiveLimiter, TokenBucket
+
+
+class FakeClock:
+    """Clock whose sleep() just advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, secs):
+        self.slept.append(secs)
+        self.now += secs
+
+
+class TestTokenBucket:
+    def _bucket(self, clock, rate=10, capacity=None):
+        return TokenBucket(rate=rate, capacity=capacity, clock=clock, sleep=clock.sleep)
+
+    def test_burst_up_to_capacity_without_waiting(self):
+        clock = FakeClock()
+        bucket = self._bucket(clock, rate=10, capacity=5)
+        for _ in range(5):
+            assert bucket.acquire() == 0.0
+        assert clock.slept == []
+
+    def test_waits_when_empty(self):
+        clock = FakeClock()
+        bucket = self._bucket(clock, rate=10, capacity=1)
+        bucket.acquire()
+        waited = bucket.acquire()
+        assert waited == pytest.approx(0.1)
+        assert clock.now == pytest.approx(0.1)
+
+    def test_refill_is_capped_at_capacity(self):
+        clock = FakeClock()
+        bucket = self._bucket(clock, rate=10, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        clock.now += 60  # long idle period
+        bucket.acquire()
+        bucket.acquire()
+        assert clock.slept == []
+        assert bucket.acquire() == pytest.approx(0.1)
+
+    def test_sustained_rate(self):
+        clock = FakeClock()
+        bucket = self._bucket(clock, rate=80, capacity=80)
+        for _ in range(240):
+            bucket.acquire()
+        # 80 burst + 160 at 80/s -> ~2 seconds
+        assert clock.now == pytest.approx(2.0)
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestAdaptiveLimiter:
+    def _limiter(self, clock, **kwargs):
+        return AdaptiveLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+    def test_healthy_host_never_waits(self):
+        clock = FakeClock()
+        limiter = self._limiter(clock)
+        for _ in range(3):
+            assert limiter.acquire("h") == 0.0
+            limiter.record_success("h")
+        assert clock.slept == []
+
+    def test_throttle_doubles_delay_up_to_max(self):
+        clock = FakeClock()
+        limiter = self._limiter(clock, backoff=10, max_delay=25)
+        assert limiter.record_throttle("h") == 10
+        assert limiter.record_throttle("h") == 20
+        assert limiter.record_throttle("h") == 25
+
+    def test_next_request_waits_out_throttle(self):
+        clock = FakeClock()
+        limiter = self._limiter(clock, backoff=10)
+        limiter.acquire("h")
+        limiter.record_throttle("h")
+        assert limiter.acquire("h") == pytest.approx(10)
+
+    def test_retry_after_is_a_floor(self):
+        limiter = self._limiter(FakeClock(), backoff=1, max_delay=60)
+        assert limiter.record_throttle("h", retry_after=30) == 30
+
+    def test_success_relaxes_delay(self):
+        limiter = self._limiter(FakeClock(), min_delay=0.5, backoff=8, decay=0.5)
+        limiter.record_throttle("h")
+        limiter.record_throttle("h")
+        limiter.record_success("h")
+        assert limiter.delay("h") == 8
+        limiter.record_success("h")
+        limiter.record_success("h")
+        assert limiter.delay("h") == 0.5
+
+    def test_hosts_are_independent(self):
+        clock = FakeClock()
+        limiter = self._limiter(clock, backoff=10)
+        limiter.record_throttle("a")
+        assert limiter.acquire("b") == 0.0
@@ -0,0 +1,253 @@
+"""Tests for etl/collectors/trends.py"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+from pytrends.exceptions import ResponseError, TooManyRequestsError
+from pytrends.request import TrendReq
+
+from etl.collectors import trends
+from etl.collectors.file_cache import FileCache
+from etl.collectors.throttle import AdaptiveLimiter
+from etl.collectors.trends import TrendsCollector
+
+INDEX = pd.date_range("2026-02-10", periods=48, freq="h")
+
+
+def _too_many_requests(retry_after: str | None = None) -> TooManyRequestsError:
+    resp = requests.Response()
+    resp.status_code = 429
+    if retry_after is not None:
+        resp.headers["Retry-After"] = retry_after
+    return TooManyRequestsError.from_response(resp)
+
+
+class TestMaxAcrossBatches:
+    def test_matches_concat_max(self):
+        a = pd.DataFrame({"x": np.arange(48), "y": np.arange(48)[::-1]}, index=INDEX)
+        b = pd.DataFrame({"z": np.full(48, 20)}, index=INDEX)
+        expected = pd.concat([a, b], axis=1).max(axis=1)
+
+        result = TrendsCollector._max_across_batches([a, b])
+
+        assert result.index.equals(INDEX)
+        np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+    def test_misaligned_batches_use_union_of_timestamps(self):
+        a = pd.DataFrame({"x": np.arange(10)}, index=INDEX[:10])
+        b = pd.DataFrame({"y": np.full(10, 5)}, index=INDEX[5:15])
+
+        result = TrendsCollector._max_across_batches([a, b])
+
+        assert result.index.equals(INDEX[:15])
+        assert result.iloc[0] == 0      # only batch a
+        assert result.iloc[6] == 6      # max(6, 5)
+        assert result.iloc[-1] == 5     # only batch b
+
+
+class TestDailyMax:
+    def test_matches_resample(self):
+        index = pd.date_range("2026-02-10 05:00", periods=100, freq="h")
+        values = np.random.RandomState(0).randint(0, 100, 100).astype(float)
+        values[30:60] = np.nan
+        series = pd.Series(values, index=index)
+        expected = {
+            dt.strftime("%Y-%m-%d"): float(val)
+            for dt, val in series.resample("D").max().items()
+            if not pd.isna(val)
+        }
+
+        assert TrendsCollector._daily_max(series) == expected
+
+    def test_empty(self):
+        assert TrendsCollector._daily_max(pd.Series([], dtype=float)) == {}
+
+
+class TestBatchCache:
+    def setup_method(self):
+        trends._BATCH_CACHE.clear()
+
+    def teardown_method(self):
+        trends._BATCH_CACHE.clear()
+
+    def test_same_keywords_fetched_once(self):
+        frame = pd.DataFrame({"a": [1], "b": [2]}, index=INDEX[:1])
+        collector = TrendsCollector()
+        with patch.object(collector, "_fetch_batch_uncached", return_value=frame) as fetch:
+            assert collector._fetch_batch_with_retry(["a", "b"]) is frame
+            assert TrendsCollector()._fetch_batch_with_retry(["b", "a"]) is frame
+        fetch.assert_called_once()
+
+    def test_failures_not_cached(self):
+        collector = TrendsCollector()
+        with patch.object(collector, "_fetch_batch_uncached", return_value=None) as fetch:
+            collector._fetch_batch_with_retry(["a"])
+            collector._fetch_batch_with_retry(["a"])
+        assert fetch.call_count == 2
+
+    def test_bounded(self):
+        collector = TrendsCollector()
+        frame = pd.DataFrame({"a": [1]}, index=INDEX[:1])
+        with patch.object(trends, "BATCH_CACHE_MAX", 2), \
+                patch.object(collector, "_fetch_batch_uncached", return_value=frame):
+            for kw in ("a", "b", "c"):
+                collector._fetch_batch_with_retry([kw])
+        assert list(trends._BATCH_CACHE) == [("b",), ("c",)]
+
+
+class TestTrendspyFallback:
+    def test_uses_keyword_column(self):
+        df = pd.DataFrame({"ChatGPT": [10.0, np.nan, 40.0], "other": [99, 99, 99]})
+        fake_trends = type("FakeTrends", (), {"interest_over_time": lambda self, *a, **k: df})
+        with patch.object(trends, "_get_trendspy", return_value=fake_trends):
+            data = TrendsCollector()._fetch_with_trendspy(["ChatGPT"])
+        assert data == {"interest": 40.0, "interest_7d_avg": 25.0}
+
+
+class TestBlockedHotPath:
+    def setup_method(self):
+        trends._PYTRENDS_BLOCKED.set()
+
+    def teardown_method(self):
+        trends._PYTRENDS_BLOCKED.clear()
+
+    def test_cached_result_skips_trendspy(self):
+        collector = TrendsCollector()
+        cached = {"interest": 50.0, "interest_7d_avg": 40.0}
+        with patch.object(collector._redis, "get", return_value=cached), \
+                patch.object(collector, "_fetch_with_trendspy") as trendspy:
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+        trendspy.assert_not_called()
+        assert result["metrics"] == cached
+        assert result["raw_json"]["source"] == "redis_cache"
+
+    def test_cache_miss_falls_through_to_trendspy(self):
+        collector = TrendsCollector()
+        data = {"interest": 1.0, "interest_7d_avg": 2.0}
+        with patch.object(collector._redis, "get", return_value=None) as get, \
+                patch.object(collector, "_fetch_with_trendspy", return_value=data):
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+        get.assert_called_once()
+        assert result["raw_json"]["source"] == "trendspy_fallback"
+        # Queued for the end-of-run flush, not written per model
+        assert collector._redis.get(collector._cache_key("chatgpt")) == data
+
+
+class TestWarmCache:
+    def test_counts_successes(self):
+        collector = TrendsCollector()
+        with patch.object(collector, "fetch", side_effect=[{"metrics": {}}, None]), \
+                patch.object(collector, "flush_cache") as flush:
+            assert collector.warm_cache([("a", ["A"]), ("b", ["B"])]) == 1
+        flush.assert_called_once()
+
+
+class TestSessionReuse:
+    def test_session_reused_until_429(self):
+        collector = TrendsCollector()
+        frame = pd.DataFrame({"a": [1.0]}, index=INDEX[:1])
+        sessions = []
+
+        def new_session():
+            pt = MagicMock()
+            # The first session gets rate limited on its second batch
+            pt.interest_over_time.side_effect = (
+                [frame, _too_many_requests()] if not sessions else [frame]
+            )
+            sessions.append(pt)
+            return pt
+
+        limiter = AdaptiveLimiter(backoff=10, sleep=lambda secs: None)
+        with patch.object(collector, "_new_pytrends", side_effect=new_session), \
+                patch.object(trends, "_TRENDS_LIMITER", limiter):
+            assert collector._fetch_batch_uncached(["a"]) is frame
+            assert collector._fetch_batch_uncached(["b"]) is frame
+
+        assert len(sessions) == 2
+        assert sessions[0].interest_over_time.call_count == 2
+        # 429 raised the delay to 10s, the success after it relaxed it to 5s
+        assert limiter.delay(trends.TRENDS_HOST) == 5
+
+    def test_session_dropped_after_fetch(self):
+        collector = TrendsCollector()
+        frame = pd.DataFrame({"a": [1.0]}, index=INDEX[:1])
+        with patch.dict(trends._BATCH_CACHE, clear=True), \
+                patch.object(collector, "_new_pytrends") as new_session:
+            new_session.return_value.interest_over_time.return_value = frame
+            collector.fetch("chatgpt", ["a"])
+        new_session.assert_called_once()
+        assert collector._pt is None
+
+
+class TestCookieCache:
+    @pytest.fixture(autouse=True)
+    def cookie_cache(self, tmp_path, monkeypatch):
+        cache = FileCache("trends", ttl=trends.COOKIE_TTL_SECS, root=tmp_path)
+        monkeypatch.setattr(trends, "_COOKIE_CACHE", cache)
+        return cache
+
+    def test_primes_once_then_reuses(self):
+        with patch.object(TrendReq, "GetGoogleCookie", return_value={"NID": "abc"}) as prime:
+            first = trends._CachedCookieTrendReq()
+            second = trends._CachedCookieTrendReq()
+        prime.assert_called_once()
+        assert first.cookies == second.cookies == {"NID": "abc"}
+
+    def test_empty_cookie_not_cached(self, cookie_cache):
+        with patch.object(TrendReq, "GetGoogleCookie", return_value={}):
+            trends._CachedCookieTrendReq()
+        assert cookie_cache.get(trends.COOKIE_CACHE_URL) is None
+
+    def test_429_drops_cached_cookie(self, cookie_cache):
+        cookie_cache.set(trends.COOKIE_CACHE_URL, None, '{"NID": "stale"}')
+        collector = TrendsCollector()
+        limiter = AdaptiveLimiter(backoff=10, sleep=lambda secs: None)
+        with patch.object(collector, "_new_pytrends") as new_session, \
+                patch.object(trends, "_TRENDS_LIMITER", limiter):
+            new_session.return_value.interest_over_time.side_effect = [
+                _too_many_requests(), pd.DataFrame({"a": [1.0]}, index=INDEX[:1]),
+            ]
+            collector._fetch_batch_uncached(["a"])
+        assert cookie_cache.get(trends.COOKIE_CACHE_URL) is None
+
+    def test_403_drops_cached_cookie(self, cookie_cache):
+        cookie_cache.set(trends.COOKIE_CACHE_URL, None, '{"NID": "stale"}')
+        resp = requests.Response()
+        resp.status_code = 403
+        collector = TrendsCollector()
+        with patch.object(collector, "_new_pytrends") as new_session, \
+                patch.object(trends, "_TRENDS_LIMITER", AdaptiveLimiter(sleep=lambda secs: None)):
+            new_session.return_value.interest_over_time.side_effect = (
+                ResponseError.from_response(resp)
+            )
+            assert collector._fetch_batch_uncached(["a"]) is None
+        assert cookie_cache.get(trends.COOKIE_CACHE_URL) is None
+        assert collector._pt is None
+
+
+
+class TestErrorDispatch:
+    def _fetch(self, *errors_then_frame):
+        collector = TrendsCollector()
+        limiter = AdaptiveLimiter(backoff=10, sleep=lambda secs: None)
+        with patch.object(collector, "_new_pytrends") as new_session, \
+                patch.object(trends, "_TRENDS_LIMITER", limiter), \
+                patch.object(trends, "_COOKIE_CACHE"):
+            new_session.return_value.interest_over_time.side_effect = list(errors_then_frame)
+            return collector._fetch_batch_uncached(["a"]), limiter
+
+    def test_retry_after_sets_delay(self):
+        frame = pd.DataFrame({"a": [1.0]}, index=INDEX[:1])
+        df, limiter = self._fetch(_too_many_requests("60"), frame)
+        assert df is frame
+        assert limiter.delay(trends.TRENDS_HOST) == 30  # 60s, relaxed once by the success
+
+    def test_other_errors_mentioning_429_are_not_retried(self):
+        resp = requests.Response()
+        resp.status_code = 400
+        df, limiter = self._fetch(ResponseError("bad keyword '429'", resp))
+        assert df is None
+        assert limiter.delay(trends.TRENDS_HOST) == 0
@@ -0,0 +1,136 @@
+"""Tests for etl/collectors/wikipedia.py"""
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from etl.collectors import wikipedia
+from etl.collectors.pageview_store import PageviewStore
+from etl.collectors.wikipedia import WikipediaCollector
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    """Keep each test's pageview store in its own temp directory."""
+    store = PageviewStore(tmp_path)
+    monkeypatch.setattr(wikipedia, "PageviewStore", lambda: store)
+    return store
+
+
+def _response(data):
+    resp = MagicMock()
+    resp.content = orjson.dumps(data)
+    return resp
+
+
+def _day(offset: int) -> str:
+    return (date.today() - timedelta(days=offset)).isoformat()
+
+
+class TestFetchPageviewsBatch:
+    def test_maps_normalized_titles_and_drops_nulls(self):
+        data = {
+            "query": {
+                "normalized": [{"from": "Claude_(language_model)", "to": "Claude (language model)"}],
+                "pages": [
+                    {"title": "ChatGPT", "pageviews": {_day(2): 100, _day(1): 200, _day(0): None}},
+                    {"title": "Claude (language model)", "pageviews": {_day(1): 50}},
+                    {"title": "Missing page", "missing": True},
+                ],
+            }
+        }
+        collector = WikipediaCollector()
+        with patch.object(collector, "_get", return_value=_response(data)) as get:
+            items = collector._fetch_pageviews_batch(["ChatGPT", "Claude_(language_model)"])
+
+        get.assert_called_once()
+        assert get.call_args.args[1]["titles"] == "ChatGPT|Claude_(language_model)"
+        assert [i["views"] for i in items["ChatGPT"]] == [100, 200]
+        assert items["ChatGPT"][0]["timestamp"] == _day(2).replace("-", "") + "00"
+        assert items["Claude_(language_model)"] == [
+            {"timestamp": _day(1).replace("-", "") + "00", "views": 50}
+        ]
+
+    def test_follows_continuation(self):
+        first = {
+            "continue": {"pvipcontinue": "x", "continue": "||"},
+            "query": {"pages": [{"title": "A", "pageviews": {_day(1): 1}}]},
+        }
+        second = {"query": {"pages": [{"title": "B", "pageviews": {_day(1): 2}}]}}
+        collector = WikipediaCollector()
+        with patch.object(collector, "_get", side_effect=[_response(first), _response(second)]) as get:
+            items = collector._fetch_pageviews_batch(["A", "B"])
+
+        assert set(items) == {"A", "B"}
+        assert get.call_args.args[1]["pvipcontinue"] == "x"
+
+
+class TestPrefetch:
+    def test_fetch_uses_prefetched_items(self):
+        collector = WikipediaCollector()
+        items = [{"timestamp": "2026021000", "views": 10}, {"timestamp": "2026021100", "views": 30}]
+        with patch.object(collector, "_fetch_pageviews_batch", return_value={"ChatGPT": items}):
+            assert collector.prefetch_pageviews(["ChatGPT", "ChatGPT"]) == 1
+
+        with patch.object(collector, "_fetch_pageviews") as single:
+            result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        single.assert_not_called()
+        assert result["metrics"] == {"pageviews_7d": 40, "pageviews_daily_avg": 20.0}
+
+
+class TestSettledDays:
+    def _store_settled(self, store, article, views=10):
+        store.put(article, {
+            (date.today() - timedelta(days=d)).strftime("%Y%m%d"): views
+            for d in range(wikipedia.SETTLE_DAYS, 8)
+        })
+
+    def test_full_window_stores_settled_days_only(self, store):
+        collector = WikipediaCollector()
+        data = {"query": {"pages": [{"title": "A", "pageviews": {_day(d): d for d in range(8)}}]}}
+        with patch.object(collector, "_get", return_value=_response(data)):
+            collector._fetch_pageviews_batch(["A"])
+
+        stored = store.get("A", "00000000", "99999999")
+        assert len(stored) == 8 - wikipedia.SETTLE_DAYS
+        assert max(stored) == (date.today() - timedelta(days=wikipedia.SETTLE_DAYS)).strftime("%Y%m%d")
+
+    def test_batch_requests_only_unsettled_tail(self, store):
+        self._store_settled(store, "A")
+        collector = WikipediaCollector()
+        data = {"query": {"pages": [{"title": "A", "pageviews": {_day(1): 99, _day(3): 1}}]}}
+        with patch.object(collector, "_get", return_value=_response(data)) as get:
+            items = collector._fetch_pageviews_batch(["A"])
+
+        assert get.call_args.args[1]["pvipdays"] == wikipedia.SETTLE_DAYS
+        views = [i["views"] for i in items["A"]]
+        assert views == [10] * (8 - wikipedia.SETTLE_DAYS) + [99]
+
+    def test_per_article_falls_back_to_settled_on_404(self, store):
+        self._store_settled(store, "A")
+        collector = WikipediaCollector()
+        resp = MagicMock(status_code=404)
+        with patch.object(collector, "_get", return_value=resp) as get:
+            items = collector._fetch_pageviews("A")
+
+        start = (date.today() - timedelta(days=wikipedia.SETTLE_DAYS - 1)).strftime("%Y%m%d")
+        assert f"/A/daily/{start}/" in get.call_args.args[0]
+        assert len(items) == 8 - wikipedia.SETTLE_DAYS
+
+    def test_collector_prunes_days_outside_window(self, store):
+        old = (date.today() - timedelta(days=wikipedia.STORE_KEEP_DAYS + 1)).strftime("%Y%m%d")
+        self._store_settled(store, "A")
+        store.put("A", {old: 5})
+        WikipediaCollector()
+
+        stored = store.get("A", "00000000", "99999999")
+        assert old not in stored
+        assert len(stored) == 8 - wikipedia.SETTLE_DAYS
+
+    def test_store_disabled_without_root(self):
+        store = PageviewStore(None)
+        store.put("A", {"20260210": 1})
+        assert store.get("A", "20260210", "20260210") == {}
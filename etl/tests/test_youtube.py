@@ -0,0 +1,72 @@
+"""Tests for etl/collectors/youtube.py"""
+
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from etl.collectors import youtube
+from etl.collectors.youtube import YouTubeCollector
+
+
+def _response(status: int, body: dict | None = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = requests.compat.json.dumps(body or {}).encode()
+    resp.url = youtube.YOUTUBE_API_BASE
+    return resp
+
+
+def _collector(*responses) -> YouTubeCollector:
+    collector = YouTubeCollector()
+    collector._session = MagicMock()
+    collector._session.get.side_effect = list(responses)
+    return collector
+
+
+@patch.object(youtube, "YOUTUBE_API_KEY", "test-key")
+class TestFetch:
+    def test_aggregates_search_and_stats(self):
+        search = {"items": [{"id": {"videoId": "a"}}, {"id": {"videoId": "b"}}]}
+        videos = {"items": [
+            {"id": "a", "statistics": {"viewCount": "100", "likeCount": "5", "commentCount": "5"}},
+            {"id": "b", "statistics": {"viewCount": "300", "likeCount": "10"}},
+        ]}
+        collector = _collector(_response(200, search), _response(200, videos))
+
+        result = collector.fetch("chatgpt", ["ChatGPT"])
+
+        assert result["metrics"] == {
+            "video_count_24h": 2,
+            "total_views_24h": 400,
+            "avg_engagement": 0.05,
+        }
+        url, = collector._session.get.call_args_list[0].args
+        params = collector._session.get.call_args_list[0].kwargs["params"]
+        assert url == f"{youtube.YOUTUBE_API_BASE}/search"
+        assert "key" not in params
+        headers = collector._session.get.call_args_list[0].kwargs["headers"]
+        assert headers == {"X-Goog-Api-Key": "test-key"}
+        assert collector._session.get.call_args_list[1].kwargs["params"]["id"] == "a,b"
+
+    def test_quota_exceeded_returns_none(self):
+        collector = _collector(_response(403))
+        assert collector.fetch("chatgpt", ["ChatGPT"]) is None
+
+
+class TestAggregateStats:
+    def _stat(self, vid, views, likes=0, comments=0):
+        return {"video_id": vid, "view_count": views, "like_count": likes, "comment_count": comments}
+
+    def test_totals_and_top_videos(self):
+        stats = [self._stat(str(i), views, likes=1, comments=2) for i, views in enumerate([5, 50, 20, 50, 1, 30, 10])]
+        total_views, engagement, top = YouTubeCollector._aggregate_stats(stats)
+        assert total_views == 166
+        assert engagement == 21
+        assert [s["video_id"] for s in top] == ["1", "3", "5", "2", "6"]
+
+    def test_fewer_than_top_n(self):
+        stats = [self._stat("a", 1), self._stat("b", 2)]
+        assert YouTubeCollector._aggregate_stats(stats)[2] == [stats[1], stats[0]]
+
+    def test_empty(self):
+        assert YouTubeCollector._aggregate_stats([]) == (0, 0, [])